@@ -0,0 +1,246 @@
+"""
+부하 테스트 벤치마크.
+
+인메모리 DynamoDB 스탠드인(DYNAMO_BACKEND=local)에 describe_key_design 패턴을 따르는 합성 데이터
+(사용자, 회사, 상품, 단체보험 가입자)를 적재하고, FastAPI 앱을 프로세스 안에서 실행해
+scan_table / query_table / get_item 등의 요청을 동시에 보냅니다.
+엔드포인트별 p50/p95/p99 지연 시간, 처리량, RSS, Server-Timing 단계별 시간(DynamoDB, 직렬화, 압축)을
+출력하고 JSON으로 저장합니다. --baseline으로 이전 결과와 비교할 수 있습니다.
+
+    poetry run python benchmarks/load_bench.py --companies 50 --members 200 --requests 2000 --concurrency 32
+    poetry run python benchmarks/load_bench.py --output after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+# 앱을 가져오기 전에 로컬 백엔드를 선택
+os.environ["DYNAMO_BACKEND"] = "local"
+os.environ.setdefault("DYNAMO_TABLE_NAME", "benchmark")
+os.environ.setdefault("CACHE_BACKEND", "none")
+
+import httpx  # noqa: E402
+
+from gpt_dynamodb_action.main import app  # noqa: E402
+from gpt_dynamodb_action.utils.table_registry import get_registry  # noqa: E402
+
+PRODUCT_TYPES = ("INSU", "MSB", "CMD")
+PLANS = ("PLAN-A", "PLAN-B", "PLAN-C")
+STATUSES = ("active", "expired", "pending")
+
+
+def company_code(i):
+    return f"C{i:04d}"
+
+
+def make_items(users, companies, members, products, seed):
+    """describe_key_design의 키 패턴을 따르는 합성 항목을 만듭니다."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(users):
+        email = f"user{i}@example.com"
+        items.append({"PK": f"USR#{email}", "SK": f"USR#{email}", "email": email, "name": f"관리자{i}",
+                      "userType": rng.choice(("admin", "regular")), "createdAt": f"2024-{i % 12 + 1:02d}-01T09:00:00Z"})
+    for i in range(products):
+        kind = PRODUCT_TYPES[i % len(PRODUCT_TYPES)]
+        items.append({"PK": "PROD#", "SK": f"PROD#{kind}#{i:010d}", "productName": f"상품{i}",
+                      "price": Decimal(rng.randint(10, 500) * 1000), "createdAt": "2024-01-01T00:00:00Z"})
+    for c in range(companies):
+        code = company_code(c)
+        items.append({"PK": "COM#", "SK": f"COM#{code}", "companyCode": code, "companyName": f"회사{c}",
+                      "managerEmail": f"manager{c}@example.com", "createdAt": "2023-06-01T00:00:00Z"})
+        ts = 1621234567890 + c
+        items.append({"PK": f"COM#GRPINSU#{code}", "SK": f"COM#GRPINSU#{code}#{ts}", "companyCode": code,
+                      "insurancePlan": rng.choice(PLANS), "totalPrice": Decimal(rng.randint(100, 9000) * 1000)})
+        for m in range(members):
+            items.append({
+                "PK": f"COM#MEM#{code}", "SK": f"COM#MEM#{code}#{ts}#{m:05d}", "companyCode": code,
+                "userName": f"가입자{c}-{m}", "email": f"member{c}-{m}@example.com",
+                "insurancePlan": rng.choice(PLANS), "status": rng.choice(STATUSES),
+                "paidPrice": Decimal(rng.randint(50, 900) * 100) + Decimal("0.50"),
+                "residenceCountryCode": rng.choice(("US", "VN", "DE", "JP")),
+                "createdAt": f"2024-{m % 12 + 1:02d}-{m % 28 + 1:02d}T09:00:00Z",
+            })
+    return items
+
+
+def request_mix(args, rng):
+    """(가중치, 이름, 요청 생성 함수) 목록입니다. 실제 GPT 대화에서 자주 쓰는 호출 비율을 흉내 냅니다."""
+    def member_pk():
+        return f"COM#MEM#{company_code(rng.randrange(args.companies))}"
+
+    return [
+        (30, "query_table", lambda: ("POST", "/query_table", {"pk": member_pk(), "limit": 100,
+                                                               "projection": ["PK", "SK", "userName", "status"]})),
+        (20, "get_item", lambda: ("POST", "/get_item", {"pk": "COM#", "sk": f"COM#{company_code(rng.randrange(args.companies))}"})),
+        (15, "query_table_filtered", lambda: ("POST", "/query_table", {"pk": member_pk(), "filters": {"status": "active"}})),
+        (10, "query_products", lambda: ("POST", "/query_table", {"pk": "PROD#", "sk": f"PROD#{rng.choice(PRODUCT_TYPES)}#",
+                                                                  "sk_operator": "begins_with"})),
+        (10, "scan_table", lambda: ("POST", "/scan_table", {"filters": {"insurancePlan": rng.choice(PLANS)}, "limit": 100})),
+        (10, "describe_table_schema", lambda: ("GET", "/describe_table_schema", None)),
+        (5, "scan_table_large", lambda: ("POST", "/scan_table", {"filters": {"PK": "COM#MEM#"},
+                                                                  "operator": {"PK": "begins_with"}, "limit": 1000})),
+    ]
+
+
+def parse_server_timing(value):
+    stages = {}
+    for part in (value or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.startswith("dur="):
+            stages[name] = float(params[4:])
+    return stages
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+def current_rss_kb():
+    # Linux는 /proc에서 현재 RSS를, 그 외에는 최대 RSS를 사용
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+async def run_load(args):
+    rng = random.Random(args.seed)
+    mix = request_mix(args, rng)
+    weights = [w for w, _, _ in mix]
+    samples = {name: {"latency_ms": [], "stages": {}, "errors": 0, "bytes": 0} for _, name, _ in mix}
+    queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(rng.choices(mix, weights)[0])
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": args.accept_encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        async def worker():
+            while not queue.empty():
+                _, name, build = queue.get_nowait()
+                method, path, body = build()
+                started = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                sample = samples[name]
+                if response.status_code >= 400:
+                    sample["errors"] += 1
+                    continue
+                sample["latency_ms"].append(elapsed_ms)
+                sample["bytes"] += int(response.headers.get("content-length") or len(response.content))
+                for stage, ms in parse_server_timing(response.headers.get("server-timing")).items():
+                    sample["stages"].setdefault(stage, []).append(ms)
+
+        # 워밍업 (스키마 캐시, 실행기, 정적 응답 생성)
+        for _, _, build in mix:
+            method, path, body = build()
+            await client.request(method, path, json=body)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = time.perf_counter() - started
+    return samples, wall
+
+
+def summarize(samples, wall, args, rss_before, rss_after, item_count):
+    endpoints = {}
+    all_latencies = []
+    for name, sample in samples.items():
+        latencies = sample["latency_ms"]
+        all_latencies.extend(latencies)
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": sample["errors"],
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_bytes": round(sample["bytes"] / len(latencies)) if latencies else 0,
+            "stages_mean_ms": {stage: round(statistics.fmean(v), 3) for stage, v in sorted(sample["stages"].items())},
+        }
+    return {
+        "config": {
+            "items": item_count, "requests": args.requests, "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms, "accept_encoding": args.accept_encoding, "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "throughput_rps": round(len(all_latencies) / wall, 1) if wall else 0.0,
+        "wall_s": round(wall, 3),
+        "p50_ms": round(percentile(all_latencies, 50), 3),
+        "p95_ms": round(percentile(all_latencies, 95), 3),
+        "p99_ms": round(percentile(all_latencies, 99), 3),
+        "rss_kb": {"before": rss_before, "after": rss_after},
+        "endpoints": endpoints,
+    }
+
+
+def print_report(result, baseline=None):
+    print(f"items={result['config']['items']} requests={result['config']['requests']} "
+          f"concurrency={result['config']['concurrency']} throughput={result['throughput_rps']} req/s "
+          f"rss={result['rss_kb']['after'] / 1024:.1f}MB")
+    print(f"{'endpoint':<24}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'bytes':>9}  stages(ms)")
+    for name, e in result["endpoints"].items():
+        stages = " ".join(f"{k}={v}" for k, v in e["stages_mean_ms"].items())
+        line = f"{name:<24}{e['requests']:>6}{e['p50_ms']:>9.2f}{e['p95_ms']:>9.2f}{e['p99_ms']:>9.2f}{e['mean_bytes']:>9}  {stages}"
+        before = (baseline or {}).get("endpoints", {}).get(name)
+        if before and before["p95_ms"]:
+            line += f"  p95 {100 * (e['p95_ms'] / before['p95_ms'] - 1):+.1f}%"
+        print(line)
+    if baseline and baseline.get("throughput_rps"):
+        print(f"throughput vs baseline: {100 * (result['throughput_rps'] / baseline['throughput_rps'] - 1):+.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--members", type=int, default=200, help="회사별 단체보험 가입자 수")
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="스탠드인의 호출당 지연 시간")
+    parser.add_argument("--accept-encoding", default="gzip")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    os.environ["DYNAMO_LOCAL_LATENCY_MS"] = str(args.latency_ms)
+    items = make_items(args.users, args.companies, args.members, args.products, args.seed)
+
+    async def run():
+        # 앱의 lifespan(레지스트리 초기화, 정적 응답 생성)을 직접 실행
+        async with app.router.lifespan_context(app):
+            get_registry().get_table().put_items(items)
+            rss_before = current_rss_kb()
+            samples, wall = await run_load(args)
+            return summarize(samples, wall, args, rss_before, current_rss_kb(), len(items))
+
+    result = asyncio.run(run())
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+응답 직렬화 마이크로벤치마크.
+
+기존 방식(convert_decimal 복사 → 크기 측정용 json.dumps → JSONResponse 재직렬화)과
+encode_json 단일 패스 방식의 CPU 시간과 최대 메모리 사용량을 비교합니다.
+
+    poetry run python benchmarks/serialization_bench.py --items 1000 --repeat 50
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+from gpt_dynamodb_action.utils.dynamo_helpers import DecimalEncoder, prepare_response_data
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response, orjson
+
+
+def make_items(count):
+    return [
+        {
+            "PK": f"COM#MEM#ABC{i % 50:03}",
+            "SK": f"COM#MEM#ABC{i % 50:03}#1621234567890#{i:05}",
+            "userName": f"홍길동{i}",
+            "email": f"user{i}@example.com",
+            "companyCode": f"ABC{i % 50:03}",
+            "paidPrice": Decimal("125000.50") + i,
+            "registrationCount": Decimal(i),
+            "status": "active",
+            "createdAt": "2024-05-01T09:00:00Z",
+            "insurancePlan": "PLAN-A",
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_pipeline(items):
+    # 기존 핸들러의 동작을 재현: 재귀 복사 → 크기 측정용 직렬화 → 응답 직렬화
+    def convert_decimal(obj):
+        if isinstance(obj, dict):
+            return {k: convert_decimal(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_decimal(i) for i in obj]
+        elif isinstance(obj, Decimal):
+            return float(obj)
+        return obj
+
+    response_data = {
+        "items": convert_decimal(items),
+        "lastEvaluatedKey": None,
+        "count": len(items),
+        "scannedCount": len(items),
+    }
+    response_json = json.dumps(response_data, cls=DecimalEncoder)
+    size_kb = len(response_json.encode("utf-8")) / 1024
+    return JSONResponse(content=response_data, headers={"X-Content-Size-KB": f"{size_kb:.2f}"})
+
+
+def single_pass_pipeline(items):
+    body = encode_json(prepare_response_data(items, None, len(items)))
+    return json_response(body, headers={"X-Content-Size-KB": f"{len(body) / 1024:.2f}"})
+
+
+def measure(func, items, repeat):
+    func(items)  # 워밍업
+    start = time.process_time()
+    for _ in range(repeat):
+        func(items)
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+
+    tracemalloc.start()
+    func(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    legacy_cpu, legacy_peak = measure(legacy_pipeline, items, args.repeat)
+    single_cpu, single_peak = measure(single_pass_pipeline, items, args.repeat)
+
+    backend = "orjson" if orjson is not None else "json"
+    print(f"items={args.items} repeat={args.repeat} backend={backend}")
+    print(f"{'pipeline':<14}{'cpu ms/resp':>14}{'peak KB':>12}")
+    print(f"{'legacy':<14}{legacy_cpu:>14.2f}{legacy_peak:>12.1f}")
+    print(f"{'single-pass':<14}{single_cpu:>14.2f}{single_peak:>12.1f}")
+    print(f"cpu reduction: {100 * (1 - single_cpu / legacy_cpu):.1f}%, "
+          f"peak memory reduction: {100 * (1 - single_peak / legacy_peak):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
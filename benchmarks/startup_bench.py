@@ -0,0 +1,85 @@
+"""
+콜드 스타트 벤치마크.
+
+새 파이썬 프로세스에서 앱을 가져오고 lifespan 시작(레지스트리 생성, 스키마 응답 준비)까지 걸리는 시간을
+여러 번 측정합니다. 인메모리 DynamoDB 스탠드인(DYNAMO_BACKEND=local)을 사용하므로 AWS 없이 실행됩니다.
+프로세스 시작부터 준비 완료까지의 시간, 모듈 로드 시간, 준비(warmup) 시간의 중앙값/최댓값을 출력하고
+--baseline으로 이전 결과와 비교할 수 있습니다.
+
+    poetry run python benchmarks/startup_bench.py --runs 10 --output before.json
+    poetry run python benchmarks/startup_bench.py --output after.json --baseline before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# 자식 프로세스에서 실행할 코드: 앱을 가져오고 lifespan 시작만 실행한 뒤 측정값을 출력
+CHILD = """
+import asyncio, json, time
+from gpt_dynamodb_action import main
+async def start():
+    started = time.perf_counter()
+    async with main.app.router.lifespan_context(main.app):
+        return time.perf_counter() - started
+warmup = asyncio.run(start())
+print(json.dumps({"import_s": main.IMPORT_SECONDS, "warmup_s": warmup}))
+"""
+
+PHASES = ("total_s", "import_s", "warmup_s")
+
+
+def run_once(env):
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD], env=env, check=True, capture_output=True, text=True).stdout
+    total = time.perf_counter() - started
+    result = json.loads(output.strip().splitlines()[-1])
+    result["total_s"] = total
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    env = dict(os.environ, DYNAMO_BACKEND="local", LOG_LEVEL="WARNING")
+    env.setdefault("DYNAMO_TABLE_NAME", "benchmark")
+    samples = [run_once(env) for _ in range(args.runs)]
+
+    result = {
+        "config": {"runs": args.runs, "python": platform.python_version()},
+        "phases": {
+            phase: {
+                "median_ms": round(statistics.median(s[phase] for s in samples) * 1000, 1),
+                "max_ms": round(max(s[phase] for s in samples) * 1000, 1),
+            }
+            for phase in PHASES
+        },
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(f"{'phase':<12}{'median':>10}{'max':>10}")
+    for phase, values in result["phases"].items():
+        line = f"{phase:<12}{values['median_ms']:>10.1f}{values['max_ms']:>10.1f}"
+        before = (baseline or {}).get("phases", {}).get(phase)
+        if before and before["median_ms"]:
+            line += f"  median {100 * (values['median_ms'] / before['median_ms'] - 1):+.1f}%"
+        print(line)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
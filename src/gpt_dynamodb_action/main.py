@@ -1,9 +1,81 @@
-from fastapi import FastAPI
-from fastapi.middleware.gzip import GZipMiddleware
-from gpt_dynamodb_action.routes import router
-import uvicorn
+import time
+
+# 콜드 스타트 측정을 위해 다른 모듈을 가져오기 전에 시각을 기록
+_import_started = time.perf_counter()
+
+import asyncio  # noqa: E402
+import logging  # noqa: E402
+from contextlib import asynccontextmanager, suppress  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from gpt_dynamodb_action.routes import router  # noqa: E402
+from gpt_dynamodb_action.routes.schema_endpoints import SchemaSettings, refresh_schema_responses, schema_refresh_loop  # noqa: E402
+from gpt_dynamodb_action.server import ServerSettings  # noqa: E402
+from gpt_dynamodb_action.utils.cache import close_cache  # noqa: E402
+from gpt_dynamodb_action.utils.compression import AdaptiveCompressionMiddleware  # noqa: E402
+from gpt_dynamodb_action.utils.environment import configure_logging, load_environment  # noqa: E402
+from gpt_dynamodb_action.utils.exports import get_export_manager  # noqa: E402
+from gpt_dynamodb_action.utils.lookup_index import get_lookup_service  # noqa: E402
+from gpt_dynamodb_action.utils.metrics import APP_STARTUP_SECONDS, MetricsMiddleware  # noqa: E402
+from gpt_dynamodb_action.utils.resilience import ThrottledError  # noqa: E402
+from gpt_dynamodb_action.utils.single_flight import get_single_flight  # noqa: E402
+from gpt_dynamodb_action.utils.table_registry import init_registry, close_registry  # noqa: E402
+from gpt_dynamodb_action.utils.timing import ServerTimingMiddleware  # noqa: E402
+from gpt_dynamodb_action.utils.worker_metrics import get_worker_metrics  # noqa: E402
+from gpt_dynamodb_action.utils.async_dynamo import shutdown_executor  # noqa: E402
+import uvicorn  # noqa: E402
+
+# .env와 로깅 설정은 애플리케이션 진입점에서 한 번만 적용
+load_environment()
+configure_logging()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 DynamoDB 클라이언트 레지스트리(boto3 서비스 모델, 커넥션 풀, 스키마)를 한 번만 생성하고 종료 시 정리
+    warmup_started = time.perf_counter()
+    init_registry()
+    # 스키마/정책 응답을 미리 인코딩·압축하고, live 모드이면 주기적으로 갱신
+    schema_settings = SchemaSettings.from_env()
+    await refresh_schema_responses(schema_settings)
+    refresh_task = None
+    if schema_settings.source == "live" and schema_settings.refresh_seconds > 0:
+        refresh_task = asyncio.create_task(schema_refresh_loop(schema_settings))
+    # 조회 인덱스는 시작을 막지 않도록 백그라운드에서 만들고 갱신 (준비 전 /lookup은 503)
+    lookup_service = get_lookup_service()
+    lookup_task = asyncio.create_task(lookup_service.run()) if lookup_service.settings.enabled else None
+    # 이전 프로세스가 끝내지 못한 내보내기 작업은 마지막 체크포인트부터 이어서 실행
+    await get_export_manager().recover()
+    warmup_seconds = time.perf_counter() - warmup_started
+    APP_STARTUP_SECONDS.set(IMPORT_SECONDS, phase="import")
+    APP_STARTUP_SECONDS.set(warmup_seconds, phase="warmup")
+    logger.info("시작 완료: 모듈 로드 %.3f초, 준비 %.3f초", IMPORT_SECONDS, warmup_seconds)
+    # 워커가 여럿이면 /metrics가 모든 워커 값을 합칠 수 있도록 스냅샷을 주기적으로 기록
+    worker_metrics = get_worker_metrics()
+    metrics_task = asyncio.create_task(worker_metrics.run()) if worker_metrics.enabled else None
+    yield
+    for task in (refresh_task, lookup_task):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    # 실행 중인 내보내기 작업은 체크포인트를 남기고 멈춤 (다음 시작 때 재개)
+    await get_export_manager().shutdown()
+    # 연결이 끊긴 뒤에도 공유 실행 중인 스캔이 끝나도록 잠시 기다린 후 실행기를 정리
+    remaining = await get_single_flight().drain(ServerSettings.from_env().drain_seconds)
+    if remaining:
+        logger.warning("종료 대기 시간 초과: 진행 중인 실행 %s개를 중단합니다", remaining)
+    shutdown_executor()
+    close_registry()
+    await close_cache()
+    # 종료 직전까지 쌓인 지표를 마지막으로 기록 (종료된 워커의 카운터도 합계에 남음)
+    if metrics_task:
+        metrics_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await metrics_task
 
 app = FastAPI(
+    lifespan=lifespan,
     title="GPT DynamoDB Scanner API",
     version="1.0.0",
     servers=[
@@ -14,10 +86,28 @@ app = FastAPI(
     ]
 )
 
-# GZip 압축 미들웨어 추가 (최소 크기 1000바이트, 압축 레벨 9)
-app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=9)
+# 응답 압축 미들웨어 추가 (Accept-Encoding에 따라 zstd/br/gzip, 본문 크기와 CPU 부하로 레벨 선택)
+app.add_middleware(AdaptiveCompressionMiddleware)
+
+# 요청별 단계 시간(DynamoDB, 직렬화, 압축)을 Server-Timing 헤더로 보고 (압축 시간을 포함하도록 가장 바깥에 위치)
+app.add_middleware(ServerTimingMiddleware)
+
+# 라우트별 요청 수와 지연 시간 지표 (/metrics)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(router)
 
-def main():    
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+@app.exception_handler(ThrottledError)
+async def throttled_handler(request: Request, exc: ThrottledError):
+    # 재시도 후에도 스로틀링되어 반환할 부분 결과가 없으면 잠시 후 다시 시도하도록 안내
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "DynamoDB is throttling requests; retry after a short wait", "budgetExhausted": "throttled"},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))}
+    )
+
+def main():
+    # 개발용 (코드 변경 시 자동 재시작). 운영에서는 gpt_dynamodb_action.server:main을 사용
     uvicorn.run("gpt_dynamodb_action.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
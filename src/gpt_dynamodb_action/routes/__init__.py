@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from gpt_dynamodb_action.routes import scan_endpoint, query_endpoint, schema_endpoints, get_item_endpoint
+from gpt_dynamodb_action.routes import scan_endpoint, query_endpoint, schema_endpoints, get_item_endpoint, batch_get_endpoint, query_many_endpoint, aggregate_endpoint, metrics_endpoint, lookup_endpoint, exports_endpoint
 
 router = APIRouter()
 
@@ -8,3 +8,9 @@ router.include_router(scan_endpoint.router)
 router.include_router(query_endpoint.router)
 router.include_router(schema_endpoints.router)
 router.include_router(get_item_endpoint.router)
+router.include_router(batch_get_endpoint.router)
+router.include_router(query_many_endpoint.router)
+router.include_router(aggregate_endpoint.router)
+router.include_router(metrics_endpoint.router)
+router.include_router(lookup_endpoint.router)
+router.include_router(exports_endpoint.router)
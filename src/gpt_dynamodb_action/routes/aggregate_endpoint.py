@@ -0,0 +1,159 @@
+from fastapi import APIRouter, Body, HTTPException
+from typing import Any, Optional, Dict, List, Union
+import logging
+
+from gpt_dynamodb_action.utils.aggregation import Aggregator, SUPPORTED_METRICS
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.batch_get import fetch_base_items
+from gpt_dynamodb_action.utils.cursor import CursorError, next_token, request_fingerprint, resume_key
+from gpt_dynamodb_action.utils.dynamo_helpers import (
+    build_query_kwargs,
+    build_scan_kwargs
+)
+from gpt_dynamodb_action.utils.filter_compiler import FilterError
+from gpt_dynamodb_action.utils.query_planner import PLAN_QUERY, PLAN_SCAN, QueryPlan, plan_scan
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+from gpt_dynamodb_action.utils.single_flight import coalesce
+from gpt_dynamodb_action.utils.table_registry import get_registry
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 한 번의 요청에서 읽을 수 있는 최대 페이지 수
+MAX_AGGREGATE_PAGES = 1000
+
+@router.post("/aggregate")
+@coalesce("aggregate")
+async def aggregate(
+    pk: Optional[str] = Body(default=None, description="파티션 키 값 (지정하면 Query, 없으면 Scan)"),
+    sk: Optional[str] = Body(default=None, description="정렬 키 값(SK에 할당될 값)"),
+    sk_operator: Optional[str] = Body(default="eq", description="SK 연산자 - 'eq' 또는 'begins_with'"),
+    filters: Optional[Dict[str, str]] = Body(default=None, description="필터 조건 (키:값 쌍)"),
+    operator: Optional[Dict[str, str]] = Body(default=None, description="필터 연산자 (키:연산자 쌍)"),
+    attribute: Optional[str] = Body(default=None, description="sum/avg/min/max를 계산할 속성"),
+    group_by: Optional[str] = Body(default=None, description="그룹화할 속성"),
+    metrics: Optional[List[str]] = Body(default=None, description="count, sum, avg, min, max 중 선택"),
+    start_key: Optional[Union[str, dict]] = Body(default=None, description="이전 호출의 lastEvaluatedKey 토큰"),
+    max_pages: Optional[int] = Body(default=100, description="읽을 최대 페이지 수 (최대 1000)"),
+    where: Optional[Dict[str, Any]] = Body(default=None, description="and/or/not 조건 트리 (filters와 AND로 결합)")
+):
+    """
+    Computes count/sum/avg/min/max (optionally grouped) server-side over
+    a Query (pk given) or Scan, reading all pages without returning items.
+    Example: {"pk":"COM#MEM#ABC123","attribute":"paidPrice","metrics":["count","sum"]}
+    Without pk, filters pinning PK (or an index key) run as a Query like scan_table.
+    filters/operator/where accept the scan_table operators and condition tree.
+    min/max prefer numbers; strings are used only if no value is numeric.
+    If incomplete, pass lastEvaluatedKey as start_key with the same filters.
+    """
+
+    # 파라미터 검증
+    metrics = metrics or (list(SUPPORTED_METRICS) if attribute else ["count"])
+    unknown = [m for m in metrics if m not in SUPPORTED_METRICS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported metrics: {unknown}")
+    if any(m != "count" for m in metrics) and not attribute:
+        raise HTTPException(status_code=400, detail="attribute is required for sum/avg/min/max")
+
+    # 필요한 속성만 읽도록 프로젝션을 제한하고, 개수만 필요하면 Select=COUNT 사용
+    needed = [a for a in dict.fromkeys([attribute, group_by]) if a]
+    count_only = not needed
+
+    try:
+        if pk:
+            plan = QueryPlan(PLAN_QUERY, pk=pk, sk=sk or None, sk_operator=sk_operator, filters=dict(filters or {}),
+                             operator=dict(operator or {}), where=where)
+        else:
+            # 필터가 테이블이나 보조 인덱스의 파티션 키를 고정하면 전체 스캔 대신 Query로 집계 (GetItem도 Query로 실행)
+            plan = plan_scan(filters, operator, get_registry().get_schema(), needed or None, where).as_query()
+        if plan.kind == PLAN_SCAN:
+            request_kwargs = build_scan_kwargs(plan.filters, plan.operator, needed or None, where=plan.where)
+        else:
+            request_kwargs = build_query_kwargs(plan.pk, plan.sk, plan.sk_operator, plan.filters, plan.operator,
+                                                plan.query_projection(needed or None), index=plan.index, where=plan.where)
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if count_only:
+        request_kwargs.pop("ProjectionExpression", None)
+        request_kwargs["Select"] = "COUNT"
+    # 인덱스에 투영되지 않은 속성을 집계하면 기본 테이블에서 다시 읽음
+    fetch_base = plan.fetch_base and not count_only
+
+    # 연속 토큰은 같은 키 조건/필터와 같은 계획의 요청에서만 사용할 수 있음
+    fingerprint = request_fingerprint("aggregate", {
+        "pk": pk, "sk": sk, "sk_operator": sk_operator if sk else None, "filters": filters, "operator": operator,
+        "where": where
+    })
+    try:
+        start_key = resume_key(start_key, fingerprint, plan.tag)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # DynamoDB 테이블 참조 가져오기
+    table = get_async_table()
+    fetch = table.scan if plan.kind == PLAN_SCAN else table.query
+
+    logger.info("집계 파라미터: PK=%s, SK=%s, 필터=%s, 연산자=%s, where=%s, 속성=%s, 그룹=%s, 지표=%s, 계획=%s", pk, sk, filters, operator, where, attribute, group_by, metrics, plan.tag)
+
+    aggregator = Aggregator(attribute, group_by, metrics)
+    page_limit = max(1, min(max_pages or 100, MAX_AGGREGATE_PAGES))
+    pages_scanned = 0
+    scanned_count = 0
+    current_start_key = start_key
+    last_evaluated_key = None
+    throttled = False
+
+    # 모든 페이지를 순회하며 항목을 보관하지 않고 누적 집계
+    while pages_scanned < page_limit:
+        page_kwargs = dict(request_kwargs)
+        if current_start_key:
+            page_kwargs["ExclusiveStartKey"] = current_start_key
+        try:
+            page = await fetch(**page_kwargs)
+            items = await fetch_base_items(table, page.get("Items", []), needed) if fetch_base else page.get("Items", [])
+        except ThrottledError:
+            # 첫 페이지부터 실패하면 503, 그렇지 않으면 지금까지의 집계를 연속 키와 함께 반환
+            if not pages_scanned:
+                raise
+            throttled = True
+            last_evaluated_key = current_start_key
+            break
+        pages_scanned += 1
+        scanned_count += page.get("ScannedCount", 0)
+        if count_only:
+            aggregator.add_count(page.get("Count", 0))
+        else:
+            aggregator.add_items(items)
+        last_evaluated_key = page.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            break
+        current_start_key = last_evaluated_key
+
+    response_data = aggregator.result()
+    response_data.update({
+        "scannedCount": scanned_count,
+        "pagesScanned": pages_scanned,
+        "complete": last_evaluated_key is None,
+        "lastEvaluatedKey": next_token(fingerprint, last_evaluated_key, plan.tag)
+    })
+    if throttled:
+        response_data["budgetExhausted"] = "throttled"
+
+    # 응답 크기 측정
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
+
+    logger.info("집계 결과: 일치 항목 %s개, 스캔 항목 %s개, 페이지 수: %s, 완료: %s", aggregator.total.count, scanned_count, pages_scanned, last_evaluated_key is None)
+
+    # 응답 헤더 설정
+    headers = {
+        "X-Content-Size-KB": f"{response_size_kb:.2f}",
+        "X-Query-Plan": plan.header(),
+        "X-Scanned-Count": str(scanned_count),
+        "X-Pages-Scanned": str(pages_scanned)
+    }
+    if throttled:
+        headers["X-Budget-Exhausted"] = "throttled"
+
+    return json_response(response_body, headers=headers)
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Body, HTTPException
+from typing import Optional, Dict, List
+import logging
+
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.batch_get import batch_get_items, key_tuple
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 한 번의 요청에서 조회할 수 있는 최대 키 수
+MAX_BATCH_KEYS = 500
+
+@router.post("/batch_get_items")
+async def batch_get_items_endpoint(
+    keys: List[Dict[str, str]] = Body(..., description="조회할 키 목록 [{\"pk\": ..., \"sk\": ...}] (최대 500개)"),
+    projection: Optional[List[str]] = Body(default=None, description="반환할 속성 목록 (기본값: 모든 필드)")
+):
+    """
+    Fetches many items by exact PK/SK in one call (up to 500 keys).
+    Results keep request order; missing items have found=false.
+    Example: {"keys":[{"pk":"COM#","sk":"COM#ABC123"},{"pk":"COM#","sk":"COM#XYZ"}]}
+    """
+
+    # 키 목록 검증
+    if not keys:
+        raise HTTPException(status_code=400, detail="keys must not be empty")
+    if len(keys) > MAX_BATCH_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_KEYS} keys are allowed")
+    if any(not key.get("pk") or not key.get("sk") for key in keys):
+        raise HTTPException(status_code=400, detail="Each key requires 'pk' and 'sk'")
+
+    # DynamoDB 테이블 참조 가져오기
+    table = get_async_table()
+
+    # 로깅
+    logger.info("BatchGetItem 파라미터: 키 %s개, 프로젝션=%s", len(keys), projection)
+
+    request_keys = [{"PK": key["pk"], "SK": key["sk"]} for key in keys]
+
+    try:
+        result = await batch_get_items(table, request_keys, projection)
+    except Exception as e:
+        logger.error("BatchGetItem 오류: %s", e)
+        raise HTTPException(status_code=500, detail=f"BatchGetItem operation failed: {str(e)}")
+
+    # 요청 순서대로 결과 구성 (없는 항목과 미처리 항목을 명시)
+    unprocessed = {key_tuple(key) for key in result.unprocessed}
+    found_count = 0
+    entries = []
+    for key, request_key in zip(keys, request_keys):
+        item = result.found.get(key_tuple(request_key))
+        entry = {"pk": key["pk"], "sk": key["sk"], "found": item is not None}
+        if item is not None:
+            entry["item"] = item
+            found_count += 1
+        elif key_tuple(request_key) in unprocessed:
+            entry["unprocessed"] = True
+        entries.append(entry)
+
+    response_data = {
+        "items": entries,
+        "count": found_count,
+        "requested": len(keys),
+        "notFound": sum(1 for entry in entries if not entry["found"] and not entry.get("unprocessed")),
+        "unprocessed": len(unprocessed)
+    }
+
+    # 응답 크기 측정
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
+
+    logger.info("BatchGetItem 결과: 발견 %s개 / 요청 %s개, 미처리 %s개, BatchGetItem 호출 %s회, 데이터 크기 %.2fKB", found_count, len(keys), len(unprocessed), result.requests, response_size_kb)
+
+    # 응답 헤더 설정
+    headers = {
+        "X-Content-Size-KB": f"{response_size_kb:.2f}",
+        "X-Items-Count": str(found_count),
+        "X-Batch-Requests": str(result.requests),
+        "X-Unprocessed-Count": str(len(unprocessed))
+    }
+
+    return json_response(response_body, headers=headers)
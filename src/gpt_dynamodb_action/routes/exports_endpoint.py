@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Dict, List
+import logging
+
+from gpt_dynamodb_action.utils.exports import get_export_manager, iter_files
+from gpt_dynamodb_action.utils.parallel_scan import MAX_SEGMENTS
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _job_or_404(job_id: str):
+    job = get_export_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Export job '{job_id}' not found")
+    return job
+
+@router.post("/exports", status_code=202)
+async def create_export(
+    filters: Optional[Dict[str, str]] = Body(default=None),
+    operator: Optional[Dict[str, str]] = Body(default=None),
+    projection: Optional[List[str]] = Body(default=None, description="내보낼 속성 목록 (기본값: 모든 필드, parquet은 필수)"),
+    segments: Optional[int] = Body(default=None, ge=1, le=MAX_SEGMENTS, description="병렬 스캔 세그먼트 수 (기본값: EXPORT_SEGMENTS)"),
+    export_format: str = Body(default="ndjson.gz", alias="format", description="ndjson.gz 또는 parquet")
+):
+    """
+    Starts a background export of every matching item to compressed files.
+    Filters work like scan_table; a PK eq filter exports one partition with a Query.
+    Poll GET /exports/{jobId} for progress, then download the files.
+    Example: {"filters":{"PK":"COM#MEM#A001"},"format":"ndjson.gz"}
+    """
+    try:
+        job = await get_export_manager().create(export_format, filters, operator, projection, segments)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(encode_json(job.summary()), status_code=202, headers={"Location": f"/exports/{job.id}"})
+
+@router.get("/exports")
+async def list_exports():
+    """Lists export jobs, newest first."""
+    # 작업 상태는 파일에 있으므로 이벤트 루프를 막지 않도록 스레드 풀에서 읽음
+    jobs = [job.summary() for job in await run_in_threadpool(get_export_manager().list_jobs)]
+    return json_response(encode_json({"jobs": jobs, "count": len(jobs)}))
+
+@router.get("/exports/{job_id}")
+async def get_export(job_id: str):
+    """
+    Returns the status (queued, running, completed, failed, cancelled, interrupted)
+    and progress (items, bytes, consumed capacity) of an export job.
+    """
+    return json_response(encode_json((await run_in_threadpool(_job_or_404, job_id)).summary()))
+
+@router.post("/exports/{job_id}/resume", status_code=202)
+async def resume_export(job_id: str):
+    """Resumes an interrupted, failed or cancelled export from its last checkpoint."""
+    try:
+        job = await get_export_manager().resume(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Export job '{job_id}' not found")
+    return json_response(encode_json(job.summary()), status_code=202)
+
+@router.delete("/exports/{job_id}")
+async def delete_export(job_id: str):
+    """Cancels a running export, or deletes the files of a finished one."""
+    job = await run_in_threadpool(get_export_manager().cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Export job '{job_id}' not found")
+    return json_response(encode_json(job.summary()))
+
+@router.get("/exports/{job_id}/download")
+def download_export(job_id: str):
+    """Downloads a completed ndjson.gz export as one gzip stream."""
+    job = _job_or_404(job_id)
+    if job.format != "ndjson.gz":
+        raise HTTPException(status_code=400, detail="Only ndjson.gz exports can be downloaded as one file; use /files/{name}")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    manager = get_export_manager()
+    # 파일마다 독립된 gzip 멤버이므로 이어 붙이면 하나의 gzip 스트림이 됨 (메모리는 청크 하나로 제한)
+    paths = [manager.file_path(job, name) for name in job.files()]
+    headers = {"Content-Disposition": f'attachment; filename="{job.id}.ndjson.gz"'}
+    return StreamingResponse(iter_files(paths), media_type="application/gzip", headers=headers)
+
+@router.get("/exports/{job_id}/files/{name}")
+def download_export_file(job_id: str, name: str):
+    """Downloads one checkpointed file of an export (listed in files)."""
+    job = _job_or_404(job_id)
+    path = get_export_manager().file_path(job, name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"File '{name}' not found in export job '{job_id}'")
+    media_type = "application/gzip" if name.endswith(".gz") else "application/vnd.apache.parquet"
+    return FileResponse(path, media_type=media_type, filename=name)
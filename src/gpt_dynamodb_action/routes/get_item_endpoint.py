@@ -1,21 +1,25 @@
-from fastapi import APIRouter, Body, HTTPException
+from fastapi import APIRouter, Body, HTTPException, Request
 from typing import Optional, List
 from fastapi.responses import JSONResponse
-import json
 import logging
 
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.budget import consumed_units
+from gpt_dynamodb_action.utils.cache import CachedResponse, get_cache, cache_bypassed, with_cache_header
 from gpt_dynamodb_action.utils.dynamo_helpers import (
-    get_table,
-    prepare_response_data,
-    DecimalEncoder,
     build_projection_expression
 )
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+from gpt_dynamodb_action.utils.single_flight import coalesce
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/get_item")
-def get_item(
+@coalesce("get_item")
+async def get_item(
+    request: Request,
     pk: str = Body(..., description="파티션 키 값(PK에 할당될 값)"),
     sk: str = Body(..., description="정렬 키 값(SK에 할당될 값)"),
     projection: Optional[List[str]] = Body(default=None, description="반환할 속성 목록 (기본값: 모든 필드)")
@@ -27,10 +31,20 @@ def get_item(
     """
     
     # DynamoDB 테이블 참조 가져오기
-    table = get_table()
+    table = get_async_table()
     
     # 로깅
-    logger.info(f"GetItem 파라미터: PK={pk}, SK={sk}, 프로젝션={projection}")
+    logger.info("GetItem 파라미터: PK=%s, SK=%s, 프로젝션=%s", pk, sk, projection)
+    
+    # 캐시 조회 (Cache-Control: no-cache이면 건너뜀)
+    cache = get_cache()
+    cache_key = cache.make_key("get_item", {"pk": pk, "sk": sk, "projection": projection})
+    bypass = cache_bypassed(request.headers.get("cache-control"))
+    if not bypass:
+        cached = await cache.get(cache_key)
+        if cached:
+            logger.info("GetItem 캐시 적중: PK=%s, SK=%s", pk, sk)
+            return json_response(cached.body, headers=with_cache_header(cached.headers, "HIT"))
     
     # 프로젝션 표현식 및 표현식 속성 이름 구성
     projection_expression = None
@@ -45,7 +59,8 @@ def get_item(
             "Key": {
                 "PK": pk,
                 "SK": sk
-            }
+            },
+            "ReturnConsumedCapacity": "TOTAL"
         }
         
         # 프로젝션 표현식과 속성 이름이 있는 경우 추가
@@ -53,7 +68,7 @@ def get_item(
             get_item_kwargs["ProjectionExpression"] = projection_expression
             get_item_kwargs["ExpressionAttributeNames"] = expression_attribute_names
         
-        response = table.get_item(**get_item_kwargs)
+        response = await table.get_item(**get_item_kwargs)
         
         # 'Item' 키가 있는지 확인 (항목이 존재하는 경우)
         item = response.get('Item')
@@ -64,30 +79,34 @@ def get_item(
                 content={"detail": f"Item with PK='{pk}' and SK='{sk}' not found"}
             )
         
-        # 항목 처리 (Decimal 타입 변환)
-        # prepare_response_data 함수에서 마지막 매개변수는 scanned count이지만
-        # get_item은's scanned count가 없으므로 1로 설정
-        response_data = prepare_response_data([item], None, 1)
+        # 응답 데이터 구성 (Decimal은 인코딩 중에 변환됨)
         response_data = {
-            "item": response_data["items"][0],
+            "item": item,
             "count": 1
         }
         
         # 응답 크기 측정
-        response_json = json.dumps(response_data, cls=DecimalEncoder)
-        response_size_kb = len(response_json.encode('utf-8')) / 1024
+        response_body = encode_json(response_data)
+        response_size_kb = len(response_body) / 1024
         
         # GetItem 결과 로깅
-        logger.info(f"GetItem 결과: 항목 발견됨, 데이터 크기 {response_size_kb:.2f}KB")
+        logger.info("GetItem 결과: 항목 발견됨, 데이터 크기 %.2fKB", response_size_kb)
         
         # 응답 헤더 설정
         headers = {
             "X-Content-Size-KB": f"{response_size_kb:.2f}"
         }
         
-        return JSONResponse(content=response_data, headers=headers)
+        # 캐시에 저장 (TTL은 PK 접두사에 따라 결정, 소비 용량은 실제 조회한 응답에만 포함)
+        await cache.set(cache_key, CachedResponse(response_body, headers), pk=pk)
+        
+        headers = dict(headers, **{"X-Consumed-Capacity": f"{consumed_units(response):.2f}"})
+        return json_response(response_body, headers=with_cache_header(headers, "BYPASS" if bypass or not cache.enabled else "MISS"))
     
+    except ThrottledError:
+        # 스로틀링은 전역 핸들러가 503과 Retry-After로 응답
+        raise
     except Exception as e:
         # 예외 발생 시 로깅 및 에러 응답
-        logger.error(f"GetItem 오류: {str(e)}")
+        logger.error("GetItem 오류: %s", e)
         raise HTTPException(status_code=500, detail=f"GetItem operation failed: {str(e)}") 
\ No newline at end of file
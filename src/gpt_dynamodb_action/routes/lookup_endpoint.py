@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Body, HTTPException
+from typing import Optional
+import logging
+import time
+
+from gpt_dynamodb_action.utils.lookup_index import LOOKUP_MODES, get_lookup_service
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MAX_LOOKUP_LIMIT = 100
+
+@router.post("/lookup")
+async def lookup(
+    q: str = Body(..., description="찾을 값 (대소문자 구분 없음)"),
+    attribute: Optional[str] = Body(default=None, description="검색할 속성 (예: companyName, userName, email). 생략하면 색인된 모든 속성"),
+    mode: str = Body(default="prefix", description="prefix(값 또는 단어 접두사) 또는 contains(부분 문자열)"),
+    pk_prefix: Optional[str] = Body(default=None, description="결과를 이 PK 접두사로 제한 (예: COM#, USR#)"),
+    limit: int = Body(default=20, ge=1, le=MAX_LOOKUP_LIMIT, description="반환할 최대 결과 수")
+):
+    """
+    Fast name/email lookup over companies, products and users from an in-memory index.
+    Use this instead of scan_table with contains/begins_with on companyName, userName, email etc.
+    Returns PK/SK of matching items; fetch full items with get_item if needed.
+    Example: {"q":"acme","attribute":"companyName","mode":"contains"}
+    """
+    if mode not in LOOKUP_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(LOOKUP_MODES)}")
+
+    service = get_lookup_service()
+    if not service.settings.enabled:
+        raise HTTPException(status_code=503, detail="Lookup index is disabled; use scan_table instead")
+    if attribute and attribute not in service.settings.attributes:
+        raise HTTPException(status_code=400, detail=f"attribute must be one of: {', '.join(service.settings.attributes)}")
+    if not service.ready:
+        raise HTTPException(status_code=503, detail="Lookup index is still building; retry shortly or use scan_table",
+                            headers={"Retry-After": "5"})
+
+    started = time.perf_counter()
+    matches = service.index.search(q, mode, attribute, pk_prefix, limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    age = service.age_seconds()
+    logger.info("Lookup 결과: q=%s, 모드=%s, %s건, %.3fms", q, mode, len(matches), elapsed_ms)
+
+    response_data = {
+        "matches": matches,
+        "count": len(matches),
+        "indexAgeSeconds": round(age, 1),
+        "indexedItems": len(service.index)
+    }
+    if service.truncated:
+        response_data["truncated"] = True
+    headers = {"X-Index-Age-Seconds": f"{age:.1f}"}
+    return json_response(encode_json(response_data), headers=headers)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from gpt_dynamodb_action.utils.worker_metrics import get_worker_metrics
+
+router = APIRouter()
+
+# Prometheus 텍스트 노출 형식
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 형식의 지표를 반환합니다 (GPT 액션 스키마에는 포함하지 않음, 워커가 여럿이면 합산)."""
+    return PlainTextResponse(get_worker_metrics().render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,132 +1,222 @@
-from fastapi import APIRouter, Body
-from typing import Optional, Dict, List
-from fastapi.responses import JSONResponse
-import json
+from fastapi import APIRouter, Body, HTTPException, Request
+from typing import Any, Optional, Dict, List, Union
 import logging
-from boto3.dynamodb.conditions import Key
 
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.cache import CachedResponse, get_cache, cache_bypassed, with_cache_header
+from gpt_dynamodb_action.utils.columnar import collector
+from gpt_dynamodb_action.utils.cursor import CursorError, next_token, request_fingerprint, resume_key
+from gpt_dynamodb_action.utils.filter_compiler import FilterError
 from gpt_dynamodb_action.utils.dynamo_helpers import (
-    get_table,
-    build_projection_expression,
-    create_filter_expression,
-    convert_to_number,
+    build_filter,
+    build_query_kwargs,
     prepare_response_data,
-    DecimalEncoder
+    strip_attributes
 )
+from gpt_dynamodb_action.utils.pagination import PageReader
+from gpt_dynamodb_action.utils.query_planner import PLAN_QUERY, QueryPlan, plan_index_query
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+from gpt_dynamodb_action.utils.single_flight import coalesce
+from gpt_dynamodb_action.utils.streaming import MAX_STREAM_LIMIT, wants_ndjson, ndjson_response
+from gpt_dynamodb_action.utils.table_registry import get_registry
+from gpt_dynamodb_action.utils.top_k import MAX_TOP_K, TopK, read_top_k, sort_projection
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/query_table")
-def query_table(
+@coalesce("query_table")
+async def query_table(
+    request: Request,
     pk: str = Body(..., description="파티션 키 값(PK에 할당될 값)"),
     sk: Optional[str] = Body(default=None, description="정렬 키 값(SK에 할당될 값)"),
     sk_operator: Optional[str] = Body(default="eq", description="SK 연산자 - 'eq' 또는 'begins_with'"),
     filters: Optional[Dict[str, str]] = Body(default=None, description="추가 필터 조건 (키:값 쌍)"),
     operator: Optional[Dict[str, str]] = Body(default=None, description="필터 연산자 (키:연산자 쌍)"),
-    start_key: Optional[dict] = Body(default=None, description="페이지네이션 시작 키"),
+    start_key: Optional[Union[str, dict]] = Body(default=None, description="페이지네이션 시작 키 (이전 응답의 lastEvaluatedKey 토큰)"),
     limit: Optional[int] = Body(default=100, description="최대 반환 항목 수 (최대 100)"),
-    projection: Optional[List[str]] = Body(default=["PK", "SK", "name", "createdAt"], description="반환할 속성 목록")
+    projection: Optional[List[str]] = Body(default=["PK", "SK", "name", "createdAt"], description="반환할 속성 목록"),
+    stream: Optional[bool] = Body(default=False, description="true이면 항목을 NDJSON으로 스트리밍 (최대 10000개)"),
+    max_pages: Optional[int] = Body(default=None, description="읽을 최대 페이지 수 (초과 시 연속 키와 함께 조기 반환)"),
+    max_scanned_items: Optional[int] = Body(default=None, description="읽을 최대 항목 수 (필터 적용 전)"),
+    max_rcu: Optional[float] = Body(default=None, description="소비할 최대 읽기 용량 단위"),
+    index_name: Optional[str] = Body(default=None, description="쿼리할 보조 인덱스(GSI/LSI) 이름. 지정하면 pk/sk는 인덱스 키 값"),
+    response_format: Optional[str] = Body(default="items", alias="format", description="items, columnar(헤더 + 행 배열) 또는 columns(속성별 배열)"),
+    sort_by: Optional[str] = Body(default=None, description="정렬할 속성. 지정하면 모든 페이지를 읽어 상위 top_k개만 반환"),
+    order: Optional[str] = Body(default="desc", description="정렬 순서 - 'asc' 또는 'desc'"),
+    top_k: Optional[int] = Body(default=None, description=f"정렬 후 반환할 항목 수 (기본값: limit, 최대 {MAX_TOP_K})"),
+    where: Optional[Dict[str, Any]] = Body(default=None, description="and/or/not 조건 트리 (filters와 AND로 결합)")
 ):
     """
     DynamoDB Query with pagination. PK supports 'eq', SK supports 'eq'/'begins_with'.
-    Filters accept various operators. Returns max 100 items with pagination.
+    Filters accept the scan_table operators (eq, ne, gt/gte/lt/lte, begins_with,
+    contains, in, between, exists, not_exists, not_*) and the where tree.
+    eq/ne/in compare strings as strings; use JSON numbers in where to match numbers.
+    Returns max 100 items with pagination.
     Example: {"pk":"COM#","sk":"COM#ABC","sk_operator":"begins_with"}
+    stream=true returns NDJSON lines ending with a _meta record.
+    max_pages/max_scanned_items/max_rcu stop early with lastEvaluatedKey.
+    index_name queries a GSI/LSI; pk/sk are then that index's key values.
+    Pass lastEvaluatedKey back unchanged as start_key with the same params.
+    format=columnar returns columns + rows arrays instead of item objects.
+    sort_by/order/top_k read every matching page and return the top_k items,
+    e.g. {"pk":"COM#","sort_by":"registrationCount","top_k":5}.
     """
     
     # DynamoDB 테이블 참조 가져오기
-    table = get_table()
+    table = get_async_table()
     
     # 로깅
-    logger.info(f"쿼리 파라미터: PK={pk}, SK={sk}, SK 연산자={sk_operator}, 필터={filters}, 필터 연산자={operator}, 시작 키={start_key}, 제한={limit}")
-    
-    # 기본 키 조건 생성 (PK는 항상 eq 연산만 지원)
-    key_condition = Key("PK").eq(pk)
-    
-    # SK 조건 추가 (지정된 경우)
-    if sk:
-        if sk_operator == "begins_with":
-            key_condition = key_condition & Key("SK").begins_with(sk)
-        else:  # 기본값은 eq
-            key_condition = key_condition & Key("SK").eq(sk)
-    
-    # 쿼리 파라미터 구성
-    query_kwargs = {
-        "KeyConditionExpression": key_condition,
-        "Limit": min(limit, 100)  # 최대 100개로 제한
-    }
+    logger.info("쿼리 파라미터: PK=%s, SK=%s, SK 연산자=%s, 필터=%s, 필터 연산자=%s, where=%s, 시작 키=%s, 제한=%s, 인덱스=%s", pk, sk, sk_operator, filters, operator, where, start_key, limit, index_name)
     
-    # 필터 표현식 추가 (있는 경우)
-    if filters:
-        filter_condition = None
-        for k, v in filters.items():
-            # 연산자 확인 (기본값은 'eq')
-            op = operator.get(k, 'eq') if operator else 'eq'
-            
-            # 숫자 비교 연산자인 경우 값 변환
-            if op in ['gt', 'gte', 'lt', 'lte']:
-                v = convert_to_number(v)
-                
-            # 연산자에 따른 표현식 생성
-            expr = create_filter_expression(k, op, v)
-            filter_condition = expr if filter_condition is None else filter_condition & expr
-            
-        query_kwargs["FilterExpression"] = filter_condition
+    # 필터 검증 (컴파일 결과는 LRU에 남아 요청 파라미터 구성에서 재사용)
+    try:
+        build_filter(filters, operator, where)
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # 프로젝션 표현식 추가
-    if projection:
-        projection_expression, expression_attribute_names = build_projection_expression(projection)
-        
-        if projection_expression and expression_attribute_names:
-            query_kwargs["ProjectionExpression"] = projection_expression
-            query_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+    # 정렬하려면 정렬 속성을 함께 읽고, 요청 프로젝션에 없으면 응답에서 뺌
+    read_projection, strip_sort_key = sort_projection(projection, sort_by)
+    
+    # 실행 계획 (보조 인덱스를 지정하면 프로젝션이 부족할 때 기본 테이블에서 다시 읽음)
+    if index_name:
+        try:
+            plan = plan_index_query(get_registry().get_schema(), index_name, pk, sk, sk_operator, filters, operator,
+                                    read_projection, where)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        plan = QueryPlan(PLAN_QUERY, pk=pk, sk=sk or None, sk_operator=sk_operator, filters=dict(filters or {}),
+                         operator=dict(operator or {}), where=where)
+    
+    # 연속 토큰은 같은 키 조건/필터/프로젝션/인덱스의 요청에서만 사용할 수 있음
+    fingerprint = request_fingerprint("query_table", {
+        "pk": pk, "sk": sk, "sk_operator": sk_operator if sk else None, "filters": filters,
+        "operator": operator, "projection": projection, "index_name": index_name, "where": where
+    })
+    try:
+        exclusive_start_key = resume_key(start_key, fingerprint, plan.tag)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    encode_key = lambda key: next_token(fingerprint, key, plan.tag)
+    
+    # 비용 예산 (페이지 수, 스캔 항목 수, RCU)
+    budget = ScanBudget(max_pages, max_scanned_items, max_rcu)
+    streaming = wants_ndjson(stream, request)
+    try:
+        all_items = collector(response_format, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if streaming and response_format not in (None, "items"):
+        raise HTTPException(status_code=400, detail="stream is not supported with format=" + response_format)
+    stream_limit = min(limit or 100, MAX_STREAM_LIMIT)
+    top = None
+    if sort_by:
+        if streaming:
+            raise HTTPException(status_code=400, detail="sort_by is not supported with stream")
+        try:
+            top = TopK(sort_by, order, top_k or min(limit or 100, MAX_TOP_K))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
-    # 페이지네이션을 위한 시작 키 설정
-    if start_key:
-        query_kwargs["ExclusiveStartKey"] = start_key
+    # 쿼리 파라미터 구성 (키 조건, 필터, 프로젝션, 페이지 크기)
+    page_size = min(stream_limit, 1000) if streaming else min(limit, 100)  # 일반 응답은 최대 100개로 제한
     
-    # 결과 수집 초기화
-    all_items = []
+    def build_kwargs(p):
+        kwargs = build_query_kwargs(pk, sk, sk_operator, filters, operator, p, index=plan.index, where=where)
+        # 정렬할 때는 모든 항목을 읽으므로 페이지 크기를 제한하지 않음 (1MB 페이지)
+        return kwargs if top else dict(kwargs, Limit=page_size)
+    
+    reader = PageReader.create(table, "query", build_kwargs, read_projection, budget, plan.key_attributes, plan.fetch_base)
+    
+    # 스트리밍 모드: 페이지가 도착할 때마다 항목을 전송 (메모리는 한 페이지로 제한)
+    if streaming:
+        response = ndjson_response(reader.read, "query", exclusive_start_key, stream_limit, budget, encode_key)
+        response.headers["X-Query-Plan"] = plan.header()
+        return response
+    
+    # 캐시 조회 (Cache-Control: no-cache이면 건너뜀)
+    cache = get_cache()
+    cache_key = cache.make_key("query_table", {
+        "pk": pk, "sk": sk, "sk_operator": sk_operator if sk else None, "filters": filters,
+        "operator": operator, "projection": projection, "start_key": start_key, "limit": limit,
+        "max_pages": max_pages, "max_scanned_items": max_scanned_items, "max_rcu": max_rcu, "format": response_format,
+        "index_name": index_name, "where": where, "sort_by": sort_by, "order": order if sort_by else None, "top_k": top_k if sort_by else None
+    })
+    bypass = cache_bypassed(request.headers.get("cache-control"))
+    if not bypass:
+        cached = await cache.get(cache_key)
+        if cached:
+            logger.info("쿼리 캐시 적중: PK=%s, SK=%s", pk, sk)
+            return json_response(cached.body, headers=with_cache_header(cached.headers, "HIT"))
+    
+    # 결과 수집 초기화 (columnar 형식이면 페이지마다 바로 행 배열로 변환)
     last_evaluated_key = None
-    pages_scanned = 0
     max_limit = min(limit or 100, 100)  # 최대 100개로 제한
+    current_start_key = exclusive_start_key
     
     # 쿼리 실행
-    while len(all_items) < max_limit:
-        # 쿼리 실행
-        query_result = table.query(**query_kwargs)
-        
-        # 결과 처리
-        pages_scanned += 1
-        items = query_result.get("Items", [])
-        items_needed = max_limit - len(all_items)
-        all_items.extend(items[:items_needed])
+    if top:
+        # 정렬: 모든 페이지를 읽으며 크기 top_k의 힙만 유지 (예산이나 스로틀링으로 멈추면 연속 키를 반환)
+        last_evaluated_key = await read_top_k(reader, exclusive_start_key, top, budget)
+        sorted_items = top.items()
+        all_items.extend(strip_attributes(sorted_items, [sort_by]) if strip_sort_key else sorted_items)
+    else:
+        while len(all_items) < max_limit:
+            # 쿼리 실행 (페이지 일부만 사용하면 마지막 반환 항목의 키가 연속 키가 됨)
+            try:
+                query_result = await reader.read(current_start_key, max_limit - len(all_items))
+            except ThrottledError:
+                # 첫 페이지부터 실패하면 503, 이미 읽은 페이지가 있으면 스로틀링된 페이지부터 재개하도록 부분 결과를 반환
+                if current_start_key is exclusive_start_key:
+                    raise
+                budget.throttled = True
+                last_evaluated_key = current_start_key
+                break
+            all_items.extend(query_result.get("Items", []))
         
-        # 마지막 평가 키 업데이트
-        last_evaluated_key = query_result.get("LastEvaluatedKey")
+            # 마지막 평가 키 업데이트
+            last_evaluated_key = query_result.get("LastEvaluatedKey")
         
-        # 다음 페이지가 없거나 충분한 항목을 얻었으면 중단
-        if not last_evaluated_key or len(all_items) >= max_limit:
-            break
+            # 다음 페이지가 없거나 충분한 항목을 얻었거나 예산을 모두 썼으면 중단
+            if not last_evaluated_key or len(all_items) >= max_limit or budget.exhausted():
+                break
             
-        # 다음 페이지 조회를 위한 시작 키 업데이트
-        query_kwargs["ExclusiveStartKey"] = last_evaluated_key
+            # 다음 페이지 조회를 위한 시작 키 업데이트
+            current_start_key = last_evaluated_key
     
     # 응답 데이터 준비
-    response_data = prepare_response_data(all_items, last_evaluated_key, len(all_items))
+    budget.returned = len(all_items)
+    response_data = prepare_response_data(all_items, encode_key(last_evaluated_key), len(all_items))
+    if last_evaluated_key and budget.exhausted_reason:
+        response_data["budgetExhausted"] = budget.exhausted_reason
+    if top:
+        # 예산으로 멈춘 경우 상위 항목은 지금까지 읽은 항목 기준 (start_key로 나머지의 상위 항목을 이어서 구할 수 있음)
+        response_data["sort"] = top.describe()
     
     # 응답 크기 측정
-    response_json = json.dumps(response_data, cls=DecimalEncoder)
-    response_size_kb = len(response_json.encode('utf-8')) / 1024
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
     
     # 쿼리 결과 로깅
-    logger.info(f"쿼리 결과: 반환 항목 {len(all_items)}개, 데이터 크기 {response_size_kb:.2f}KB, 페이지 수: {pages_scanned}, 다음 페이지: {last_evaluated_key}")
+    logger.info("쿼리 결과: 반환 항목 %s개, 데이터 크기 %.2fKB, 페이지 수: %s, 다음 페이지: %s", len(all_items), response_size_kb, budget.pages, last_evaluated_key)
+    budget.log("query")
     
     # 응답 헤더 설정
     headers = {
         "X-Content-Size-KB": f"{response_size_kb:.2f}",
         "X-Items-Count": str(len(all_items)),
-        "X-Pages-Scanned": str(pages_scanned)
+        "X-Pages-Scanned": str(budget.pages),
+        "X-Query-Plan": plan.header()
     }
+    if top:
+        headers["X-Items-Considered"] = str(top.considered)
+    
+    # 캐시에 저장 (TTL은 PK 접두사에 따라 결정, 비용 헤더는 실제 조회한 응답에만 포함, 스로틀링으로 잘린 결과는 제외)
+    if not budget.throttled:
+        await cache.set(cache_key, CachedResponse(response_body, headers), pk=pk)
     
-    return JSONResponse(content=response_data, headers=headers) 
\ No newline at end of file
+    headers = with_cache_header(dict(headers, **budget.headers()), "BYPASS" if bypass or not cache.enabled else "MISS")
+    return json_response(response_body, headers=headers) 
\ No newline at end of file
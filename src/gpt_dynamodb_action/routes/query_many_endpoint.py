@@ -0,0 +1,199 @@
+from fastapi import APIRouter, Body, HTTPException
+from typing import Optional, Dict, List, Union
+import asyncio
+import logging
+
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.cursor import CursorError, next_token, request_fingerprint, resume_key
+from gpt_dynamodb_action.utils.dynamo_helpers import (
+    build_query_kwargs,
+    item_key,
+    with_key_projection
+)
+from gpt_dynamodb_action.utils.filter_compiler import FilterError
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 한 번에 조회할 수 있는 최대 파티션 수와 동시 실행 수
+MAX_PARTITIONS = 50
+MAX_CONCURRENCY = 16
+
+class _ItemBudget:
+    """모든 파티션이 공유하는 전체 반환 항목 예산입니다."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+
+    def take(self, count: int) -> int:
+        granted = min(count, self.remaining)
+        self.remaining -= granted
+        return granted
+
+async def _query_partition(table, pk, query_kwargs, start_key, budget, per_partition_limit, semaphore, filtered):
+    """한 파티션의 쿼리 루프를 실행합니다. 전체 예산이 소진되거나 스로틀링되면 연속 키를 남기고 중단합니다."""
+    state = {"items": [], "lastEvaluatedKey": start_key, "done": False, "pages": 0, "scannedCount": 0, "throttled": False}
+
+    async with semaphore:
+        current_start_key = start_key
+        while budget.remaining > 0 and len(state["items"]) < per_partition_limit:
+            page_kwargs = dict(query_kwargs)
+            if current_start_key:
+                page_kwargs["ExclusiveStartKey"] = current_start_key
+            if not filtered:
+                # 필터가 없으면 필요한 만큼만 읽도록 페이지 크기를 제한
+                page_kwargs["Limit"] = min(budget.remaining, per_partition_limit - len(state["items"]), 1000)
+
+            try:
+                page = await table.query(**page_kwargs)
+            except ThrottledError:
+                # 이 파티션은 마지막 연속 키에서 다시 시작하도록 남겨둠
+                state["throttled"] = True
+                break
+            state["pages"] += 1
+            state["scannedCount"] += page.get("ScannedCount", 0)
+            items = page.get("Items", [])
+            wanted = min(len(items), per_partition_limit - len(state["items"]))
+            granted = budget.take(wanted)
+
+            if granted < len(items):
+                # 페이지 일부만 사용한 경우 마지막으로 반환한 항목 다음부터 재개
+                items = items[:granted]
+                state["items"].extend(items)
+                if items:
+                    state["lastEvaluatedKey"] = item_key(items[-1])
+                break
+
+            state["items"].extend(items)
+            current_start_key = page.get("LastEvaluatedKey")
+            state["lastEvaluatedKey"] = current_start_key
+            if not current_start_key:
+                state["done"] = True
+                break
+
+    return pk, state
+
+@router.post("/query_many")
+async def query_many(
+    pks: List[str] = Body(..., description="조회할 파티션 키 목록 (최대 50개)"),
+    sk: Optional[str] = Body(default=None, description="모든 파티션에 적용할 정렬 키 값"),
+    sk_operator: Optional[str] = Body(default="eq", description="SK 연산자 - 'eq' 또는 'begins_with'"),
+    filters: Optional[Dict[str, str]] = Body(default=None, description="추가 필터 조건 (키:값 쌍)"),
+    operator: Optional[Dict[str, str]] = Body(default=None, description="필터 연산자 (키:연산자 쌍)"),
+    start_keys: Optional[Dict[str, Union[str, dict]]] = Body(default=None, description="파티션별 페이지네이션 시작 키 (PK:이전 응답의 startKeys 토큰)"),
+    limit: Optional[int] = Body(default=100, description="전체 최대 반환 항목 수 (최대 1000)"),
+    limit_per_partition: Optional[int] = Body(default=None, description="파티션별 최대 반환 항목 수"),
+    max_concurrency: Optional[int] = Body(default=8, description="동시에 실행할 쿼리 수 (최대 16)"),
+    projection: Optional[List[str]] = Body(default=["PK", "SK", "name", "createdAt"], description="반환할 속성 목록")
+):
+    """
+    Runs the same Query on many partition keys concurrently (max 50).
+    Shares SK condition, filters and projection; limit is the total budget.
+    Resume with startKeys/pendingPks from the response.
+    Example: {"pks":["COM#MEM#ABC123","COM#MEM#XYZ789"],"limit":200}
+    """
+
+    # 파라미터 검증
+    unique_pks = list(dict.fromkeys(pks))
+    if not unique_pks:
+        raise HTTPException(status_code=400, detail="pks must not be empty")
+    if len(unique_pks) > MAX_PARTITIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PARTITIONS} partition keys are allowed")
+
+    # DynamoDB 테이블 참조 가져오기
+    table = get_async_table()
+
+    # 로깅
+    logger.info("다중 쿼리 파라미터: 파티션 %s개, SK=%s, SK 연산자=%s, 필터=%s, 필터 연산자=%s, 제한=%s, 동시 실행=%s", len(unique_pks), sk, sk_operator, filters, operator, limit, max_concurrency)
+
+    max_limit = min(limit or 100, 1000)
+    per_partition_limit = min(limit_per_partition or max_limit, max_limit)
+    concurrency = max(1, min(max_concurrency or 8, MAX_CONCURRENCY))
+    # 연속 토큰은 파티션별로 같은 SK 조건/필터/프로젝션의 요청에서만 사용할 수 있음
+    fingerprints = {
+        pk: request_fingerprint("query_many", {
+            "pk": pk, "sk": sk, "sk_operator": sk_operator if sk else None, "filters": filters,
+            "operator": operator, "projection": projection
+        })
+        for pk in unique_pks
+    }
+    try:
+        start_keys = {pk: resume_key(key, fingerprints[pk]) for pk, key in (start_keys or {}).items() if pk in fingerprints}
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 부분 페이지 재개 위치 계산을 위해 기본 키를 프로젝션에 포함
+    query_projection, added_keys = with_key_projection(projection)
+    try:
+        request_kwargs = {pk: build_query_kwargs(pk, sk, sk_operator, filters, operator, query_projection) for pk in unique_pks}
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    budget = _ItemBudget(max_limit)
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        _query_partition(
+            table, pk, request_kwargs[pk],
+            start_keys.get(pk), budget, per_partition_limit, semaphore, bool(filters)
+        )
+        for pk in unique_pks
+    ]
+    results = dict(await asyncio.gather(*tasks))
+    throttled_pks = [pk for pk in unique_pks if results[pk]["throttled"]]
+    if throttled_pks and not any(state["pages"] for state in results.values()):
+        # 어떤 파티션도 읽지 못했으면 부분 결과 대신 503으로 응답
+        raise ThrottledError("query")
+
+    # 요청한 파티션 순서대로 결과 병합
+    all_items = []
+    partitions = {}
+    for pk in unique_pks:
+        state = results[pk]
+        items = state["items"]
+        if added_keys:
+            items = [{k: v for k, v in item.items() if k not in added_keys} for item in items]
+        all_items.extend(items)
+        partitions[pk] = {
+            "count": len(items),
+            "lastEvaluatedKey": None if state["done"] else next_token(fingerprints[pk], state["lastEvaluatedKey"]),
+            "done": state["done"],
+            "pagesScanned": state["pages"],
+            "scannedCount": state["scannedCount"]
+        }
+
+    pending_pks = [pk for pk in unique_pks if not partitions[pk]["done"]]
+    pages_scanned = sum(p["pagesScanned"] for p in partitions.values())
+    scanned_count = sum(p["scannedCount"] for p in partitions.values())
+
+    response_data = {
+        "items": all_items,
+        "count": len(all_items),
+        "scannedCount": scanned_count,
+        "partitions": partitions,
+        "pendingPks": pending_pks,
+        "startKeys": {pk: partitions[pk]["lastEvaluatedKey"] for pk in pending_pks if partitions[pk]["lastEvaluatedKey"]}
+    }
+    if throttled_pks:
+        response_data["throttledPks"] = throttled_pks
+
+    # 응답 크기 측정
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
+
+    logger.info("다중 쿼리 결과: 반환 항목 %s개, 스캔 항목 %s개, 데이터 크기 %.2fKB, 페이지 수: %s, 미완료 파티션 %s개", len(all_items), scanned_count, response_size_kb, pages_scanned, len(pending_pks))
+
+    # 응답 헤더 설정
+    headers = {
+        "X-Content-Size-KB": f"{response_size_kb:.2f}",
+        "X-Items-Count": str(len(all_items)),
+        "X-Scanned-Count": str(scanned_count),
+        "X-Pages-Scanned": str(pages_scanned),
+        "X-Partitions-Count": str(len(unique_pks)),
+        "X-Pending-Partitions": str(len(pending_pks))
+    }
+    if throttled_pks:
+        headers["X-Budget-Exhausted"] = "throttled"
+
+    return json_response(response_body, headers=headers)
@@ -1,90 +1,319 @@
-from fastapi import APIRouter, Body
-from typing import Optional, Dict, List
-from fastapi.responses import JSONResponse
-import json
+from fastapi import APIRouter, Body, HTTPException, Request
+from typing import Any, Optional, Dict, List, Union
 import logging
 
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.columnar import collector
+from gpt_dynamodb_action.utils.cursor import CursorError, decode_cursor, encode_cursor, next_token, request_fingerprint
+from gpt_dynamodb_action.utils.filter_compiler import FilterError
 from gpt_dynamodb_action.utils.dynamo_helpers import (
-    get_table, 
+    build_filter,
+    build_projection_expression,
+    build_query_kwargs,
     build_scan_kwargs, 
-    execute_scan, 
     prepare_response_data,
-    DecimalEncoder
+    strip_attributes,
+    with_key_projection
 )
+from gpt_dynamodb_action.utils.pagination import PageReader
+from gpt_dynamodb_action.utils.parallel_scan import (
+    MAX_SEGMENTS,
+    is_segmented_token,
+    segment_states_from_token,
+    parallel_scan
+)
+from gpt_dynamodb_action.utils.query_planner import PLAN_GET_ITEM, PLAN_SCAN, QueryPlan, plan_scan
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json, json_response
+from gpt_dynamodb_action.utils.single_flight import coalesce
+from gpt_dynamodb_action.utils.streaming import MAX_STREAM_LIMIT, wants_ndjson, ndjson_response
+from gpt_dynamodb_action.utils.table_registry import get_registry
+from gpt_dynamodb_action.utils.top_k import MAX_TOP_K, TopK, read_top_k, sort_projection
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/scan_table")
-def scan_table(
+@coalesce("scan_table")
+async def scan_table(
+    request: Request,
     filters: Optional[Dict[str, str]] = Body(default=None),
-    start_key: Optional[dict] = Body(default=None),
+    start_key: Optional[Union[str, dict]] = Body(default=None, description="이전 응답의 lastEvaluatedKey 토큰"),
     limit: Optional[int] = Body(default=100),
     operator: Optional[Dict[str, str]] = Body(default=None),
-    projection: Optional[List[str]] = Body(default=["PK", "SK", "name", "createdAt"])
+    projection: Optional[List[str]] = Body(default=["PK", "SK", "name", "createdAt"]),
+    segments: Optional[int] = Body(default=None, description="병렬 스캔 세그먼트 수 (2~32)"),
+    stream: Optional[bool] = Body(default=False, description="true이면 항목을 NDJSON으로 스트리밍"),
+    max_pages: Optional[int] = Body(default=None, description="읽을 최대 페이지 수 (초과 시 연속 키와 함께 조기 반환)"),
+    max_scanned_items: Optional[int] = Body(default=None, description="읽을 최대 항목 수 (필터 적용 전)"),
+    max_rcu: Optional[float] = Body(default=None, description="소비할 최대 읽기 용량 단위"),
+    response_format: Optional[str] = Body(default="items", alias="format", description="items, columnar(헤더 + 행 배열) 또는 columns(속성별 배열)"),
+    sort_by: Optional[str] = Body(default=None, description="정렬할 속성. 지정하면 모든 페이지를 읽어 상위 top_k개만 반환"),
+    order: Optional[str] = Body(default="desc", description="정렬 순서 - 'asc' 또는 'desc'"),
+    top_k: Optional[int] = Body(default=None, description=f"정렬 후 반환할 항목 수 (기본값: limit, 최대 {MAX_TOP_K})"),
+    where: Optional[Dict[str, Any]] = Body(default=None, description="and/or/not 조건 트리 (filters와 AND로 결합)")
 ):
     """
     Scans DynamoDB with pagination. Handles 1MB response limits.
-    Filters use AND logic with operators: eq(default), begins_with,
-    contains, gt/gte, lt/lte. Gets results across pages.
+    Filters use AND logic with operators: eq(default), ne, begins_with,
+    contains, gt/gte, lt/lte, in, between (comma-separated values),
+    exists, not_exists; prefix not_ to negate (e.g. not_contains).
     Example: {"filters":{"PK":"COM#"},"operator":{"PK":"begins_with"}}
+    where adds OR/NOT groups, e.g. {"where":{"or":[{"attr":"status","op":"in",
+    "value":["PAID","SHIPPED"]},{"attr":"amount","op":"between","value":[100,500]}]}}
+    eq/ne/in compare strings as strings; use JSON numbers in where to match numbers.
+    Pass lastEvaluatedKey back unchanged as start_key with the same filters.
+    Set segments for a parallel scan.
+    stream=true returns NDJSON lines ending with a _meta record.
+    max_pages/max_scanned_items/max_rcu stop early with lastEvaluatedKey.
+    Filters pinning PK (eq) run as a Query, or GetItem if SK eq too.
+    Filters on a secondary index key (e.g. email eq) query that index.
+    format=columnar returns columns + rows arrays instead of item objects;
+    missing attributes are null, rare ones are listed in sparse as [row, value].
+    sort_by/order/top_k read every matching page and return the top_k items,
+    e.g. {"sort_by":"paidAt","order":"desc","top_k":10} for the latest 10.
     """
     
     # DynamoDB 테이블 참조 가져오기
-    table = get_table()
+    table = get_async_table()
     
     # 1. 필터 조건 로깅
-    logger.info(f"필터 조건: {filters}, 연산자: {operator}, 시작 키: {start_key}, 제한: {limit}, 프로젝션: {projection}")
+    logger.info("필터 조건: %s, 연산자: %s, where: %s, 시작 키: %s, 제한: %s, 프로젝션: %s, 세그먼트: %s", filters, operator, where, start_key, limit, projection, segments)
+    
+    # 필터 검증 (컴파일 결과는 LRU에 남아 요청 파라미터 구성에서 재사용)
+    try:
+        build_filter(filters, operator, where)
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 비용 예산 (페이지 수, 스캔 항목 수, RCU)
+    budget = ScanBudget(max_pages, max_scanned_items, max_rcu)
+    
+    # 연속 토큰은 같은 필터/연산자/프로젝션의 요청에서만 사용할 수 있음
+    fingerprint = request_fingerprint("scan_table", {"filters": filters, "operator": operator, "projection": projection, "where": where})
+    try:
+        cursor = decode_cursor(start_key, fingerprint) if start_key else None
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursor and cursor.segments is not None:
+        start_key = cursor.segments
+    elif cursor:
+        start_key = cursor.key
+    
+    # 정렬하려면 정렬 속성을 함께 읽고, 요청 프로젝션에 없으면 응답에서 뺌
+    read_projection, strip_sort_key = sort_projection(projection, sort_by)
     
-    # 스캔 파라미터 초기화
-    scan_kwargs = build_scan_kwargs(filters, operator, projection)
+    # 병렬 스캔 토큰으로 재개하는 경우 토큰의 세그먼트 수를 사용
+    if is_segmented_token(start_key):
+        segments = segments or start_key["totalSegments"]
+        plan = QueryPlan(PLAN_SCAN, filters=dict(filters or {}), operator=dict(operator or {}), where=where)
+    else:
+        # 필터가 테이블이나 보조 인덱스의 파티션 키를 고정하면 전체 스캔 대신 Query/GetItem으로 실행
+        plan = plan_scan(filters, operator, get_registry().get_schema(), read_projection, where)
+    if cursor and cursor.plan not in (None, plan.as_query().tag):
+        # 데이터나 스키마가 바뀌어 계획이 달라지면 키 형식이 맞지 않으므로 거부
+        raise HTTPException(status_code=400, detail="start_key token was issued for a different query plan")
+    logger.info("쿼리 계획: %s, 인덱스=%s, PK=%s, SK=%s, SK 연산자=%s, 남은 필터=%s, 기본 테이블 재조회=%s", plan.kind, plan.index.name if plan.index else None, plan.pk, plan.sk, plan.sk_operator, plan.filters, plan.fetch_base)
     
-    # 결과 수집 초기화
-    all_items = []
-    total_scanned_count = 0
+    streaming = wants_ndjson(stream, request)
+    try:
+        all_items = collector(response_format, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if streaming and response_format not in (None, "items"):
+        raise HTTPException(status_code=400, detail="stream is not supported with format=" + response_format)
+    top = None
+    if sort_by:
+        if streaming or (segments and segments > 1):
+            raise HTTPException(status_code=400, detail="sort_by is not supported with stream or segments")
+        try:
+            top = TopK(sort_by, order, top_k or min(limit or 100, MAX_TOP_K))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if segments and segments > 1:
+        if streaming:
+            raise HTTPException(status_code=400, detail="stream is not supported with segments")
+        if plan.kind == PLAN_SCAN:
+            response = await _parallel_scan_table(table, filters, operator, where, projection, start_key, limit, segments,
+                                                  budget, fingerprint, all_items)
+            response.headers["X-Query-Plan"] = f"{plan.header()}; segments={segments}"
+            return response
+        logger.info("%s 계획에서는 세그먼트를 사용하지 않습니다: %s", plan.kind, segments)
+    
+    if plan.kind == PLAN_GET_ITEM and not streaming:
+        return await _get_item_plan(table, plan, projection, budget, all_items)
+    
+    # 스캔/쿼리 파라미터 초기화 (연속 키 계산을 위해 키 속성을 프로젝션에 포함)
+    plan = plan.as_query()
+    if plan.kind == PLAN_SCAN:
+        build_kwargs, operation = (lambda p: build_scan_kwargs(plan.filters, plan.operator, p, plan.where)), "scan"
+    else:
+        build_kwargs = lambda p: build_query_kwargs(plan.pk, plan.sk, plan.sk_operator, plan.filters, plan.operator,
+                                                    p, index=plan.index, where=plan.where)
+        operation = "query"
+    reader = PageReader.create(table, operation, build_kwargs, read_projection, budget, plan.key_attributes, plan.fetch_base)
+    encode_key = lambda key: next_token(fingerprint, key, plan.tag)
+    
+    # 스트리밍 모드: 페이지가 도착할 때마다 항목을 전송 (메모리는 한 페이지로 제한)
+    if streaming:
+        response = ndjson_response(reader.read, operation, start_key, min(limit or 100, MAX_STREAM_LIMIT), budget, encode_key)
+        response.headers["X-Query-Plan"] = plan.header()
+        return response
+    
+    # 결과 수집 초기화 (columnar 형식이면 페이지마다 바로 행 배열로 변환)
     last_evaluated_key = None
     max_limit = min(limit or 100, 1000)  # limit이 None이면 100, 1000보다 크면 1000으로 제한
     current_start_key = start_key
-    pages_scanned = 0
     
-    # limit 개수에 도달하거나 더 이상 페이지가 없을 때까지 스캔 반복
-    while len(all_items) < max_limit:
-        # 다음 페이지 조회를 위한 스캔 쿼리 실행
-        scan_result = execute_scan(table, scan_kwargs, current_start_key)
-        
-        # 결과 처리
-        pages_scanned += 1
-        items = scan_result.get("Items", [])
-        items_needed = max_limit - len(all_items)
-        all_items.extend(items[:items_needed])
-        total_scanned_count += scan_result.get("ScannedCount", 0)
+    if top:
+        # 정렬: 모든 페이지를 읽으며 크기 top_k의 힙만 유지 (예산이나 스로틀링으로 멈추면 연속 키를 반환)
+        last_evaluated_key = await read_top_k(reader, start_key, top, budget)
+        sorted_items = top.items()
+        all_items.extend(strip_attributes(sorted_items, [sort_by]) if strip_sort_key else sorted_items)
+    else:
+        # limit 개수에 도달하거나 더 이상 페이지가 없을 때까지 스캔 반복
+        while len(all_items) < max_limit:
+            # 다음 페이지 조회 (페이지 일부만 사용하면 마지막 반환 항목의 키가 연속 키가 됨)
+            try:
+                scan_result = await reader.read(current_start_key, max_limit - len(all_items))
+            except ThrottledError:
+                # 첫 페이지부터 실패하면 503, 이미 읽은 페이지가 있으면 스로틀링된 페이지부터 재개하도록 부분 결과를 반환
+                if current_start_key is start_key:
+                    raise
+                budget.throttled = True
+                last_evaluated_key = current_start_key
+                break
+            all_items.extend(scan_result.get("Items", []))
         
-        # 마지막 평가 키 업데이트
-        last_evaluated_key = scan_result.get("LastEvaluatedKey")
+            # 마지막 평가 키 업데이트
+            last_evaluated_key = scan_result.get("LastEvaluatedKey")
         
-        # 다음 페이지가 없거나 충분한 항목을 얻었으면 중단
-        if not last_evaluated_key or len(all_items) >= max_limit:
-            break
+            # 다음 페이지가 없거나 충분한 항목을 얻었거나 예산을 모두 썼으면 중단
+            if not last_evaluated_key or len(all_items) >= max_limit or budget.exhausted():
+                break
             
-        # 다음 페이지 조회를 위한 시작 키 업데이트
-        current_start_key = last_evaluated_key
+            # 다음 페이지 조회를 위한 시작 키 업데이트
+            current_start_key = last_evaluated_key
     
     # 응답 데이터 준비
-    response_data = prepare_response_data(all_items, last_evaluated_key, total_scanned_count)
+    budget.returned = len(all_items)
+    response_data = prepare_response_data(all_items, encode_key(last_evaluated_key), budget.scanned)
+    if last_evaluated_key and budget.exhausted_reason:
+        response_data["budgetExhausted"] = budget.exhausted_reason
+    if top:
+        # 예산으로 멈춘 경우 상위 항목은 지금까지 읽은 항목 기준 (start_key로 나머지의 상위 항목을 이어서 구할 수 있음)
+        response_data["sort"] = top.describe()
     
     # 응답 크기 측정
-    response_json = json.dumps(response_data, cls=DecimalEncoder)
-    response_size_kb = len(response_json.encode('utf-8')) / 1024
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
     
     # 2. 스캔 결과 로깅
-    logger.info(f"결과: 스캔 항목 {total_scanned_count}개, 반환 항목 {len(all_items)}개, 데이터 크기 {response_size_kb:.2f}KB, 페이지 수: {pages_scanned}, 다음 페이지: {last_evaluated_key}")
+    logger.info("결과: 스캔 항목 %s개, 반환 항목 %s개, 데이터 크기 %.2fKB, 페이지 수: %s, 다음 페이지: %s", budget.scanned, len(all_items), response_size_kb, budget.pages, last_evaluated_key)
+    budget.log(operation)
     
     # 응답 헤더 설정
     headers = {
         "X-Content-Size-KB": f"{response_size_kb:.2f}",
         "X-Items-Count": str(len(all_items)),
-        "X-Scanned-Count": str(total_scanned_count),
-        "X-Pages-Scanned": str(pages_scanned)
+        "X-Scanned-Count": str(budget.scanned),
+        "X-Pages-Scanned": str(budget.pages),
+        "X-Query-Plan": plan.header(),
+        **budget.headers()
+    }
+    if top:
+        headers["X-Items-Considered"] = str(top.considered)
+    
+    return json_response(response_body, headers=headers)
+
+
+async def _get_item_plan(table, plan, projection, budget, collected):
+    """
+    PK와 SK가 모두 eq로 지정된 스캔 요청을 GetItem 한 번으로 처리합니다.
+    남은 필터는 컴파일된 필터의 파이썬 평가 함수로 가져온 항목에 적용합니다.
+    """
+    compiled = build_filter(plan.filters, plan.operator, plan.where)
+    # 필터 속성을 함께 읽고, 요청 프로젝션에 없던 속성은 응답에서 제거
+    added = sorted(compiled.attributes - set(projection)) if compiled and projection else []
+    get_item_kwargs = {"Key": {"PK": plan.pk, "SK": plan.sk}, "ReturnConsumedCapacity": "TOTAL"}
+    if projection:
+        projection_expression, expression_attribute_names = build_projection_expression(list(projection) + added)
+        get_item_kwargs["ProjectionExpression"] = projection_expression
+        get_item_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+    
+    result = await budget.track(table.get_item(**get_item_kwargs))
+    fetched = [result["Item"]] if result.get("Item") else []
+    items = strip_attributes([item for item in fetched if compiled is None or compiled.predicate(item)], added)
+    collected.extend(items)
+    
+    # 스캔과 같은 응답 형식 사용 (다음 페이지 없음)
+    budget.returned = len(items)
+    response_data = prepare_response_data(collected, None, len(fetched))
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
+    
+    logger.info("GetItem 계획 결과: 반환 항목 %s개, 데이터 크기 %.2fKB", len(items), response_size_kb)
+    budget.log("get_item")
+    
+    headers = {
+        "X-Content-Size-KB": f"{response_size_kb:.2f}",
+        "X-Items-Count": str(len(items)),
+        "X-Scanned-Count": str(len(fetched)),
+        "X-Pages-Scanned": str(budget.pages),
+        "X-Query-Plan": plan.header(),
+        **budget.headers()
+    }
+    
+    return json_response(response_body, headers=headers)
+
+
+async def _parallel_scan_table(table, filters, operator, where, projection, start_key, limit, segments, budget, fingerprint, collected):
+    """Segment/TotalSegments를 사용한 병렬 스캔을 실행하고 응답을 구성합니다."""
+    if segments > MAX_SEGMENTS:
+        raise HTTPException(status_code=400, detail=f"segments must be between 2 and {MAX_SEGMENTS}")
+    try:
+        states = segment_states_from_token(start_key, segments)
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid start_key: {str(e)}")
+    
+    # 세그먼트 재개 위치 계산을 위해 기본 키를 프로젝션에 포함
+    scan_projection, added_keys = with_key_projection(projection)
+    scan_kwargs = build_scan_kwargs(filters, operator, scan_projection, where)
+    scan_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+    max_limit = min(limit or 100, 1000)
+    
+    result = await parallel_scan(table, scan_kwargs, states, max_limit, budget)
+    
+    all_items = result.items
+    if added_keys:
+        all_items = [{k: v for k, v in item.items() if k not in added_keys} for item in all_items]
+    segment_state = result.continuation_token()
+    continuation_token = encode_cursor(fingerprint, segments=segment_state, plan=PLAN_SCAN) if segment_state else None
+    
+    # 응답 데이터 준비
+    collected.extend(all_items)
+    budget.returned = len(all_items)
+    response_data = prepare_response_data(collected, continuation_token, result.scanned_count)
+    if continuation_token and budget.exhausted_reason:
+        response_data["budgetExhausted"] = budget.exhausted_reason
+    
+    # 응답 크기 측정
+    response_body = encode_json(response_data)
+    response_size_kb = len(response_body) / 1024
+    
+    budget.log("parallel_scan")
+    logger.info("병렬 스캔 결과: 세그먼트 %s개, 스캔 항목 %s개, 반환 항목 %s개, 데이터 크기 %.2fKB, 페이지 수: %s", segments, result.scanned_count, len(all_items), response_size_kb, result.pages_scanned)
+    
+    # 응답 헤더 설정 (세그먼트별 페이지 수와 스캔 항목 수 포함)
+    headers = {
+        "X-Content-Size-KB": f"{response_size_kb:.2f}",
+        "X-Items-Count": str(len(all_items)),
+        "X-Scanned-Count": str(result.scanned_count),
+        "X-Pages-Scanned": str(result.pages_scanned),
+        "X-Segment-Pages": ",".join(f"{s.segment}:{s.pages}" for s in result.segments),
+        "X-Segment-Scanned-Count": ",".join(f"{s.segment}:{s.scanned}" for s in result.segments),
+        **budget.headers()
     }
     
-    return JSONResponse(content=response_data, headers=headers) 
\ No newline at end of file
+    return json_response(response_body, headers=headers)
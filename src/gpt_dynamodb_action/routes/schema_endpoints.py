@@ -1,228 +1,342 @@
-from fastapi import APIRouter
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import APIRouter, Request
+
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.static_response import StaticResponse, get_static_store
+from gpt_dynamodb_action.utils.table_registry import get_registry
+from gpt_dynamodb_action.utils.table_schema import sample_attributes
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+TABLE_COLUMNS = {
+    "PK": "Primary Partition Key",
+    "SK": "Sort Key",
+    "accountChannelCode": "Registration channel code",
+    "accountLoginId": "Account login ID",
+    "accountLoginPassword": "Account login password",
+    "accountNewsSubscription": "Newsletter subscription consent status",
+    "accountRegistrationSource": "User registration source",
+    "accountRegistrationType": "Registration method (email, social login)",
+    "activatedAt": "Account activation timestamp",
+    "agreeTerm": "Terms agreement status",
+    "authProvider": "External authentication provider (e.g., Google, Facebook)",
+    "companyCode": "Company code",
+    "companyDepartment": "Company department",
+    "companyEmployeeNumber": "Employee ID number",
+    "companyName": "Company name",
+    "companySK": "Company detailed identifier (Sort Key)",
+    "createdAt": "Creation timestamp",
+    "dataType": "Data type identifier",
+    "email": "Email address",
+    "engName": "English name",
+    "engNation": "Nationality in English",
+    "estimate": "Estimated amount",
+    "estimateFile": "Quotation file reference",
+    "finishAt": "Service end timestamp",
+    "gender": "Gender",
+    "groupKey": "Group identification key",
+    "groupName": "Group name",
+    "idNumber": "ID number or national identification number",
+    "insuranceCertificateUrl": "Insurance certificate URL",
+    "insuranceEndDate": "Insurance end date",
+    "insuranceEvacuationPlan": "Insurance evacuation plan",
+    "insurancePlan": "Insurance plan type",
+    "insuranceStartDate": "Insurance start date",
+    "linkPaperGuide": "Paper application guide link",
+    "linkPaperJoin": "Paper application submission link",
+    "linkPaperJoinEng": "Paper application submission link (English)",
+    "managerEmail": "Manager's email",
+    "managerName": "Manager's name",
+    "managerTel": "Manager's phone number",
+    "membershipCertificateUrl": "Corporate membership certificate URL",
+    "membershipCorporateType": "Corporate membership type",
+    "membershipEndDate": "Corporate membership end date",
+    "membershipPersonalType": "Corporate membership individual type",
+    "membershipStartDate": "Corporate membership start date",
+    "name": "Name",
+    "nation": "Country",
+    "paidAt": "Payment timestamp",
+    "paidPrice": "Payment amount",
+    "period": "Usage period",
+    "policyNumber": "Insurance policy number",
+    "price": "Base price",
+    "productName": "Product name",
+    "productSk": "Product detailed identifier (SK)",
+    "receipts": "Receipt list or file reference",
+    "registrationCount": "Registration count",
+    "registrationNumber": "Registration number",
+    "residenceBusinessTripType": "Stay type (residence/business trip)",
+    "residenceCityCode": "Residence city code",
+    "residenceCountryCode": "Residence country code",
+    "residenceCountryName": "Residence country name",
+    "residenceEndDate": "Residence end date",
+    "residenceStartDate": "Residence start date",
+    "residenceStayType": "Residence type (short-term/long-term)",
+    "startAt": "Start timestamp",
+    "status": "Status (e.g., active, expired)",
+    "tel": "Phone number",
+    "timestamp": "Timestamp (Unix epoch)",
+    "totalPrice": "Total amount",
+    "trainingInfo": "Training information",
+    "updatedAt": "Update timestamp",
+    "userBirthDate": "User birth date",
+    "userEmail": "User email address",
+    "userEmergencyContact": "Emergency contact",
+    "userEnglishName": "User's English name",
+    "userGender": "User gender",
+    "userName": "User's full name",
+    "userNote": "User note/memo",
+    "userPhone": "User phone number",
+    "userRegistrationNumber": "User registration number or ID number",
+    "userRelation": "Relationship to applicant (self, spouse, etc.)",
+    "userType": "User type (admin, regular, guest, etc.)"
+}
+
+PRIVACY_POLICY = {
+    "purpose": "DynamoDB 기반 고객 질의 자동화",
+    "collected_fields": ["userName", "email", "userBirthDate", "companyCode"],
+    "storage": "AWS DynamoDB (region: ap-northeast-2)",
+    "retention": "계약 종료 또는 서비스 이용 해지 시까지",
+    "third_party": "OpenAI API를 통한 GPT 호출 외, 제3자 제공 없음",
+    "security": "IAM 권한 통제 및 TLS 보안 사용",
+    "notes": "주민등록번호, 계좌번호, 카드번호 등의 민감 정보는 입력하지 마세요."
+}
+
+KEY_DESIGN = {
+    "key_patterns": [
+        {
+            "entity_type": "user",
+            "description": "Mostly administrators",
+            "pk_pattern": "USR#{email}",
+            "sk_pattern": "USR#{email}",
+            "example": {
+                "PK": "USR#john@example.com",
+                "SK": "USR#john@example.com"
+            },
+            "notes": "Single-item access pattern based on email address"
+        },
+        {
+            "entity_type": "company",
+            "description": "Mostly sellers/vendors",
+            "pk_pattern": "COM#",
+            "sk_pattern": "COM#{companyCode}",
+            "example": {
+                "PK": "COM#",
+                "SK": "COM#ABC123"
+            },
+            "notes": "Access company info by company code, query all companies with PK='COM#'"
+        },
+        {
+            "entity_type": "product",
+            "description": "Insurance, membership, or combined products",
+            "pk_pattern": "PROD#",
+            "sk_pattern": "PROD#{INSU|MSB|CMD}#{short uuid}",
+            "example": {
+                "PK": "PROD#",
+                "SK": "PROD#INSU#a7ud3fc94X"
+            },
+            "notes": "Distinguished by product type (INSU: Insurance, MSB: Membership, CMD: Combined) and UUID"
+        },
+        {
+            "entity_type": "groupInsurance",
+            "description": "Company group insurance subscription",
+            "pk_pattern": "COM#GRPINSU#{companyCode}",
+            "sk_pattern": "COM#GRPINSU#{companyCode}#{timestamp}",
+            "example": {
+                "PK": "COM#GRPINSU#ABC123",
+                "SK": "COM#GRPINSU#ABC123#1621234567890"
+            },
+            "notes": "Company group insurance info, chronological access using timestamp"
+        },
+        {
+            "entity_type": "groupInsuranceMember",
+            "description": "Group insurance members",
+            "pk_pattern": "COM#MEM#{companyCode}",
+            "sk_pattern": "COM#MEM#{companyCode}#{timestamp}#{number}",
+            "example": {
+                "PK": "COM#MEM#ABC123",
+                "SK": "COM#MEM#ABC123#1621234567890#001"
+            },
+            "notes": "Company membership user info, distinguished by timestamp and sequence number"
+        },
+        {
+            "entity_type": "insuplus",
+            "description": "Members registered in InsuPlus admin system",
+            "pk_pattern": "INSUPLUS#",
+            "sk_pattern": "INSUPLUS#{ulid}",
+            "example": {
+                "PK": "INSUPLUS#",
+                "SK": "INSUPLUS#01H5TWVJ4NT8B93M8T70HC20XK"
+            },
+            "notes": "InsuPlus system members, chronological access using ULID"
+        }
+    ],
+    "access_patterns": [
+        {
+            "description": "Get individual user",
+            "pattern": "GET PK='USR#{email}' SK='USR#{email}'"
+        },
+        {
+            "description": "List all companies",
+            "pattern": "QUERY PK='COM#'"
+        },
+        {
+            "description": "Get specific company",
+            "pattern": "GET PK='COM#' SK='COM#{companyCode}'"
+        },
+        {
+            "description": "List all products",
+            "pattern": "QUERY PK='PROD#'"
+        },
+        {
+            "description": "List insurance products only",
+            "pattern": "QUERY PK='PROD#' SK begins_with 'PROD#INSU#'"
+        },
+        {
+            "description": "List all group insurance for a company",
+            "pattern": "QUERY PK='COM#GRPINSU#{companyCode}'"
+        },
+        {
+            "description": "List all members for a company",
+            "pattern": "QUERY PK='COM#MEM#{companyCode}'"
+        },
+        {
+            "description": "List all InsuPlus members",
+            "pattern": "QUERY PK='INSUPLUS#'"
+        }
+    ],
+    "design_principles": [
+        "Single-table design: All entities stored in one table",
+        "PK (Partition Key) for data grouping, SK (Sort Key) for individual item identification",
+        "Prefixes (USR#, COM#, PROD#, etc.) to differentiate data types",
+        "Timestamps and UUIDs for uniqueness and chronological sorting",
+        "dataType attribute for additional item type distinction"
+    ]
+}
+
+
+@dataclass(frozen=True)
+class SchemaSettings:
+    """스키마 응답 설정입니다. 환경 변수에서 읽어옵니다."""
+    # static: 코드에 정의된 설명만 사용, live: 테이블 표본과 인덱스 정보를 함께 사용
+    source: str = "static"
+    sample_items: int = 500
+    refresh_seconds: float = 3600.0
+    max_age: int = 3600
+
+    @classmethod
+    def from_env(cls) -> "SchemaSettings":
+        defaults = cls()
+        return cls(
+            source=os.environ.get("SCHEMA_SOURCE", defaults.source).lower(),
+            sample_items=int(os.environ.get("SCHEMA_SAMPLE_ITEMS", defaults.sample_items)),
+            refresh_seconds=float(os.environ.get("SCHEMA_REFRESH_SECONDS", defaults.refresh_seconds)),
+            max_age=int(os.environ.get("SCHEMA_CACHE_MAX_AGE", defaults.max_age)),
+        )
+
+
+async def _live_documents(settings: SchemaSettings) -> dict:
+    """테이블 표본으로 컬럼 목록을, DescribeTable 결과로 보조 인덱스 목록을 보강합니다."""
+    observed = await sample_attributes(get_async_table(), settings.sample_items)
+    columns = dict(TABLE_COLUMNS)
+    for attribute, info in observed.items():
+        columns.setdefault(attribute, f"Observed attribute ({'/'.join(info['types'])})")
+    schema = get_registry().get_schema()
+    indexes = [
+        {
+            "name": index.name,
+            "type": "LSI" if index.is_local else "GSI",
+            "hash_key": index.hash_key,
+            "range_key": index.range_key,
+            "projection": index.projection_type,
+        }
+        for index in schema.indexes.values()
+    ]
+    return {
+        "describe_table_schema": {"columns": columns, "observed": observed},
+        "describe_key_design": dict(KEY_DESIGN, indexes=indexes),
+    }
+
+
+def _static_documents() -> dict:
+    return {
+        "describe_table_schema": {"columns": TABLE_COLUMNS},
+        "describe_key_design": KEY_DESIGN,
+        "privacy_policy": PRIVACY_POLICY,
+    }
+
+
+def build_static_responses(settings: Optional[SchemaSettings] = None):
+    """코드에 정의된 메타데이터 응답을 미리 인코딩/압축해 저장합니다."""
+    settings = settings or SchemaSettings.from_env()
+    store = get_static_store()
+    for name, data in _static_documents().items():
+        store.set(name, StaticResponse.build(data, settings.max_age))
+
+
+async def refresh_schema_responses(settings: Optional[SchemaSettings] = None):
+    """
+    메타데이터 응답을 다시 만듭니다. live 모드에서는 테이블을 표본 추출하고,
+    실패하면 기존 응답(없으면 정적 응답)을 유지합니다.
+    """
+    settings = settings or SchemaSettings.from_env()
+    if settings.source != "live":
+        build_static_responses(settings)
+        return
+    if get_static_store().get("privacy_policy") is None:
+        build_static_responses(settings)
+    try:
+        documents = await _live_documents(settings)
+    except Exception as e:
+        logger.warning("테이블 표본 기반 스키마 생성 실패, 기존 응답 유지: %s", e)
+        return
+    store = get_static_store()
+    for name, data in documents.items():
+        store.set(name, StaticResponse.build(data, settings.max_age))
+
+
+async def schema_refresh_loop(settings: Optional[SchemaSettings] = None):
+    """live 모드에서 주기적으로 메타데이터 응답을 갱신합니다 (애플리케이션 종료 시 취소)."""
+    settings = settings or SchemaSettings.from_env()
+    while True:
+        await asyncio.sleep(settings.refresh_seconds)
+        await refresh_schema_responses(settings)
+
+
+def _render(name: str, request: Request):
+    response = get_static_store().get(name)
+    if response is None:
+        # 시작 단계를 거치지 않은 경우(테스트 클라이언트 등) 정적 응답을 지연 생성
+        build_static_responses()
+        response = get_static_store().get(name)
+    return response.render(request)
+
 
 @router.get("/describe_table_schema")
-def describe_table_schema():
+def describe_table_schema(request: Request):
     """
     Returns a comprehensive schema description of the DynamoDB table columns.
     Includes all field names and their descriptions in English.
     """
-    return {
-        "columns": {
-            "PK": "Primary Partition Key",
-            "SK": "Sort Key",
-            "accountChannelCode": "Registration channel code",
-            "accountLoginId": "Account login ID",
-            "accountLoginPassword": "Account login password",
-            "accountNewsSubscription": "Newsletter subscription consent status",
-            "accountRegistrationSource": "User registration source",
-            "accountRegistrationType": "Registration method (email, social login)",
-            "activatedAt": "Account activation timestamp",
-            "agreeTerm": "Terms agreement status",
-            "authProvider": "External authentication provider (e.g., Google, Facebook)",
-            "companyCode": "Company code",
-            "companyDepartment": "Company department",
-            "companyEmployeeNumber": "Employee ID number",
-            "companyName": "Company name",
-            "companySK": "Company detailed identifier (Sort Key)",
-            "createdAt": "Creation timestamp",
-            "dataType": "Data type identifier",
-            "email": "Email address",
-            "engName": "English name",
-            "engNation": "Nationality in English",
-            "estimate": "Estimated amount",
-            "estimateFile": "Quotation file reference",
-            "finishAt": "Service end timestamp",
-            "gender": "Gender",
-            "groupKey": "Group identification key",
-            "groupName": "Group name",
-            "idNumber": "ID number or national identification number",
-            "insuranceCertificateUrl": "Insurance certificate URL",
-            "insuranceEndDate": "Insurance end date",
-            "insuranceEvacuationPlan": "Insurance evacuation plan",
-            "insurancePlan": "Insurance plan type",
-            "insuranceStartDate": "Insurance start date",
-            "linkPaperGuide": "Paper application guide link",
-            "linkPaperJoin": "Paper application submission link",
-            "linkPaperJoinEng": "Paper application submission link (English)",
-            "managerEmail": "Manager's email",
-            "managerName": "Manager's name",
-            "managerTel": "Manager's phone number",
-            "membershipCertificateUrl": "Corporate membership certificate URL",
-            "membershipCorporateType": "Corporate membership type",
-            "membershipEndDate": "Corporate membership end date",
-            "membershipPersonalType": "Corporate membership individual type",
-            "membershipStartDate": "Corporate membership start date",
-            "name": "Name",
-            "nation": "Country",
-            "paidAt": "Payment timestamp",
-            "paidPrice": "Payment amount",
-            "period": "Usage period",
-            "policyNumber": "Insurance policy number",
-            "price": "Base price",
-            "productName": "Product name",
-            "productSk": "Product detailed identifier (SK)",
-            "receipts": "Receipt list or file reference",
-            "registrationCount": "Registration count",
-            "registrationNumber": "Registration number",
-            "residenceBusinessTripType": "Stay type (residence/business trip)",
-            "residenceCityCode": "Residence city code",
-            "residenceCountryCode": "Residence country code",
-            "residenceCountryName": "Residence country name",
-            "residenceEndDate": "Residence end date",
-            "residenceStartDate": "Residence start date",
-            "residenceStayType": "Residence type (short-term/long-term)",
-            "startAt": "Start timestamp",
-            "status": "Status (e.g., active, expired)",
-            "tel": "Phone number",
-            "timestamp": "Timestamp (Unix epoch)",
-            "totalPrice": "Total amount",
-            "trainingInfo": "Training information",
-            "updatedAt": "Update timestamp",
-            "userBirthDate": "User birth date",
-            "userEmail": "User email address",
-            "userEmergencyContact": "Emergency contact",
-            "userEnglishName": "User's English name",
-            "userGender": "User gender",
-            "userName": "User's full name",
-            "userNote": "User note/memo",
-            "userPhone": "User phone number",
-            "userRegistrationNumber": "User registration number or ID number",
-            "userRelation": "Relationship to applicant (self, spouse, etc.)",
-            "userType": "User type (admin, regular, guest, etc.)"
-        }
-    }
+    return _render("describe_table_schema", request)
 
 @router.get("/privacy-policy")
-def privacy_policy():
+def privacy_policy(request: Request):
     """
     Returns privacy policy information for the application.
     """
-    return {
-        "purpose": "DynamoDB 기반 고객 질의 자동화",
-        "collected_fields": ["userName", "email", "userBirthDate", "companyCode", ...],
-        "storage": "AWS DynamoDB (region: ap-northeast-2)",
-        "retention": "계약 종료 또는 서비스 이용 해지 시까지",
-        "third_party": "OpenAI API를 통한 GPT 호출 외, 제3자 제공 없음",
-        "security": "IAM 권한 통제 및 TLS 보안 사용",
-        "notes": "주민등록번호, 계좌번호, 카드번호 등의 민감 정보는 입력하지 마세요."
-    }
+    return _render("privacy_policy", request)
 
 @router.get("/describe_key_design")
-def describe_key_design():
+def describe_key_design(request: Request):
     """
     Describes the DynamoDB key design patterns used in the database.
     Includes information about PK (Partition Key), SK (Sort Key) patterns, and brief explanations.
     """
-    return {
-        "key_patterns": [
-            {
-                "entity_type": "user",
-                "description": "Mostly administrators",
-                "pk_pattern": "USR#{email}",
-                "sk_pattern": "USR#{email}",
-                "example": {
-                    "PK": "USR#john@example.com",
-                    "SK": "USR#john@example.com"
-                },
-                "notes": "Single-item access pattern based on email address"
-            },
-            {
-                "entity_type": "company",
-                "description": "Mostly sellers/vendors",
-                "pk_pattern": "COM#",
-                "sk_pattern": "COM#{companyCode}",
-                "example": {
-                    "PK": "COM#",
-                    "SK": "COM#ABC123"
-                },
-                "notes": "Access company info by company code, query all companies with PK='COM#'"
-            },
-            {
-                "entity_type": "product",
-                "description": "Insurance, membership, or combined products",
-                "pk_pattern": "PROD#",
-                "sk_pattern": "PROD#{INSU|MSB|CMD}#{short uuid}",
-                "example": {
-                    "PK": "PROD#",
-                    "SK": "PROD#INSU#a7ud3fc94X"
-                },
-                "notes": "Distinguished by product type (INSU: Insurance, MSB: Membership, CMD: Combined) and UUID"
-            },
-            {
-                "entity_type": "groupInsurance",
-                "description": "Company group insurance subscription",
-                "pk_pattern": "COM#GRPINSU#{companyCode}",
-                "sk_pattern": "COM#GRPINSU#{companyCode}#{timestamp}",
-                "example": {
-                    "PK": "COM#GRPINSU#ABC123",
-                    "SK": "COM#GRPINSU#ABC123#1621234567890"
-                },
-                "notes": "Company group insurance info, chronological access using timestamp"
-            },
-            {
-                "entity_type": "groupInsuranceMember",
-                "description": "Group insurance members",
-                "pk_pattern": "COM#MEM#{companyCode}",
-                "sk_pattern": "COM#MEM#{companyCode}#{timestamp}#{number}",
-                "example": {
-                    "PK": "COM#MEM#ABC123",
-                    "SK": "COM#MEM#ABC123#1621234567890#001"
-                },
-                "notes": "Company membership user info, distinguished by timestamp and sequence number"
-            },
-            {
-                "entity_type": "insuplus",
-                "description": "Members registered in InsuPlus admin system",
-                "pk_pattern": "INSUPLUS#",
-                "sk_pattern": "INSUPLUS#{ulid}",
-                "example": {
-                    "PK": "INSUPLUS#",
-                    "SK": "INSUPLUS#01H5TWVJ4NT8B93M8T70HC20XK"
-                },
-                "notes": "InsuPlus system members, chronological access using ULID"
-            }
-        ],
-        "access_patterns": [
-            {
-                "description": "Get individual user",
-                "pattern": "GET PK='USR#{email}' SK='USR#{email}'"
-            },
-            {
-                "description": "List all companies",
-                "pattern": "QUERY PK='COM#'"
-            },
-            {
-                "description": "Get specific company",
-                "pattern": "GET PK='COM#' SK='COM#{companyCode}'"
-            },
-            {
-                "description": "List all products",
-                "pattern": "QUERY PK='PROD#'"
-            },
-            {
-                "description": "List insurance products only",
-                "pattern": "QUERY PK='PROD#' SK begins_with 'PROD#INSU#'"
-            },
-            {
-                "description": "List all group insurance for a company",
-                "pattern": "QUERY PK='COM#GRPINSU#{companyCode}'"
-            },
-            {
-                "description": "List all members for a company",
-                "pattern": "QUERY PK='COM#MEM#{companyCode}'"
-            },
-            {
-                "description": "List all InsuPlus members",
-                "pattern": "QUERY PK='INSUPLUS#'"
-            }
-        ],
-        "design_principles": [
-            "Single-table design: All entities stored in one table",
-            "PK (Partition Key) for data grouping, SK (Sort Key) for individual item identification",
-            "Prefixes (USR#, COM#, PROD#, etc.) to differentiate data types",
-            "Timestamps and UUIDs for uniqueness and chronological sorting",
-            "dataType attribute for additional item type distinction"
-        ]
-    } 
\ No newline at end of file
+    return _render("describe_key_design", request)
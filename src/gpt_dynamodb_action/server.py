@@ -0,0 +1,123 @@
+"""
+운영용 서버 진입점.
+
+설정을 한 번 검증한 뒤 uvicorn 워커 여러 개로 앱을 실행합니다 (uvloop/httptools가 설치되어 있으면 사용).
+각 워커는 lifespan에서 DynamoDB 클라이언트와 스키마 응답을 미리 준비하고,
+워커가 여럿이면 지표 스냅샷을 공유 디렉터리에 기록해 /metrics가 모든 워커 값을 합쳐 보여주며,
+종료 신호를 받으면 진행 중인 요청이 끝날 때까지 기다립니다.
+
+    poetry run serve
+    poetry run serve --workers 4 --port 8080
+    poetry run serve --check   # 설정만 검증
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import secrets
+import sys
+import tempfile
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+import uvicorn
+
+from gpt_dynamodb_action.utils.environment import ConfigError, configure_logging, load_environment, validate_settings
+from gpt_dynamodb_action.utils.worker_metrics import MetricsSettings, prepare_multiproc_dir
+
+logger = logging.getLogger(__name__)
+
+APP = "gpt_dynamodb_action.main:app"
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """운영 서버 설정입니다. 환경 변수에서 읽어옵니다."""
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    # 종료 신호 후 진행 중인 요청(스트리밍 포함)을 기다리는 최대 시간(초)
+    graceful_timeout: float = 30.0
+    # 요청이 끝난 뒤 공유 실행(single-flight)이 끝나기를 기다리는 최대 시간(초)
+    drain_seconds: float = 10.0
+    keep_alive: int = 5
+    access_log: bool = False
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        defaults = cls()
+        return cls(
+            host=os.environ.get("HOST", defaults.host),
+            port=int(os.environ.get("PORT", defaults.port)),
+            workers=int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or defaults.workers),
+            graceful_timeout=float(os.environ.get("SERVER_GRACEFUL_TIMEOUT", defaults.graceful_timeout)),
+            drain_seconds=float(os.environ.get("SERVER_DRAIN_SECONDS", defaults.drain_seconds)),
+            keep_alive=int(os.environ.get("SERVER_KEEP_ALIVE", defaults.keep_alive)),
+            access_log=os.environ.get("SERVER_ACCESS_LOG", "false").strip().lower() in ("1", "true", "yes", "on"),
+        )
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (기본값: WEB_CONCURRENCY 또는 CPU 수)")
+    parser.add_argument("--check", action="store_true", help="설정만 검증하고 종료")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    load_environment()
+    configure_logging()
+    args = parse_args(argv)
+    settings = ServerSettings.from_env()
+    overrides = {name: getattr(args, name) for name in ("host", "port", "workers") if getattr(args, name) is not None}
+    settings = replace(settings, **overrides)
+
+    try:
+        warnings = validate_settings(settings.workers)
+    except ConfigError as e:
+        logger.error("%s", e)
+        sys.exit(2)
+    for warning in warnings:
+        logger.warning("%s", warning)
+    if args.check:
+        logger.info("설정 검증 완료: %s", settings)
+        return
+
+    if settings.workers > 1 and not os.environ.get("CURSOR_SECRET"):
+        # 워커끼리 같은 서명 키를 쓰도록 환경 변수로 물려줌 (재시작하면 바뀜)
+        os.environ["CURSOR_SECRET"] = secrets.token_urlsafe(32)
+    if settings.workers > 1:
+        # /metrics가 모든 워커의 지표를 합치도록 스냅샷 디렉터리를 물려주고, 이전 실행 값은 지움
+        metrics_dir = MetricsSettings.from_env().multiproc_dir or tempfile.mkdtemp(prefix="gpt-dynamodb-metrics-")
+        os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+        prepare_multiproc_dir(metrics_dir)
+
+    loop, http = event_loop(), http_protocol()
+    logger.info("서버 시작: %s:%s, 워커 %s개, 이벤트 루프=%s, HTTP=%s", settings.host, settings.port, settings.workers, loop, http)
+    uvicorn.run(
+        APP,
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop=loop,
+        http=http,
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        timeout_keep_alive=settings.keep_alive,
+        access_log=settings.access_log,
+        proxy_headers=True,
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+SUPPORTED_METRICS = ("count", "sum", "avg", "min", "max")
+
+# 그룹 수 상한 (초과하는 그룹 값은 OTHER_GROUP으로 합산)
+MAX_GROUPS = 1000
+OTHER_GROUP = "_other"
+
+
+def _to_number(value: Any) -> Optional[Decimal]:
+    """숫자 또는 숫자 문자열을 Decimal로 변환합니다. 변환할 수 없으면 None을 반환합니다."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    if isinstance(value, str):
+        try:
+            number = Decimal(value)
+        except ArithmeticError:
+            return None
+        return number if number.is_finite() else None
+    return None
+
+
+class _Accumulator:
+    """한 그룹의 집계 값을 항목 하나씩 누적합니다."""
+
+    __slots__ = ("count", "value_count", "total", "minimum", "maximum", "text_minimum", "text_maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.value_count = 0
+        self.total = Decimal(0)
+        # 숫자와 문자열(날짜 등)의 최솟값/최댓값을 따로 추적
+        self.minimum = None
+        self.maximum = None
+        self.text_minimum = None
+        self.text_maximum = None
+
+    def add(self, value: Any):
+        self.count += 1
+        if value is None:
+            return
+        number = _to_number(value)
+        if number is not None:
+            self.value_count += 1
+            self.total += number
+            if self.minimum is None or number < self.minimum:
+                self.minimum = number
+            if self.maximum is None or number > self.maximum:
+                self.maximum = number
+        elif isinstance(value, str):
+            if self.text_minimum is None or value < self.text_minimum:
+                self.text_minimum = value
+            if self.text_maximum is None or value > self.text_maximum:
+                self.text_maximum = value
+
+    def result(self, metrics: Iterable[str], has_attribute: bool) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"count": self.count}
+        if not has_attribute:
+            return result
+        result["valueCount"] = self.value_count
+        if "sum" in metrics:
+            result["sum"] = self.total
+        if "avg" in metrics:
+            result["avg"] = self.total / self.value_count if self.value_count else None
+        # 숫자 값이 하나라도 있으면 숫자 기준 ("N/A" 같은 문자열은 무시), 없으면 문자열 기준
+        if "min" in metrics:
+            result["min"] = self.minimum if self.value_count else self.text_minimum
+        if "max" in metrics:
+            result["max"] = self.maximum if self.value_count else self.text_maximum
+        return result
+
+
+class Aggregator:
+    """
+    페이지 단위로 전달되는 항목에서 count/sum/avg/min/max를 점진적으로 계산합니다.
+    항목을 보관하지 않으므로 메모리는 그룹 수에만 비례합니다.
+    """
+
+    def __init__(self, attribute: Optional[str] = None, group_by: Optional[str] = None,
+                 metrics: Optional[List[str]] = None):
+        self.attribute = attribute
+        self.group_by = group_by
+        self.metrics = list(metrics or (SUPPORTED_METRICS if attribute else ["count"]))
+        self.total = _Accumulator()
+        self.groups: Dict[Any, _Accumulator] = {}
+
+    def add_items(self, items: Iterable[Dict[str, Any]]):
+        for item in items:
+            value = item.get(self.attribute) if self.attribute else None
+            self.total.add(value)
+            if self.group_by:
+                group = item.get(self.group_by)
+                if isinstance(group, (dict, list, set)):
+                    group = str(group)
+                accumulator = self.groups.get(group)
+                if accumulator is None:
+                    if len(self.groups) >= MAX_GROUPS:
+                        group = OTHER_GROUP
+                        accumulator = self.groups.get(group)
+                    if accumulator is None:
+                        accumulator = self.groups[group] = _Accumulator()
+                accumulator.add(value)
+
+    def add_count(self, count: int):
+        """Select=COUNT 응답의 항목 수를 더합니다."""
+        self.total.count += count
+
+    def result(self) -> Dict[str, Any]:
+        has_attribute = self.attribute is not None
+        result = {"metrics": self.total.result(self.metrics, has_attribute)}
+        if self.group_by:
+            result["groups"] = [
+                dict(self.groups[group].result(self.metrics, has_attribute), **{"group": group})
+                for group in sorted(self.groups, key=lambda g: (g is None, str(g)))
+            ]
+        return result
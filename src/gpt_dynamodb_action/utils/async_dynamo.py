@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from gpt_dynamodb_action.utils.metrics import DYNAMODB_CALL_SECONDS
+from gpt_dynamodb_action.utils.resilience import get_guard
+from gpt_dynamodb_action.utils.table_registry import get_registry
+from gpt_dynamodb_action.utils.timing import stage
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """async 모드에서 DynamoDB 호출 전용으로 사용하는 제한된 크기의 실행기를 반환합니다."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = get_registry().settings
+                # 기본값은 커넥션 풀 크기와 동일하게 맞춰 풀 고갈을 방지
+                max_workers = settings.async_max_workers or settings.max_pool_connections
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dynamo")
+                logger.info("DynamoDB 비동기 실행기 생성: 워커 %s개", max_workers)
+    return _executor
+
+
+async def run_dynamo(func: Callable, *args, **kwargs) -> Any:
+    """
+    블로킹 DynamoDB 호출을 이벤트 루프 밖에서 실행하고 결과를 기다립니다.
+    sync 모드는 FastAPI 기본 스레드풀을, async 모드는 전용 실행기를 사용합니다.
+    """
+    with stage("dynamodb"):
+        if get_registry().settings.execution_mode == "sync":
+            return await run_in_threadpool(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+class AsyncTable:
+    """boto3 Table의 읽기 작업을 await 가능한 메서드로 감싼 어댑터입니다."""
+
+    def __init__(self, table, resource=None):
+        self.table = table
+        self.resource = resource
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    async def _call(self, operation: str, func: Callable, **kwargs) -> Dict[str, Any]:
+        guard = get_guard()
+        if guard.bucket is not None:
+            # RCU 제한기가 실제 소비 용량을 차감할 수 있도록 소비 용량을 항상 요청
+            kwargs.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+        # 작업별 호출 지연 시간(실행기 대기 포함)을 지표로 기록
+        async def attempt():
+            started = time.perf_counter()
+            try:
+                return await run_dynamo(func, **kwargs)
+            finally:
+                DYNAMODB_CALL_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+        # 스로틀링 재시도와 워커 단위 RCU 제한은 DynamoGuard가 담당
+        return await guard.call(operation, attempt)
+
+    async def scan(self, **kwargs) -> Dict[str, Any]:
+        return await self._call("scan", self.table.scan, **kwargs)
+
+    async def query(self, **kwargs) -> Dict[str, Any]:
+        return await self._call("query", self.table.query, **kwargs)
+
+    async def get_item(self, **kwargs) -> Dict[str, Any]:
+        return await self._call("get_item", self.table.get_item, **kwargs)
+
+    async def batch_get_item(self, **kwargs) -> Dict[str, Any]:
+        """이 테이블에 대한 BatchGetItem을 실행합니다. kwargs는 RequestItems의 테이블 항목입니다."""
+        response = await self._call("batch_get_item", self.resource.batch_get_item, RequestItems={self.name: kwargs})
+        return {
+            "Responses": response.get("Responses", {}).get(self.name, []),
+            "UnprocessedKeys": response.get("UnprocessedKeys", {}).get(self.name, {}).get("Keys", [])
+        }
+
+
+def get_async_table(table_name: Optional[str] = None, region: Optional[str] = None) -> AsyncTable:
+    """레지스트리의 Table을 감싼 AsyncTable을 반환합니다."""
+    registry = get_registry()
+    return AsyncTable(registry.get_table(table_name, region), registry.get_resource(region))
+
+
+def shutdown_executor():
+    """전용 실행기를 정리합니다 (애플리케이션 종료 시 호출)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from gpt_dynamodb_action.utils.dynamo_helpers import (
+    KEY_ATTRIBUTES,
+    build_projection_expression,
+    item_key,
+    with_key_projection
+)
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+
+logger = logging.getLogger(__name__)
+
+# BatchGetItem 한 번에 요청할 수 있는 최대 키 수
+BATCH_GET_CHUNK_SIZE = 100
+
+# UnprocessedKeys 재시도 설정
+MAX_BATCH_RETRIES = 5
+BASE_BACKOFF_SECONDS = 0.05
+MAX_BACKOFF_SECONDS = 2.0
+
+
+@dataclass
+class BatchGetResult:
+    """BatchGetItem 결과입니다. found는 (PK, SK) 튜플을 키로 사용합니다."""
+    found: Dict[Tuple[Any, ...], Dict[str, Any]] = field(default_factory=dict)
+    unprocessed: List[Dict[str, Any]] = field(default_factory=list)
+    requests: int = 0
+
+
+def key_tuple(key: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(key[attr] for attr in KEY_ATTRIBUTES)
+
+
+def _backoff(attempt: int) -> float:
+    # 지터가 적용된 지수 백오프
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * (2 ** attempt)))
+
+
+async def _get_chunk(table, keys: List[Dict[str, Any]], request_base: Dict[str, Any], result: BatchGetResult):
+    pending = keys
+    for attempt in range(MAX_BATCH_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(_backoff(attempt))
+        try:
+            response = await table.batch_get_item(Keys=pending, **request_base)
+        except ThrottledError:
+            # 호출 자체가 스로틀링되면 남은 키를 미처리로 돌려줌
+            break
+        result.requests += 1
+        for item in response["Responses"]:
+            result.found[key_tuple(item)] = item
+        pending = response["UnprocessedKeys"]
+        if not pending:
+            return
+        logger.info("BatchGetItem 미처리 키 %s개 재시도 (시도 %s)", len(pending), attempt + 1)
+    result.unprocessed.extend(pending)
+
+
+async def batch_get_items(table, keys: List[Dict[str, Any]], projection: Optional[List[str]] = None) -> BatchGetResult:
+    """
+    키 목록을 100개 단위로 나누어 BatchGetItem을 동시에 실행합니다.
+    UnprocessedKeys는 백오프 후 재시도하며, 끝까지 처리되지 않은 키(스로틀링된 청크 포함)는 unprocessed에 담깁니다.
+    """
+    request_base: Dict[str, Any] = {}
+    added_keys: List[str] = []
+    if projection:
+        # 응답 항목을 요청 키와 매칭하기 위해 기본 키를 프로젝션에 포함
+        key_projection, added_keys = with_key_projection(projection)
+        projection_expression, expression_attribute_names = build_projection_expression(key_projection)
+        request_base["ProjectionExpression"] = projection_expression
+        request_base["ExpressionAttributeNames"] = expression_attribute_names
+
+    # BatchGetItem은 중복 키를 허용하지 않으므로 중복 제거
+    unique_keys = list({key_tuple(key): key for key in keys}.values())
+    chunks = [unique_keys[i:i + BATCH_GET_CHUNK_SIZE] for i in range(0, len(unique_keys), BATCH_GET_CHUNK_SIZE)]
+
+    result = BatchGetResult()
+    await asyncio.gather(*(_get_chunk(table, chunk, request_base, result) for chunk in chunks))
+
+    if added_keys:
+        result.found = {
+            k: {attr: v for attr, v in item.items() if attr not in added_keys}
+            for k, item in result.found.items()
+        }
+    return result
+
+
+async def fetch_base_items(table, index_items: List[Dict[str, Any]], projection: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    보조 인덱스 쿼리 결과의 테이블 키로 기본 테이블 항목을 가져옵니다.
+    인덱스 결과 순서를 유지하며, 그 사이 삭제된 항목은 제외합니다.
+    """
+    if not index_items:
+        return []
+    result = await batch_get_items(table, [item_key(item) for item in index_items], projection)
+    if result.unprocessed:
+        # 미처리 키는 용량 부족으로 생기므로 스로틀링과 같이 취급 (호출 측에서 부분 결과 또는 503으로 처리)
+        raise ThrottledError("batch_get_item")
+    return [result.found[key_tuple(item)] for item in index_items if key_tuple(item) in result.found]
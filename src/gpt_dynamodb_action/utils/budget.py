@@ -0,0 +1,113 @@
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, List, Optional
+
+from gpt_dynamodb_action.utils.metrics import CONSUMED_RCU, ITEMS_RETURNED, ITEMS_SCANNED, REQUEST_PAGES
+
+logger = logging.getLogger(__name__)
+
+# 헤더에 기록할 페이지별 왕복 시간의 최대 개수
+MAX_PAGE_TIMINGS_IN_HEADER = 50
+
+
+def consumed_units(response: Dict[str, Any]) -> float:
+    """DynamoDB 응답의 ConsumedCapacity에서 소비한 용량 단위를 반환합니다."""
+    capacity = response.get("ConsumedCapacity")
+    if not capacity:
+        return 0.0
+    if isinstance(capacity, list):
+        return sum(float(c.get("CapacityUnits", 0)) for c in capacity)
+    return float(capacity.get("CapacityUnits", 0))
+
+
+@dataclass
+class ScanBudget:
+    """
+    스캔/쿼리 한 요청의 비용 예산과 계측 값입니다.
+    최대 페이지 수, 최대 스캔 항목 수, 최대 RCU 중 하나라도 넘으면 조기에 멈춥니다.
+    """
+    max_pages: Optional[int] = None
+    max_scanned: Optional[int] = None
+    max_rcu: Optional[float] = None
+    pages: int = 0
+    scanned: int = 0
+    returned: int = 0
+    consumed_rcu: float = 0.0
+    page_times_ms: List[float] = field(default_factory=list)
+    # 재시도 후에도 스로틀링되어 중간에 멈춘 경우
+    throttled: bool = False
+
+    async def track(self, call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """DynamoDB 호출 한 번을 기다리며 왕복 시간, 스캔 항목 수, 소비 용량을 기록합니다."""
+        start = time.perf_counter()
+        response = await call
+        self.record(response, (time.perf_counter() - start) * 1000)
+        return response
+
+    def record(self, response: Dict[str, Any], elapsed_ms: float):
+        self.pages += 1
+        self.scanned += response.get("ScannedCount", 0)
+        self.consumed_rcu += consumed_units(response)
+        self.page_times_ms.append(elapsed_ms)
+
+    @property
+    def exhausted_reason(self) -> Optional[str]:
+        if self.throttled:
+            return "throttled"
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return "max_pages"
+        if self.max_scanned is not None and self.scanned >= self.max_scanned:
+            return "max_scanned_items"
+        if self.max_rcu is not None and self.consumed_rcu >= self.max_rcu:
+            return "max_rcu"
+        return None
+
+    def exhausted(self) -> bool:
+        return self.exhausted_reason is not None
+
+    def page_limit(self, limit: Optional[int] = None) -> Optional[int]:
+        """남은 스캔 항목 예산을 넘지 않도록 다음 페이지의 Limit을 계산합니다."""
+        if self.max_scanned is None:
+            return limit
+        remaining = max(1, self.max_scanned - self.scanned)
+        return min(limit, remaining) if limit else remaining
+
+    @property
+    def scan_ratio(self) -> Optional[float]:
+        """반환 항목 하나당 읽은 항목 수입니다 (필터 선택도 지표)."""
+        return self.scanned / self.returned if self.returned else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "scanned": self.scanned,
+            "returned": self.returned,
+            "consumedRcu": round(self.consumed_rcu, 2),
+            "scanRatio": round(self.scan_ratio, 2) if self.scan_ratio is not None else None,
+            "dynamoTimeMs": round(sum(self.page_times_ms), 2),
+            "pageTimesMs": [round(t, 2) for t in self.page_times_ms],
+            "budgetExhausted": self.exhausted_reason
+        }
+
+    def headers(self) -> Dict[str, str]:
+        """비용 계측 값을 응답 헤더로 반환합니다."""
+        headers = {
+            "X-Consumed-Capacity": f"{self.consumed_rcu:.2f}",
+            "X-Scan-Ratio": f"{self.scan_ratio:.2f}" if self.scan_ratio is not None else "n/a",
+            "X-DynamoDB-Time-Ms": f"{sum(self.page_times_ms):.2f}",
+            "X-DynamoDB-Page-Times-Ms": ",".join(f"{t:.1f}" for t in self.page_times_ms[:MAX_PAGE_TIMINGS_IN_HEADER])
+        }
+        if self.exhausted_reason:
+            headers["X-Budget-Exhausted"] = self.exhausted_reason
+        return headers
+
+    def log(self, operation: str):
+        """요청 단위 비용 지표를 기록하고 구조화된 비용 로그를 남깁니다."""
+        REQUEST_PAGES.observe(self.pages, operation=operation)
+        ITEMS_SCANNED.observe(self.scanned, operation=operation)
+        ITEMS_RETURNED.observe(self.returned, operation=operation)
+        CONSUMED_RCU.inc(self.consumed_rcu, operation=operation)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("DynamoDB 비용 %s", json.dumps(dict(self.summary(), operation=operation)))
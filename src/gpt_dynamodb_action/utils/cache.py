@@ -0,0 +1,278 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis는 선택 의존성
+    aioredis = None
+
+from gpt_dynamodb_action.utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_prefix_ttls(value: str) -> Tuple[Tuple[str, float], ...]:
+    # "USR#=60,COM#=300" 형식을 (접두사, TTL) 튜플로 변환 (긴 접두사 우선)
+    pairs = []
+    for part in value.split(","):
+        if "=" in part:
+            prefix, ttl = part.rsplit("=", 1)
+            pairs.append((prefix.strip(), float(ttl)))
+    return tuple(sorted(pairs, key=lambda p: len(p[0]), reverse=True))
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    """응답 캐시 설정입니다. 환경 변수에서 읽어옵니다."""
+    backend: str = "memory"
+    max_entries: int = 1024
+    max_bytes: int = 64 * 1024 * 1024
+    default_ttl: float = 60.0
+    prefix_ttls: Tuple[Tuple[str, float], ...] = (("USR#", 60.0), ("COM#", 300.0), ("PROD#", 600.0))
+    redis_url: str = "redis://localhost:6379/0"
+    # Redis 연결/응답 제한 시간(초). 장애 시 요청이 이 시간만 기다린 뒤 캐시 없이 처리됨
+    redis_connect_timeout: float = 0.5
+    redis_timeout: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        defaults = cls()
+        prefix_ttls = os.environ.get("CACHE_TTL_PREFIXES")
+        return cls(
+            backend=os.environ.get("CACHE_BACKEND", defaults.backend).lower(),
+            max_entries=int(os.environ.get("CACHE_MAX_ENTRIES", defaults.max_entries)),
+            max_bytes=int(os.environ.get("CACHE_MAX_BYTES", defaults.max_bytes)),
+            default_ttl=float(os.environ.get("CACHE_DEFAULT_TTL", defaults.default_ttl)),
+            prefix_ttls=_parse_prefix_ttls(prefix_ttls) if prefix_ttls is not None else defaults.prefix_ttls,
+            redis_url=os.environ.get("CACHE_REDIS_URL", defaults.redis_url),
+            redis_connect_timeout=float(os.environ.get("CACHE_REDIS_CONNECT_TIMEOUT", defaults.redis_connect_timeout)),
+            redis_timeout=float(os.environ.get("CACHE_REDIS_TIMEOUT", defaults.redis_timeout)),
+        )
+
+    def ttl_for(self, pk: Optional[str]) -> float:
+        """파티션 키 접두사에 맞는 TTL(초)을 반환합니다."""
+        for prefix, ttl in self.prefix_ttls:
+            if pk and pk.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+
+@dataclass
+class CachedResponse:
+    """캐시에 저장되는 인코딩된 응답입니다."""
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations}
+
+
+class InMemoryLRUCache:
+    """항목 수와 바이트 크기로 제한되는 TTL 지원 LRU 캐시입니다 (프로세스 내)."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: float):
+        if ttl <= 0 or value.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._bytes += value.size
+            # 가장 오래 사용되지 않은 항목부터 제거
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self._bytes -= value.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """
+    여러 워커가 공유하는 Redis 호환 캐시 백엔드입니다. 만료와 축출은 Redis 설정을 따릅니다.
+    비동기 클라이언트를 사용하므로 Redis 왕복 중에도 이벤트 루프가 다른 요청을 처리합니다.
+    """
+
+    def __init__(self, url: str, namespace: str = "gpt-dynamodb-action:",
+                 connect_timeout: float = 0.5, timeout: float = 0.5):
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = aioredis.Redis.from_url(url, socket_connect_timeout=connect_timeout, socket_timeout=timeout)
+        self.namespace = namespace
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self.namespace + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        header_line, body = raw.split(b"\n", 1)
+        return CachedResponse(body=body, headers=json.loads(header_line))
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        if ttl <= 0:
+            return
+        payload = json.dumps(value.headers).encode("utf-8") + b"\n" + value.body
+        await self.client.set(self.namespace + key, payload, px=int(ttl * 1000))
+
+    async def clear(self):
+        async for key in self.client.scan_iter(self.namespace + "*"):
+            await self.client.delete(key)
+
+    async def close(self):
+        # redis 5.0.1부터 close() 대신 aclose()를 사용
+        await getattr(self.client, "aclose", self.client.close)()
+
+
+async def _maybe_await(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+class ResponseCache:
+    """요청 파라미터를 정규화한 키로 인코딩된 응답을 저장하는 read-through 캐시입니다."""
+
+    def __init__(self, settings: Optional[CacheSettings] = None, backend=None):
+        self.settings = settings or CacheSettings.from_env()
+        self.backend = backend
+        if self.backend is None and self.settings.backend == "memory":
+            self.backend = InMemoryLRUCache(self.settings.max_entries, self.settings.max_bytes)
+        elif self.backend is None and self.settings.backend == "redis":
+            self.backend = RedisCache(self.settings.redis_url, connect_timeout=self.settings.redis_connect_timeout,
+                                      timeout=self.settings.redis_timeout)
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """엔드포인트와 정규화된 요청 파라미터로 캐시 키를 만듭니다."""
+        normalized = {k: sorted(v) if k == "projection" and v else v for k, v in params.items()}
+        raw = json.dumps([endpoint, normalized], sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        try:
+            # 메모리 백엔드는 동기, Redis 백엔드는 코루틴을 반환
+            value = await _maybe_await(self.backend.get(key))
+        except Exception as e:
+            # 캐시 장애가 요청 실패로 이어지지 않도록 한다
+            logger.warning("캐시 조회 실패: %s", e)
+            CACHE_REQUESTS.inc(result="error")
+            return None
+        CACHE_REQUESTS.inc(result="hit" if value is not None else "miss")
+        return value
+
+    async def set(self, key: str, value: CachedResponse, pk: Optional[str] = None):
+        if not self.enabled:
+            return
+        try:
+            await _maybe_await(self.backend.set(key, value, self.settings.ttl_for(pk)))
+        except Exception as e:
+            logger.warning("캐시 저장 실패: %s", e)
+
+    async def close(self):
+        """백엔드 연결을 닫습니다 (Redis만 해당)."""
+        close = getattr(self.backend, "close", None)
+        if close is not None:
+            await close()
+
+    def stats(self) -> Dict[str, int]:
+        return self.backend.stats.as_dict() if self.enabled else {}
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """프로세스 전역 응답 캐시를 반환합니다. 처음 호출 시 생성합니다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                # CACHE_BACKEND=none이면 백엔드가 없어 캐시가 비활성화된다
+                _cache = ResponseCache()
+    return _cache
+
+
+def set_cache(cache: Optional[ResponseCache]):
+    """전역 응답 캐시를 교체합니다 (None이면 다음 호출 시 다시 생성)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+async def close_cache():
+    """전역 응답 캐시가 만들어졌으면 백엔드 연결을 닫습니다 (앱 종료 시)."""
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        await cache.close()
+
+
+def cache_bypassed(cache_control: Optional[str]) -> bool:
+    """요청의 Cache-Control 헤더가 캐시 조회를 건너뛰도록 요구하는지 확인합니다."""
+    return bool(cache_control) and "no-cache" in cache_control.lower()
+
+
+def with_cache_header(headers: Dict[str, str], status: str) -> Dict[str, str]:
+    return dict(headers, **{"X-Cache": status})
+
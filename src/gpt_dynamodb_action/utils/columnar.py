@@ -0,0 +1,86 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+# 응답 형식: items(항목 객체 목록), columnar(속성 이름 헤더 + 행 배열), columns(속성별 값 배열)
+RESPONSE_FORMATS = ("items", "columnar", "columns")
+
+# 채워진 비율이 이 값 미만인 속성은 null로 채우지 않고 sparse에 (행 번호, 값) 쌍으로 담음
+SPARSE_FILL_RATIO = 0.25
+# 행 수가 이보다 적으면 sparse 분리를 하지 않음
+SPARSE_MIN_ROWS = 8
+
+
+class ColumnarBuilder:
+    """
+    DynamoDB 페이지의 항목을 도착하는 대로 행 배열로 변환합니다.
+    속성 이름은 헤더에 한 번만 쓰고, 없는 속성은 null로 채웁니다.
+    열 순서는 프로젝션 순서를 따르고, 그 밖의 속성은 처음 나온 순서대로 뒤에 붙습니다.
+    """
+
+    def __init__(self, projection: Optional[List[str]] = None, by_column: bool = False):
+        self.projection = list(projection or [])
+        self.by_column = by_column
+        self.columns: List[str] = []
+        self.rows: List[List[Any]] = []
+        self._index: Dict[str, int] = {}
+        self._filled: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def extend(self, items: Iterable[Dict[str, Any]]):
+        index = self._index
+        filled = self._filled
+        for item in items:
+            row = [None] * len(self.columns)
+            for name, value in item.items():
+                i = index.get(name)
+                if i is None:
+                    i = index[name] = len(self.columns)
+                    self.columns.append(name)
+                    filled.append(0)
+                    row.append(None)
+                row[i] = value
+                filled[i] += 1
+            self.rows.append(row)
+
+    def _order(self) -> List[int]:
+        # 프로젝션에 있는 속성을 먼저, 나머지는 처음 나온 순서대로
+        head = [self._index[name] for name in self.projection if name in self._index]
+        head_set = set(head)
+        return head + [i for i in range(len(self.columns)) if i not in head_set]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """응답 본문의 columns/rows(또는 values)/sparse 부분을 만듭니다."""
+        order = self._order()
+        sparse_ids = set()
+        if len(self.rows) >= SPARSE_MIN_ROWS:
+            sparse_ids = {i for i in order if self._filled[i] < len(self.rows) * SPARSE_FILL_RATIO}
+        dense = [i for i in order if i not in sparse_ids]
+        width = len(self.columns)
+
+        if dense == list(range(width)):
+            # 열 순서가 그대로이면 짧은 행(이후에 새 속성이 나온 경우)만 채움
+            rows = [row if len(row) == width else row + [None] * (width - len(row)) for row in self.rows]
+        else:
+            rows = [[row[i] if i < len(row) else None for i in dense] for row in self.rows]
+
+        data: Dict[str, Any] = {"columns": [self.columns[i] for i in dense]}
+        if self.by_column:
+            data["values"] = [list(values) for values in zip(*rows)] if rows else [[] for _ in dense]
+        else:
+            data["rows"] = rows
+        if sparse_ids:
+            data["sparse"] = {
+                self.columns[i]: [[n, row[i]] for n, row in enumerate(self.rows) if i < len(row) and row[i] is not None]
+                for i in order if i in sparse_ids
+            }
+        return data
+
+
+def collector(response_format: Optional[str], projection: Optional[List[str]] = None):
+    """응답 형식에 맞는 항목 수집기를 반환합니다 (items는 일반 리스트)."""
+    if response_format in (None, "items"):
+        return []
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(RESPONSE_FORMATS)}")
+    return ColumnarBuilder(projection, by_column=response_format == "columns")
@@ -0,0 +1,314 @@
+import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from gpt_dynamodb_action.utils.metrics import COMPRESSION_SECONDS, RESPONSE_BYTES
+from gpt_dynamodb_action.utils.timing import record_stage
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard는 선택 의존성
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 이 크기 이상의 본문은 이벤트 루프를 막지 않도록 스레드풀에서 압축
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+# 이미 압축된 형식이거나 압축하면 안 되는 콘텐츠 타입
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/gzip", "application/zip", "application/vnd.apache.parquet",
+                          "image/", "audio/", "video/")
+
+# (최대 본문 크기, 인코딩별 레벨) - 큰 본문일수록 빠른 레벨을 사용
+_LEVELS: Tuple[Tuple[Optional[int], Dict[str, int]], ...] = (
+    (16 * 1024, {"zstd": 6, "br": 5, "gzip": 6}),
+    (256 * 1024, {"zstd": 3, "br": 4, "gzip": 5}),
+    (None, {"zstd": 1, "br": 2, "gzip": 3}),
+)
+# CPU 부하가 높을 때 사용하는 가장 빠른 레벨
+_FAST_LEVELS = {"zstd": 1, "br": 1, "gzip": 1}
+
+
+def available_encodings() -> List[str]:
+    """설치된 라이브러리로 사용할 수 있는 인코딩 목록입니다."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    """응답 압축 설정입니다. 환경 변수에서 읽어옵니다."""
+    enabled: bool = True
+    minimum_size: int = 1000
+    # 클라이언트가 여러 인코딩을 같은 가중치로 허용할 때의 선호 순서
+    encodings: Tuple[str, ...] = ("zstd", "br", "gzip")
+    # CPU 코어당 1분 평균 부하가 이 값을 넘으면 가장 빠른 레벨 사용
+    high_load: float = 0.75
+
+    @classmethod
+    def from_env(cls) -> "CompressionSettings":
+        defaults = cls()
+        encodings = os.environ.get("COMPRESSION_ENCODINGS")
+        return cls(
+            enabled=os.environ.get("COMPRESSION_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on"),
+            minimum_size=int(os.environ.get("COMPRESSION_MIN_SIZE", defaults.minimum_size)),
+            encodings=tuple(e.strip() for e in encodings.split(",") if e.strip()) if encodings else defaults.encodings,
+            high_load=float(os.environ.get("COMPRESSION_HIGH_LOAD", defaults.high_load)),
+        )
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Accept-Encoding 헤더를 {인코딩: q값}으로 변환합니다."""
+    accepted = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def select_encoding(accept_encoding: str, preferred: Tuple[str, ...]) -> Optional[str]:
+    """클라이언트가 허용하는 인코딩 중 q값이 가장 높고 선호 순서가 앞선 것을 고릅니다."""
+    accepted = parse_accept_encoding(accept_encoding)
+    installed = set(available_encodings())
+    best, best_q = None, 0.0
+    for encoding in preferred:
+        if encoding not in installed:
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+_load_cache = {"at": 0.0, "value": 0.0}
+
+
+def cpu_load() -> float:
+    """CPU 코어당 1분 평균 부하입니다 (1초 동안 캐싱, 지원하지 않는 플랫폼은 0)."""
+    now = time.monotonic()
+    if now - _load_cache["at"] >= 1.0:
+        try:
+            _load_cache["value"] = os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            _load_cache["value"] = 0.0
+        _load_cache["at"] = now
+    return _load_cache["value"]
+
+
+def choose_level(encoding: str, size: Optional[int], load: float, high_load: float) -> int:
+    """본문 크기(스트리밍이면 None)와 CPU 부하로 압축 레벨을 정합니다."""
+    if load >= high_load:
+        return _FAST_LEVELS[encoding]
+    for max_size, levels in _LEVELS:
+        if max_size is None or (size is not None and size <= max_size):
+            return levels[encoding]
+    return _FAST_LEVELS[encoding]
+
+
+class _Compressor:
+    """인코딩별 스트리밍 압축기입니다. flush는 지금까지의 데이터를 클라이언트가 해제할 수 있게 내보냅니다."""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "gzip":
+            return self._obj.compress(data) + self._obj.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.process(data) + (self._obj.finish() if final else self._obj.flush())
+        flush_mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return self._obj.compress(data) + self._obj.flush(flush_mode)
+
+
+@dataclass
+class EncodingStats:
+    responses: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class CompressionStats:
+    """인코딩별 압축 통계(응답 수, 원본/압축 크기, 압축에 쓴 시간)입니다."""
+    encodings: Dict[str, EncodingStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, seconds: float):
+        RESPONSE_BYTES.observe(bytes_in, stage="raw", encoding=encoding)
+        RESPONSE_BYTES.observe(bytes_out, stage="compressed", encoding=encoding)
+        COMPRESSION_SECONDS.observe(seconds, encoding=encoding)
+        with self._lock:
+            stats = self.encodings.setdefault(encoding, EncodingStats())
+            stats.responses += 1
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.seconds += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                encoding: {
+                    "responses": s.responses,
+                    "bytesIn": s.bytes_in,
+                    "bytesOut": s.bytes_out,
+                    "ratio": round(s.bytes_in / s.bytes_out, 2) if s.bytes_out else 0.0,
+                    "seconds": round(s.seconds, 6),
+                }
+                for encoding, s in self.encodings.items()
+            }
+
+
+_stats = CompressionStats()
+
+
+def get_compression_stats() -> CompressionStats:
+    """프로세스 전역 압축 통계를 반환합니다."""
+    return _stats
+
+
+class AdaptiveCompressionMiddleware:
+    """
+    Accept-Encoding에 따라 zstd/br/gzip 중 하나로 응답을 압축하는 ASGI 미들웨어입니다.
+    레벨은 본문 크기와 CPU 부하로 정하고, 스트리밍(청크) 응답은 청크마다 flush해 바로 전송합니다.
+    버퍼링된 응답에는 X-Compression-Ratio / X-Compression-Time-Ms 헤더를 추가합니다.
+    """
+
+    def __init__(self, app, settings: Optional[CompressionSettings] = None):
+        self.app = app
+        self.settings = settings or CompressionSettings.from_env()
+        logger.info("응답 압축 설정: 사용=%s, 인코딩=%s (설치됨: %s), 최소 크기=%s",
+                    self.settings.enabled, self.settings.encodings, available_encodings(), self.settings.minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.settings.enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""), self.settings.encodings)
+        await _CompressionResponder(self.app, self.settings, encoding)(scope, receive, send)
+
+
+class _CompressionResponder:
+    """한 요청의 응답 메시지를 가로채 압축합니다."""
+
+    def __init__(self, app, settings: CompressionSettings, encoding: Optional[str]):
+        self.app = app
+        self.settings = settings
+        self.encoding = encoding
+        self.send = None
+        self.start_message = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+        self.raw_bytes = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 본문 첫 청크를 보고 압축 여부를 정할 때까지 헤더 전송을 미룸
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            self.passthrough = (
+                "content-encoding" in headers or message["status"] in (204, 206, 304)
+                or any(content_type.startswith(t) for t in EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.raw_bytes += len(body)
+        if self.start_message is not None:
+            await self._start(body, more_body)
+            message = dict(message, body=await self._compress(body, not more_body) if self.compressor else body)
+            await self._send_start(message, more_body)
+            self.start_message = None
+        elif self.compressor:
+            message = dict(message, body=await self._compress(body, not more_body))
+        await self.send(message)
+        if more_body:
+            return
+        if self.compressor:
+            _stats.record(self.encoding, self.bytes_in, self.bytes_out, self.seconds)
+            logger.debug("응답 압축: 인코딩=%s, %s -> %s 바이트, %.2fms",
+                         self.encoding, self.bytes_in, self.bytes_out, self.seconds * 1000)
+        else:
+            RESPONSE_BYTES.observe(self.raw_bytes, stage="raw", encoding="identity")
+
+    async def _start(self, body: bytes, more_body: bool):
+        # 작은 단일 응답은 압축하지 않음 (스트리밍 응답은 전체 크기를 알 수 없으므로 압축)
+        if self.encoding is None or (not more_body and len(body) < self.settings.minimum_size):
+            return
+        level = choose_level(self.encoding, None if more_body else len(body), cpu_load(), self.settings.high_load)
+        self.compressor = _Compressor(self.encoding, level)
+
+    async def _send_start(self, message, more_body: bool):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.compressor:
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+                headers["X-Compression-Ratio"] = f"{self.bytes_in / max(self.bytes_out, 1):.2f}"
+                headers["X-Compression-Time-Ms"] = f"{self.seconds * 1000:.2f}"
+        await self.send(self.start_message)
+
+    async def _compress(self, body: bytes, final: bool) -> bytes:
+        started = time.perf_counter()
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            compressed = await run_in_threadpool(self.compressor.compress, body, final)
+        else:
+            compressed = self.compressor.compress(body, final)
+        elapsed = time.perf_counter() - started
+        self.seconds += elapsed
+        record_stage("compress", elapsed)
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
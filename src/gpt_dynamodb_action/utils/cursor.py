@@ -0,0 +1,187 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import zlib
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CURSOR_VERSION = 1
+
+# 서명 길이 (HMAC-SHA256 앞부분, 바이트)
+SIGNATURE_BYTES = 12
+
+# 압축 여부 표시 (압축이 더 짧을 때만 사용)
+_RAW = b"r"
+_COMPRESSED = b"z"
+
+_secret: Optional[bytes] = None
+_secret_lock = threading.Lock()
+
+
+class CursorError(ValueError):
+    """연속 토큰이 손상되었거나 다른 요청에서 만들어졌습니다."""
+
+
+def _get_secret() -> bytes:
+    global _secret
+    if _secret is None:
+        with _secret_lock:
+            if _secret is None:
+                configured = os.environ.get("CURSOR_SECRET")
+                if configured:
+                    _secret = configured.encode("utf-8")
+                else:
+                    # 프로세스마다 다른 키가 되므로 여러 워커/재시작 간에는 토큰이 호환되지 않는다
+                    logger.warning("CURSOR_SECRET이 설정되지 않아 임시 서명 키를 사용합니다 (워커 간 토큰 비호환)")
+                    _secret = secrets.token_bytes(32)
+    return _secret
+
+
+def set_cursor_secret(secret: Optional[Union[str, bytes]]):
+    """서명 키를 교체합니다 (None이면 다음 사용 시 환경 변수에서 다시 읽음)."""
+    global _secret
+    with _secret_lock:
+        _secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _pack(value: Any) -> Any:
+    # 숫자는 문자열로 보관해 Decimal 정밀도를 유지
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (Decimal, int, float)):
+        return {"N": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": _b64encode(bytes(value))}
+    raise CursorError(f"Unsupported key value type: {type(value).__name__}")
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "N" in value:
+            return Decimal(value["N"])
+        if "B" in value:
+            return _b64decode(value["B"])
+        raise CursorError("Malformed key value")
+    return value
+
+
+def pack_key(key: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """키를 JSON으로 저장할 수 있는 형태로 바꿉니다 (숫자는 문자열로 보관)."""
+    return {k: _pack(v) for k, v in key.items()} if key else None
+
+
+def unpack_key(key: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return {k: _unpack(v) for k, v in key.items()} if key else None
+
+
+def request_fingerprint(endpoint: str, params: Dict[str, Any]) -> str:
+    """토큰을 만든 요청의 필터/프로젝션 등을 식별하는 짧은 지문입니다."""
+    normalized = {k: sorted(v) if k == "projection" and v else v for k, v in params.items()}
+    raw = json.dumps([endpoint, normalized], sort_keys=True, default=str, separators=(",", ":"))
+    return _b64encode(hashlib.sha256(raw.encode("utf-8")).digest()[:9])
+
+
+@dataclass
+class Cursor:
+    """디코딩된 연속 토큰입니다. 병렬 스캔이면 segments에 세그먼트별 상태가 담깁니다."""
+    key: Optional[Dict[str, Any]] = None
+    segments: Optional[Dict[str, Any]] = None
+    plan: Optional[str] = None
+
+
+def encode_cursor(fingerprint: str, key: Optional[Dict[str, Any]] = None,
+                  segments: Optional[Dict[str, Any]] = None, plan: Optional[str] = None) -> str:
+    """시작 키(또는 세그먼트 상태)와 요청 지문을 서명된 base64 토큰으로 인코딩합니다."""
+    payload: Dict[str, Any] = {"v": CURSOR_VERSION, "f": fingerprint}
+    if plan:
+        payload["p"] = plan
+    if segments is not None:
+        # 세그먼트 번호는 목록 순서로 표현 ([시작 키, 완료 여부])
+        payload["s"] = [[pack_key(s["lastEvaluatedKey"]), int(bool(s["done"]))]
+                        for s in sorted(segments["segments"], key=lambda s: s["segment"])]
+    else:
+        payload["k"] = pack_key(key)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    compressed = zlib.compress(raw, 9)
+    body = _COMPRESSED + compressed if len(compressed) < len(raw) else _RAW + raw
+    signature = hmac.new(_get_secret(), body, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+    return f"{_b64encode(body)}.{_b64encode(signature)}"
+
+
+def decode_cursor(token: str, fingerprint: str, plan: Optional[str] = None) -> Cursor:
+    """
+    토큰의 서명과 요청 지문을 검증하고 시작 키를 복원합니다.
+    다른 필터/프로젝션으로 재사용하거나 변조된 토큰이면 CursorError를 발생시킵니다.
+    """
+    if not isinstance(token, str):
+        # 서명 없는 키 딕셔너리는 지문/계획을 검증할 수 없으므로 받지 않음
+        raise CursorError("start_key must be the lastEvaluatedKey token returned by the previous call")
+    try:
+        body_part, signature_part = token.split(".", 1)
+        body = _b64decode(body_part)
+        signature = _b64decode(signature_part)
+    except (ValueError, AttributeError):
+        raise CursorError("Malformed start_key token")
+    expected = hmac.new(_get_secret(), body, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+    if not hmac.compare_digest(signature, expected):
+        raise CursorError("Invalid start_key token signature")
+    try:
+        raw = zlib.decompress(body[1:]) if body[:1] == _COMPRESSED else body[1:]
+        payload = json.loads(raw)
+    except (zlib.error, ValueError):
+        raise CursorError("Malformed start_key token")
+
+    if payload.get("v") != CURSOR_VERSION:
+        raise CursorError("Unsupported start_key token version")
+    if payload.get("f") != fingerprint:
+        raise CursorError("start_key token was issued for different filters, projection or keys")
+    if plan is not None and payload.get("p") not in (None, plan):
+        raise CursorError("start_key token was issued for a different query plan")
+
+    cursor = Cursor(plan=payload.get("p"))
+    if "s" in payload:
+        cursor.segments = {
+            "totalSegments": len(payload["s"]),
+            "segments": [
+                {"segment": i, "lastEvaluatedKey": unpack_key(key), "done": bool(done)}
+                for i, (key, done) in enumerate(payload["s"])
+            ],
+        }
+    else:
+        cursor.key = unpack_key(payload.get("k"))
+    return cursor
+
+
+def resume_key(start_key: Optional[Union[str, Dict[str, Any]]], fingerprint: str,
+               plan: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    요청의 start_key 토큰을 검증하고 ExclusiveStartKey로 변환합니다.
+    키 딕셔너리나 변조·재사용된 토큰이면 CursorError를 발생시킵니다.
+    """
+    if not start_key:
+        return None
+    cursor = decode_cursor(start_key, fingerprint, plan)
+    if cursor.segments is not None:
+        raise CursorError("start_key token belongs to a parallel scan")
+    return cursor.key
+
+
+def next_token(fingerprint: str, key: Optional[Dict[str, Any]], plan: Optional[str] = None) -> Optional[str]:
+    """다음 페이지가 있으면 토큰을, 없으면 None을 반환합니다."""
+    return encode_cursor(fingerprint, key=key, plan=plan) if key else None
@@ -1,20 +1,17 @@
-import boto3
 import logging
-import os
 import json
 from decimal import Decimal
-from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.conditions import Key
 from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from gpt_dynamodb_action.utils.columnar import ColumnarBuilder
+from gpt_dynamodb_action.utils.filter_compiler import CompiledFilter, compile_filter
+from gpt_dynamodb_action.utils.table_registry import get_registry
+
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# 테이블 기본 키 속성 (단일 테이블 설계)
+KEY_ATTRIBUTES = ("PK", "SK")
 
 # Decimal 타입 처리를 위한 JSONEncoder 클래스
 class DecimalEncoder(json.JSONEncoder):
@@ -24,43 +21,19 @@ class DecimalEncoder(json.JSONEncoder):
         return super(DecimalEncoder, self).default(o)
 
 def get_table():
-    """DynamoDB 테이블 연결을 반환합니다."""
-    session = boto3.Session(
-        aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
-        aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
-        region_name=os.environ.get("AWS_REGION", "ap-northeast-2")
-    )
-    dynamodb = session.resource("dynamodb")
-    return dynamodb.Table(os.environ["DYNAMO_TABLE_NAME"])
-
-def convert_to_number(value):
-    """문자열 값을 가능한 경우 숫자로 변환합니다."""
-    try:
-        return int(value)
-    except ValueError:
-        try:
-            return float(value)
-        except ValueError:
-            return value
+    """DynamoDB 테이블 연결을 반환합니다. 프로세스 전역 레지스트리에서 재사용됩니다."""
+    return get_registry().get_table()
 
-def create_filter_expression(key, operator, value):
-    """지정된 키, 연산자, 값에 대한 DynamoDB 필터 표현식을 생성합니다."""
-    attr = Attr(key)
-    
-    if operator == 'begins_with':
-        return attr.begins_with(value)
-    elif operator == 'contains':
-        return attr.contains(value)
-    elif operator == 'gt':
-        return attr.gt(value)
-    elif operator == 'gte':
-        return attr.gte(value)
-    elif operator == 'lt':
-        return attr.lt(value)
-    elif operator == 'lte':
-        return attr.lte(value)
-    else:  # 기본값은 equals
-        return attr.eq(value)
+def build_filter(filters, operator=None, where=None) -> Optional[CompiledFilter]:
+    """
+    필터를 컴파일합니다 (같은 필터는 LRU에서 재사용). 키 속성은 테이블 스키마의 타입으로 값을 변환합니다.
+    잘못된 필터는 FilterError(ValueError)를 발생시킵니다.
+    """
+    if not filters and not where:
+        return None
+    schema = get_registry().get_schema()
+    attribute_types = {**{attr: "S" for attr in schema.key_attributes}, **schema.attribute_types}
+    return compile_filter(filters, operator, where, attribute_types)
 
 def build_projection_expression(projection: List[str]) -> tuple:
     """프로젝션 표현식과 속성 이름을 구성합니다."""
@@ -85,61 +58,57 @@ def build_projection_expression(projection: List[str]) -> tuple:
     
     return projection_expression, expression_attribute_names
 
-def execute_scan(table, scan_kwargs, current_start_key):
-    """DynamoDB 테이블에 대한 스캔을 실행합니다."""
+def with_key_projection(projection: Optional[List[str]], key_attributes=KEY_ATTRIBUTES) -> tuple:
+    """
+    응답 항목을 키로 식별할 수 있도록 프로젝션에 기본 키(인덱스 쿼리는 인덱스 키 포함)를 추가합니다.
+    (키가 추가된 프로젝션, 응답에서 제거해야 할 속성 목록)을 반환합니다.
+    """
+    if not projection:
+        return projection, []
+    added = [attr for attr in key_attributes if attr not in projection]
+    return list(projection) + added, added
+
+def item_key(item: Dict[str, Any], key_attributes=KEY_ATTRIBUTES) -> Dict[str, Any]:
+    """항목의 기본 키(ExclusiveStartKey 형식)를 반환합니다."""
+    return {attr: item[attr] for attr in key_attributes}
+
+def strip_attributes(items: List[Dict[str, Any]], attributes: List[str]) -> List[Dict[str, Any]]:
+    """키 계산을 위해 프로젝션에 추가했던 속성을 응답 항목에서 제거합니다."""
+    if not attributes:
+        return items
+    return [{k: v for k, v in item.items() if k not in attributes} for item in items]
+
+def execute_scan(table, scan_kwargs, current_start_key, operation="scan"):
+    """DynamoDB 테이블에 대한 스캔(또는 쿼리 계획인 경우 쿼리)을 실행합니다."""
     # 시작 키 설정
     if current_start_key:
         scan_kwargs["ExclusiveStartKey"] = current_start_key
     elif "ExclusiveStartKey" in scan_kwargs:
         del scan_kwargs["ExclusiveStartKey"]
         
-    return table.scan(**scan_kwargs)
+    return getattr(table, operation)(**scan_kwargs)
 
 def prepare_response_data(items, last_evaluated_key, total_scanned_count):
-    """응답 데이터를 준비하고 Decimal을 float로 변환합니다."""
-    # Decimal 값을 float로 변환하는 함수
-    def convert_decimal(obj):
-        if isinstance(obj, dict):
-            return {k: convert_decimal(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_decimal(i) for i in obj]
-        elif isinstance(obj, Decimal):
-            return float(obj)
-        else:
-            return obj
-    
-    # 데이터 변환
-    converted_items = convert_decimal(items)
-    converted_last_key = convert_decimal(last_evaluated_key)
-    
-    # 응답 데이터 구성
+    """
+    응답 데이터를 구성합니다. Decimal 변환은 encode_json이 인코딩 중에 처리합니다.
+    items가 ColumnarBuilder이면 items 대신 columns/rows(또는 values) 형식으로 구성합니다.
+    """
+    body = items.as_dict() if isinstance(items, ColumnarBuilder) else {"items": items}
     return {
-        "items": converted_items,
-        "lastEvaluatedKey": converted_last_key,
+        **body,
+        "lastEvaluatedKey": last_evaluated_key,
         "count": len(items),
         "scannedCount": total_scanned_count
     }
 
-def build_scan_kwargs(filters, operator, projection=None):
-    """필터와 연산자를 기반으로 DynamoDB 스캔 파라미터를 구성합니다."""
+def build_scan_kwargs(filters, operator, projection=None, where=None):
+    """필터와 연산자(및 where 조건 트리)를 기반으로 DynamoDB 스캔 파라미터를 구성합니다."""
     scan_kwargs = {}
     
-    # 필터 표현식 추가
-    if filters:
-        condition = None
-        for k, v in filters.items():
-            # 연산자 확인 (기본값은 'eq')
-            op = operator.get(k, 'eq') if operator else 'eq'
-            
-            # 숫자 비교 연산자인 경우 값 변환
-            if op in ['gt', 'gte', 'lt', 'lte']:
-                v = convert_to_number(v)
-                
-            # 연산자에 따른 표현식 생성
-            expr = create_filter_expression(k, op, v)
-            condition = expr if condition is None else condition & expr
-            
-        scan_kwargs["FilterExpression"] = condition
+    # 필터 표현식 추가 (컴파일된 표현식의 자리표시자 맵은 요청마다 복사본을 사용)
+    compiled = build_filter(filters, operator, where)
+    if compiled:
+        scan_kwargs.update(compiled.kwargs())
     
     # 프로젝션 표현식 추가
     if projection:
@@ -147,6 +116,34 @@ def build_scan_kwargs(filters, operator, projection=None):
         
         if projection_expression and expression_attribute_names:
             scan_kwargs["ProjectionExpression"] = projection_expression
-            scan_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+            scan_kwargs.setdefault("ExpressionAttributeNames", {}).update(expression_attribute_names)
         
-    return scan_kwargs 
\ No newline at end of file
+    return scan_kwargs
+
+def build_query_kwargs(pk, sk=None, sk_operator="eq", filters=None, operator=None, projection=None, index=None,
+                       where=None):
+    """
+    PK/SK 조건, 필터, 프로젝션을 기반으로 DynamoDB 쿼리 파라미터를 구성합니다.
+    index(보조 인덱스 스키마)가 주어지면 pk/sk는 인덱스 키 값으로 사용합니다.
+    """
+    hash_key, range_key = (index.hash_key, index.range_key) if index else KEY_ATTRIBUTES
+    
+    # 기본 키 조건 생성 (PK는 항상 eq 연산만 지원)
+    key_condition = Key(hash_key).eq(pk)
+    
+    # SK 조건 추가 (지정된 경우)
+    if sk:
+        sort_key = Key(range_key)
+        if sk_operator == "begins_with":
+            key_condition = key_condition & sort_key.begins_with(sk)
+        elif sk_operator in ("gt", "gte", "lt", "lte"):
+            key_condition = key_condition & getattr(sort_key, sk_operator)(sk)
+        else:  # 기본값은 eq
+            key_condition = key_condition & sort_key.eq(sk)
+    
+    # 필터 표현식과 프로젝션은 스캔과 동일한 방식으로 구성
+    query_kwargs = build_scan_kwargs(filters, operator, projection, where)
+    query_kwargs["KeyConditionExpression"] = key_condition
+    if index:
+        query_kwargs["IndexName"] = index.name
+    return query_kwargs
@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_loaded = False
+_loaded_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """환경 변수 설정이 잘못되어 서버를 시작할 수 없습니다."""
+
+
+def load_environment(path: Optional[str] = None) -> bool:
+    """.env 파일을 한 번만 읽어 환경 변수에 반영합니다 (이미 설정된 값은 덮어쓰지 않음)."""
+    global _loaded
+    with _loaded_lock:
+        if _loaded:
+            return False
+        _loaded = True
+        return load_dotenv(path)
+
+
+def configure_logging(level: Optional[str] = None):
+    """루트 로거를 LOG_LEVEL(기본 INFO) 수준으로 설정합니다. 이미 핸들러가 있으면 수준만 맞춥니다."""
+    level = (level or os.environ.get("LOG_LEVEL", "INFO")).upper()
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    logging.getLogger().setLevel(level)
+
+
+def validate_settings(workers: int = 1) -> List[str]:
+    """
+    모든 설정을 한 번 읽어 잘못된 값을 시작 전에 찾아냅니다.
+    오류가 있으면 전부 모아 ConfigError를 발생시키고, 경고 목록을 반환합니다.
+    """
+    # 설정 클래스가 있는 모듈은 검증할 때만 가져온다
+    from gpt_dynamodb_action.routes.schema_endpoints import SchemaSettings
+    from gpt_dynamodb_action.utils.cache import CacheSettings, aioredis
+    from gpt_dynamodb_action.utils.compression import CompressionSettings
+    from gpt_dynamodb_action.utils.exports import ExportSettings
+    from gpt_dynamodb_action.utils.lookup_index import LookupSettings
+    from gpt_dynamodb_action.utils.resilience import ResilienceSettings
+    from gpt_dynamodb_action.utils.table_registry import DynamoSettings
+    from gpt_dynamodb_action.utils.worker_metrics import MetricsSettings
+
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    def read(settings_class):
+        try:
+            return settings_class.from_env()
+        except (TypeError, ValueError) as e:
+            errors.append(f"{settings_class.__name__}: {e}")
+            return None
+
+    dynamo = read(DynamoSettings)
+    if dynamo:
+        if dynamo.backend not in ("aws", "local"):
+            errors.append(f"DYNAMO_BACKEND must be 'aws' or 'local', got {dynamo.backend!r}")
+        if dynamo.execution_mode not in ("sync", "async"):
+            errors.append(f"DYNAMO_EXECUTION_MODE must be 'sync' or 'async', got {dynamo.execution_mode!r}")
+        if not dynamo.table_name:
+            errors.append("DYNAMO_TABLE_NAME is not configured")
+        if dynamo.guard_retries and os.environ.get("DYNAMO_MAX_ATTEMPTS"):
+            warnings.append("DYNAMO_MAX_ATTEMPTS is ignored while DYNAMO_THROTTLE_RETRIES > 0 "
+                            "(DynamoDB calls are retried by the throttling guard only)")
+
+    cache = read(CacheSettings)
+    if cache:
+        if cache.backend not in ("memory", "redis", "none"):
+            errors.append(f"CACHE_BACKEND must be 'memory', 'redis' or 'none', got {cache.backend!r}")
+        if cache.backend == "redis" and aioredis is None:
+            errors.append("CACHE_BACKEND=redis requires the 'redis' package")
+        if cache.backend == "memory" and workers > 1:
+            warnings.append(f"CACHE_BACKEND=memory keeps a separate cache in each of the {workers} workers")
+
+    schema = read(SchemaSettings)
+    if schema and schema.source not in ("static", "live"):
+        errors.append(f"SCHEMA_SOURCE must be 'static' or 'live', got {schema.source!r}")
+
+    read(CompressionSettings)
+    lookup = read(LookupSettings)
+    if lookup and lookup.enabled and not lookup.partitions:
+        errors.append("LOOKUP_PARTITIONS must not be empty when LOOKUP_ENABLED=true")
+    read(ResilienceSettings)
+    exports = read(ExportSettings)
+    if exports and exports.max_running < 1:
+        errors.append("EXPORT_MAX_RUNNING must be at least 1")
+
+    metrics = read(MetricsSettings)
+    if metrics and metrics.flush_seconds <= 0:
+        errors.append("METRICS_FLUSH_SECONDS must be greater than 0")
+
+    if not os.environ.get("CURSOR_SECRET"):
+        warnings.append("CURSOR_SECRET is not set; pagination tokens will not survive restarts")
+
+    if errors:
+        raise ConfigError("Invalid configuration:\n  " + "\n  ".join(errors))
+    return warnings
@@ -0,0 +1,618 @@
+import asyncio
+import fcntl
+import gzip
+import json
+import logging
+import os
+import re
+import secrets
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.cursor import pack_key, unpack_key
+from gpt_dynamodb_action.utils.dynamo_helpers import build_filter, build_query_kwargs, build_scan_kwargs
+from gpt_dynamodb_action.utils.metrics import get_metrics_registry
+from gpt_dynamodb_action.utils.pagination import PageReader
+from gpt_dynamodb_action.utils.query_planner import PLAN_SCAN, plan_scan
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json
+from gpt_dynamodb_action.utils.table_registry import get_registry
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:  # pyarrow는 선택 의존성
+    pyarrow = None
+    parquet = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson.gz", "parquet")
+FINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# 내보내기 작업 ID 형식 (경로에 쓰이므로 엄격히 검사)
+JOB_ID_PATTERN = re.compile(r"^[0-9]{14}-[0-9a-f]{8}$")
+
+# 다운로드 시 파일을 읽는 단위(바이트)
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+EXPORT_JOBS = get_metrics_registry().counter(
+    "export_jobs_total", "Export jobs finished, by final status", ("status",))
+EXPORT_ITEMS = get_metrics_registry().counter(
+    "export_items_total", "Items written to committed export files")
+
+
+@dataclass(frozen=True)
+class ExportSettings:
+    """내보내기 작업 설정입니다. 환경 변수에서 읽어옵니다."""
+    directory: str = os.path.join(tempfile.gettempdir(), "gpt-dynamodb-exports")
+    # 워커 하나에서 동시에 실행하는 작업 수 (나머지는 queued)
+    max_running: int = 2
+    # 스캔 작업의 기본 병렬 세그먼트 수
+    segments: int = 4
+    # 파일 하나에 담는 항목 수. 파일을 닫을 때마다 세그먼트의 연속 키를 체크포인트로 저장
+    part_items: int = 100000
+    # 진행 상황을 job.json에 기록하는 최소 간격(초)
+    progress_seconds: float = 2.0
+    # 끝난 작업의 파일을 보관하는 시간
+    retention_hours: float = 24.0
+    # 시작 시 중단된 작업을 이어서 실행
+    resume_on_startup: bool = True
+
+    @classmethod
+    def from_env(cls) -> "ExportSettings":
+        defaults = cls()
+        return cls(
+            directory=os.environ.get("EXPORT_DIR", defaults.directory),
+            max_running=int(os.environ.get("EXPORT_MAX_RUNNING", defaults.max_running)),
+            segments=int(os.environ.get("EXPORT_SEGMENTS", defaults.segments)),
+            part_items=int(os.environ.get("EXPORT_PART_ITEMS", defaults.part_items)),
+            progress_seconds=float(os.environ.get("EXPORT_PROGRESS_SECONDS", defaults.progress_seconds)),
+            retention_hours=float(os.environ.get("EXPORT_RETENTION_HOURS", defaults.retention_hours)),
+            resume_on_startup=os.environ.get("EXPORT_RESUME_ON_STARTUP", "true").strip().lower() in ("1", "true", "yes", "on"),
+        )
+
+
+class ExportCancelled(Exception):
+    """작업 취소가 요청되었습니다."""
+
+
+def _timestamp(seconds: Optional[float]) -> Optional[str]:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds)) if seconds else None
+
+
+@dataclass
+class ExportSegment:
+    """
+    세그먼트별 진행 상태입니다. start_key/parts/items/bytes는 마지막 체크포인트(닫힌 파일) 기준이고,
+    pending_*은 아직 닫지 않은 파일의 값입니다. pages/scanned/rcu는 재시작 전 비용까지 누적합니다.
+    """
+    segment: int
+    start_key: Optional[Dict[str, Any]] = None
+    done: bool = False
+    parts: List[Dict[str, Any]] = field(default_factory=list)
+    items: int = 0
+    bytes: int = 0
+    pages: int = 0
+    scanned: int = 0
+    rcu: float = 0.0
+    pending_items: int = 0
+    pending_bytes: int = 0
+
+
+@dataclass
+class ExportJob:
+    id: str
+    format: str
+    filters: Optional[Dict[str, str]] = None
+    operator: Optional[Dict[str, str]] = None
+    projection: Optional[List[str]] = None
+    plan: str = PLAN_SCAN
+    status: str = "queued"
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    finished_at: Optional[float] = None
+    segments: List[ExportSegment] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExportJob":
+        segments = [ExportSegment(**dict(s, start_key=unpack_key(s.get("start_key")))) for s in data.pop("segments")]
+        return cls(**data, segments=segments)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for segment in data["segments"]:
+            segment["start_key"] = pack_key(segment["start_key"])
+        return data
+
+    def files(self) -> List[str]:
+        return [part["name"] for segment in self.segments for part in segment.parts]
+
+    def summary(self) -> Dict[str, Any]:
+        """API 응답에 쓰는 작업 상태와 진행 상황입니다."""
+        segments = self.segments
+        summary = {
+            "jobId": self.id,
+            "status": self.status,
+            "format": self.format,
+            "request": {"filters": self.filters, "operator": self.operator, "projection": self.projection,
+                        "segments": len(segments)},
+            "plan": self.plan,
+            "progress": {
+                "items": sum(s.items + s.pending_items for s in segments),
+                "bytes": sum(s.bytes + s.pending_bytes for s in segments),
+                "committedItems": sum(s.items for s in segments),
+                "consumedCapacity": round(sum(s.rcu for s in segments), 2),
+                "pagesScanned": sum(s.pages for s in segments),
+                "scannedCount": sum(s.scanned for s in segments),
+                "segmentsDone": sum(s.done for s in segments),
+            },
+            "files": self.files(),
+            "createdAt": _timestamp(self.created_at),
+            "updatedAt": _timestamp(self.updated_at),
+            "finishedAt": _timestamp(self.finished_at),
+        }
+        if self.error:
+            summary["error"] = self.error
+        if self.status == "completed" and self.format == "ndjson.gz":
+            summary["download"] = f"/exports/{self.id}/download"
+        return summary
+
+
+class _NdjsonPart:
+    """gzip으로 압축한 NDJSON 파일 하나에 페이지를 이어 씁니다."""
+    suffix = "ndjson.gz"
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.items = 0
+        self._raw = open(path, "wb")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+
+    @property
+    def size(self) -> int:
+        return self._raw.tell()
+
+    def write(self, items: List[Dict[str, Any]]) -> bool:
+        self._gzip.write(b"".join(encode_json(item) + b"\n" for item in items))
+        self.items += len(items)
+        return True
+
+    def close(self):
+        self._gzip.close()
+        self._raw.close()
+
+
+def _parquet_value(value: Any) -> Any:
+    # Decimal은 정수/실수로, 맵·리스트·집합은 JSON 문자열로 저장
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (dict, list, set, frozenset)):
+        return encode_json(value).decode("utf-8")
+    return value
+
+
+class _ParquetPart:
+    """
+    Parquet 파일 하나에 페이지마다 row group을 씁니다. 열은 프로젝션 순서이고, 타입은 첫 페이지에서 정합니다.
+    이후 페이지가 타입에 맞지 않으면 False를 반환하며, 호출자는 새 파일을 열어 씁니다.
+    """
+    suffix = "parquet"
+
+    def __init__(self, name: str, path: str, columns: List[str]):
+        self.name = name
+        self.path = path
+        self.columns = columns
+        self.items = 0
+        self._schema = None
+        self._writer = None
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def write(self, items: List[Dict[str, Any]]) -> bool:
+        rows = [{name: _parquet_value(item.get(name)) for name in self.columns} for item in items]
+        if self._schema is None:
+            inferred = pyarrow.Table.from_pylist(rows).schema
+            # 값이 모두 null인 열은 문자열 열로 둠
+            self._schema = pyarrow.schema([
+                pyarrow.field(f.name, pyarrow.string() if pyarrow.types.is_null(f.type) else f.type) for f in inferred
+            ])
+            self._writer = parquet.ParquetWriter(self.path, self._schema, compression="zstd")
+        try:
+            table = pyarrow.Table.from_pylist(rows, schema=self._schema)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            return False
+        self._writer.write_table(table)
+        self.items += len(items)
+        return True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ExportManager:
+    """
+    내보내기 작업을 만들고 백그라운드에서 실행합니다.
+    작업 상태는 EXPORT_DIR/<작업 ID>/job.json에 저장하므로 다른 워커에서도 조회할 수 있고,
+    실행 중인 워커는 작업 디렉터리의 lock 파일을 잠가 소유권을 표시합니다 (프로세스가 죽으면 자동 해제).
+    파일 작업은 이벤트 루프를 막지 않도록 스레드 풀에서 실행합니다 (동기 메서드는 스레드 풀에서 호출).
+    """
+
+    def __init__(self, settings: Optional[ExportSettings] = None):
+        self.settings = settings or ExportSettings.from_env()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running: Dict[str, ExportJob] = {}
+        self._locks: Dict[str, int] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # job.json 기록 순서가 뒤바뀌지 않도록 한 번에 하나씩 기록
+        self._save_lock = asyncio.Lock()
+
+    def _path(self, job_id: str, *names: str) -> str:
+        return os.path.join(self.settings.directory, job_id, *names)
+
+    def file_path(self, job: ExportJob, name: str) -> Optional[str]:
+        """작업에 속한 체크포인트된 파일의 경로를 반환합니다 (다른 이름은 None)."""
+        return self._path(job.id, name) if name in job.files() else None
+
+    def _write(self, job_id: str, data: Dict[str, Any]):
+        path = self._path(job_id, "job.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+
+    async def _save(self, job: ExportJob):
+        # 상태는 루프에서 복사하고 (실행 중인 세그먼트가 수정하므로) 파일 기록만 스레드 풀에서 실행
+        async with self._save_lock:
+            job.updated_at = time.time()
+            await run_in_threadpool(self._write, job.id, job.to_dict())
+
+    def _load(self, job_id: str) -> Optional[ExportJob]:
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id, "job.json")) as f:
+                return ExportJob.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def _claim(self, job_id: str) -> bool:
+        """작업 lock 파일을 잠급니다. 다른 프로세스가 실행 중이면 False를 반환합니다."""
+        if job_id in self._locks:
+            return True
+        fd = os.open(self._path(job_id, "lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._locks[job_id] = fd
+        return True
+
+    def _release(self, job_id: str):
+        fd = self._locks.pop(job_id, None)
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _owned_elsewhere(self, job_id: str) -> bool:
+        if job_id in self._locks:
+            return False
+        if not self._claim(job_id):
+            return True
+        self._release(job_id)
+        return False
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """
+        작업을 읽습니다. 이 워커가 실행 중이면 메모리의 최신 진행 상황을 반환하고,
+        실행 중으로 기록되었지만 어떤 워커도 잡고 있지 않으면 interrupted로 표시합니다.
+        """
+        if job_id in self._running:
+            return self._running[job_id]
+        job = self._load(job_id)
+        if job and job.status in ("queued", "running") and not self._owned_elsewhere(job_id):
+            job.status = "interrupted"
+        return job
+
+    def list_jobs(self) -> List[ExportJob]:
+        if not os.path.isdir(self.settings.directory):
+            return []
+        jobs = [self.get(name) for name in sorted(os.listdir(self.settings.directory), reverse=True)]
+        return [job for job in jobs if job]
+
+    async def create(self, fmt: str, filters=None, operator=None, projection=None, segments: Optional[int] = None) -> ExportJob:
+        """작업을 기록하고 백그라운드 실행을 예약합니다. 잘못된 요청은 ValueError를 발생시킵니다."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        if fmt == "parquet":
+            if pyarrow is None:
+                raise ValueError("format=parquet requires the 'pyarrow' package")
+            if not projection:
+                raise ValueError("format=parquet requires a projection (it defines the columns)")
+        # 잘못된 필터는 작업을 만들기 전에 거부 (FilterError는 ValueError)
+        build_filter(filters, operator)
+        plan = self._plan(filters, operator, projection)
+        # 파티션 키가 고정된 Query는 세그먼트로 나눌 수 없음
+        total_segments = (segments or self.settings.segments) if plan.kind == PLAN_SCAN else 1
+
+        now = time.time()
+        job_id = time.strftime("%Y%m%d%H%M%S", time.gmtime(now)) + "-" + secrets.token_hex(4)
+        job = ExportJob(job_id, fmt, filters, operator, projection, plan.as_query().tag, created_at=now,
+                        segments=[ExportSegment(i) for i in range(total_segments)])
+        await run_in_threadpool(self._prepare, job)
+        logger.info("내보내기 작업 생성: %s, 형식=%s, 계획=%s, 세그먼트 %s개", job_id, fmt, job.plan, total_segments)
+        await self._start(job)
+        return job
+
+    def _prepare(self, job: ExportJob):
+        # 새 작업을 만들 때 보관 기간이 지난 작업도 정리
+        self.cleanup()
+        os.makedirs(self._path(job.id), exist_ok=True)
+        job.updated_at = time.time()
+        self._write(job.id, job.to_dict())
+
+    async def resume(self, job_id: str) -> Optional[ExportJob]:
+        """중단/실패/취소된 작업을 마지막 체크포인트부터 다시 실행합니다."""
+        job = await run_in_threadpool(self.get, job_id)
+        if job is None:
+            return None
+        if job.status not in ("interrupted", "failed", "cancelled"):
+            raise ValueError(f"Export job is {job.status}")
+        await run_in_threadpool(self._remove_cancel_request, job_id)
+        job.status, job.error, job.finished_at = "queued", None, None
+        await self._start(job)
+        return job
+
+    def _remove_cancel_request(self, job_id: str):
+        with suppress(FileNotFoundError):
+            os.remove(self._path(job_id, "cancel"))
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        return os.path.exists(self._path(job_id, "cancel"))
+
+    def cancel(self, job_id: str) -> Optional[ExportJob]:
+        """
+        실행 중인 작업은 취소를 요청하고(다음 페이지 전에 멈춤), 끝난 작업은 파일을 삭제합니다.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if job.status in ("queued", "running"):
+            # 다른 워커가 실행 중일 수 있으므로 파일로 알림
+            open(self._path(job_id, "cancel"), "w").close()
+            logger.info("내보내기 작업 취소 요청: %s", job_id)
+        else:
+            shutil.rmtree(self._path(job_id), ignore_errors=True)
+            logger.info("내보내기 작업 삭제: %s", job_id)
+        return job
+
+    def cleanup(self):
+        """보관 기간이 지난 끝난 작업을 삭제합니다."""
+        expires = time.time() - self.settings.retention_hours * 3600
+        for job in self.list_jobs():
+            if job.status in FINAL_STATUSES and (job.finished_at or job.updated_at) < expires:
+                shutil.rmtree(self._path(job.id), ignore_errors=True)
+                logger.info("보관 기간이 지난 내보내기 작업 삭제: %s", job.id)
+
+    async def recover(self):
+        """시작 시 보관 기간이 지난 작업을 정리하고, 중단된 작업을 이어서 실행합니다."""
+        await run_in_threadpool(self.cleanup)
+        if not self.settings.resume_on_startup:
+            return
+        for job in await run_in_threadpool(self.list_jobs):
+            if job.status == "interrupted" and not await run_in_threadpool(self._cancel_requested, job.id):
+                logger.info("중단된 내보내기 작업 재개: %s", job.id)
+                await self._start(job)
+
+    async def shutdown(self):
+        """실행 중인 작업을 멈춥니다. 상태는 interrupted로 남아 다음 시작 때 체크포인트부터 재개됩니다."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _start(self, job: ExportJob):
+        if job.id in self._tasks or not await run_in_threadpool(self._claim, job.id):
+            return
+        if job.id in self._tasks:
+            # 잠금을 기다리는 사이 같은 작업이 먼저 시작됨
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.settings.max_running)
+        job.status = "queued"
+        # 저장을 기다리는 사이 같은 작업이 다시 시작되지 않도록 태스크를 먼저 등록
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.id] = task
+        self._running[job.id] = job
+
+        def forget(_):
+            self._tasks.pop(job.id, None)
+            self._running.pop(job.id, None)
+        task.add_done_callback(forget)
+        await self._save(job)
+
+    @staticmethod
+    def _plan(filters, operator, projection):
+        # 필터가 파티션 키를 고정하면 Query로 내보냄 (scan_table과 같은 계획)
+        return plan_scan(filters, operator, get_registry().get_schema(), projection)
+
+    async def _run(self, job: ExportJob):
+        try:
+            async with self._semaphore:
+                plan = self._plan(job.filters, job.operator, job.projection).as_query()
+                if plan.tag != job.plan:
+                    raise ValueError(f"Query plan changed since the job was created ({job.plan} -> {plan.tag})")
+                job.status = "running"
+                await self._save(job)
+                started = time.perf_counter()
+                await self._export(job, plan)
+                job.status = "completed"
+                logger.info("내보내기 작업 완료: %s, 항목 %s개, 파일 %s개, %.1f초", job.id,
+                            sum(s.items for s in job.segments), len(job.files()), time.perf_counter() - started)
+        except ExportCancelled:
+            job.status = "cancelled"
+            logger.info("내보내기 작업 취소됨: %s", job.id)
+        except asyncio.CancelledError:
+            job.status = "interrupted"
+            raise
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            logger.error("내보내기 작업 실패: %s: %s", job.id, e)
+        finally:
+            for segment in job.segments:
+                segment.pending_items = segment.pending_bytes = 0
+            if job.status in FINAL_STATUSES:
+                job.finished_at = time.time()
+                EXPORT_JOBS.inc(status=job.status)
+            await self._save(job)
+            self._release(job.id)
+
+    async def _export(self, job: ExportJob, plan):
+        tasks = [asyncio.ensure_future(self._export_segment(job, segment, plan))
+                 for segment in job.segments if not segment.done]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 한 세그먼트가 실패하면 나머지도 멈추고 각자의 체크포인트를 남김
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def _reader(self, job: ExportJob, plan, segment: ExportSegment, budget: ScanBudget) -> PageReader:
+        total_segments = len(job.segments)
+        if plan.kind == PLAN_SCAN:
+            build_kwargs = lambda p: dict(build_scan_kwargs(plan.filters, plan.operator, p),
+                                          Segment=segment.segment, TotalSegments=total_segments)
+            operation = "scan"
+        else:
+            build_kwargs = lambda p: build_query_kwargs(plan.pk, plan.sk, plan.sk_operator, plan.filters, plan.operator,
+                                                        p, index=plan.index)
+            operation = "query"
+        return PageReader.create(get_async_table(), operation, build_kwargs, job.projection, budget,
+                                 plan.key_attributes, plan.fetch_base)
+
+    def _open_part(self, job: ExportJob, segment: ExportSegment):
+        suffix = _ParquetPart.suffix if job.format == "parquet" else _NdjsonPart.suffix
+        name = f"part-{segment.segment:02d}-{len(segment.parts):05d}.{suffix}"
+        path = self._path(job.id, name + ".tmp")
+        return _ParquetPart(name, path, job.projection) if job.format == "parquet" else _NdjsonPart(name, path)
+
+    def _discard_partials(self, job: ExportJob, segment: ExportSegment):
+        # 체크포인트 이후에 쓰던 파일은 연속 키부터 다시 쓰므로 삭제
+        prefix = f"part-{segment.segment:02d}-"
+        committed = {part["name"] for part in segment.parts}
+        for name in os.listdir(self._path(job.id)):
+            if name.startswith(prefix) and name not in committed:
+                os.remove(self._path(job.id, name))
+
+    async def _commit(self, job: ExportJob, segment: ExportSegment, part, next_key: Optional[Dict[str, Any]]):
+        """파일을 닫아 확정하고, 다음에 읽을 연속 키를 체크포인트로 저장합니다."""
+        size = await run_in_threadpool(self._finish_part, job, part)
+        segment.parts.append({"name": part.name, "items": part.items, "bytes": size})
+        segment.items += part.items
+        segment.bytes += size
+        segment.pending_items = segment.pending_bytes = 0
+        segment.start_key = next_key
+        await self._save(job)
+        EXPORT_ITEMS.inc(part.items)
+
+    def _finish_part(self, job: ExportJob, part) -> int:
+        part.close()
+        size = os.path.getsize(part.path)
+        os.replace(part.path, self._path(job.id, part.name))
+        return size
+
+    async def _export_segment(self, job: ExportJob, segment: ExportSegment, plan):
+        """세그먼트 하나를 끝까지 읽어 파일로 씁니다. 메모리에는 한 번에 한 페이지만 둡니다."""
+        await run_in_threadpool(self._discard_partials, job, segment)
+        budget = ScanBudget()
+        reader = self._reader(job, plan, segment, budget)
+        base_pages, base_scanned, base_rcu = segment.pages, segment.scanned, segment.rcu
+        last_saved = time.monotonic()
+        start_key = segment.start_key
+        part = None
+        try:
+            while True:
+                if await run_in_threadpool(self._cancel_requested, job.id):
+                    raise ExportCancelled()
+                try:
+                    page = await reader.read(start_key, sys.maxsize)
+                except ThrottledError as e:
+                    # 재시도 후에도 스로틀링되면 같은 키에서 잠시 뒤 다시 읽음
+                    logger.warning("내보내기 작업 스로틀링: %s, 세그먼트 %s, %.1f초 후 재시도", job.id, segment.segment, e.retry_after)
+                    await asyncio.sleep(e.retry_after)
+                    continue
+                segment.pages, segment.scanned = base_pages + budget.pages, base_scanned + budget.scanned
+                segment.rcu = base_rcu + budget.consumed_rcu
+
+                items = page.get("Items", [])
+                if items:
+                    if part is None:
+                        part = self._open_part(job, segment)
+                    if not await run_in_threadpool(part.write, items):
+                        # Parquet 열 타입이 바뀌면 지금 파일을 확정하고 이 페이지부터 새 파일에 씀
+                        await self._commit(job, segment, part, start_key)
+                        part = self._open_part(job, segment)
+                        await run_in_threadpool(part.write, items)
+                    segment.pending_items, segment.pending_bytes = part.items, part.size
+
+                start_key = page.get("LastEvaluatedKey")
+                if start_key is None:
+                    break
+                if part is not None and part.items >= self.settings.part_items:
+                    await self._commit(job, segment, part, start_key)
+                    part = None
+                elif time.monotonic() - last_saved >= self.settings.progress_seconds:
+                    await self._save(job)
+                    last_saved = time.monotonic()
+
+            if part is not None:
+                await self._commit(job, segment, part, None)
+                part = None
+            segment.done, segment.start_key = True, None
+            await self._save(job)
+        finally:
+            if part is not None:
+                await run_in_threadpool(part.close)
+
+
+def iter_files(paths: List[str]) -> Iterator[bytes]:
+    """여러 파일을 이어서 읽습니다 (gzip 파일은 이어 붙여도 하나의 gzip 스트림으로 읽힘)."""
+    for path in paths:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(DOWNLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+
+_manager: Optional[ExportManager] = None
+
+
+def get_export_manager() -> ExportManager:
+    global _manager
+    if _manager is None:
+        _manager = ExportManager()
+    return _manager
+
+
+def set_export_manager(manager: Optional[ExportManager]):
+    global _manager
+    _manager = manager
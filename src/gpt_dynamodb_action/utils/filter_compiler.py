@@ -0,0 +1,389 @@
+import re
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from gpt_dynamodb_action.utils.metrics import get_metrics_registry
+
+# 지원하는 필터 연산자 (not_ 접두사로 부정할 수 있음, 예: not_contains, not_in)
+FILTER_OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "begins_with", "contains", "in", "between",
+                    "exists", "not_exists")
+NEGATION_PREFIX = "not_"
+_OPERATOR_ALIASES = {"attribute_exists": "exists", "attribute_not_exists": "not_exists"}
+
+# 값을 숫자로 해석해 비교하는 연산자
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte", "between")
+_COMPARATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+# DynamoDB IN 연산자의 피연산자 상한
+MAX_IN_VALUES = 100
+
+# 컴파일된 필터를 보관할 LRU 크기 (정규화된 필터 명세 기준)
+FILTER_CACHE_SIZE = 512
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?([eE][+-]?\d+)?")
+
+FILTER_COMPILATIONS = get_metrics_registry().counter(
+    "filter_compilations_total", "Filter specs compiled because they were not in the compiled filter LRU")
+
+
+class FilterError(ValueError):
+    """필터 명세가 잘못된 경우 발생합니다."""
+
+
+@dataclass(frozen=True)
+class CompiledFilter:
+    """
+    DynamoDB FilterExpression 문자열과 자리표시자 맵, 같은 조건을 평가하는 파이썬 함수입니다.
+    LRU에서 공유되므로 요청 파라미터에는 kwargs()로 맵의 복사본을 넣습니다 (boto3가 맵을 수정함).
+    """
+    expression: str
+    names: Mapping[str, str]
+    values: Mapping[str, Any]
+    predicate: Callable[[Dict[str, Any]], bool]
+    attributes: FrozenSet[str]
+
+    def kwargs(self) -> Dict[str, Any]:
+        return {
+            "FilterExpression": self.expression,
+            "ExpressionAttributeNames": dict(self.names),
+            "ExpressionAttributeValues": dict(self.values),
+        }
+
+
+# ---------------------------------------------------------------------------
+# 정규화: filters/operator와 where 트리를 해시 가능한 정규 명세로 변환
+# ---------------------------------------------------------------------------
+
+def _tag(value: Any) -> Tuple[str, Any]:
+    """JSON 값을 (DynamoDB 타입, 값)으로 표시합니다. True와 1이 같은 캐시 키가 되지 않도록 타입을 함께 둡니다."""
+    if isinstance(value, bool):
+        return "BOOL", value
+    if isinstance(value, (int, float, Decimal)):
+        try:
+            number = Decimal(str(value))
+        except InvalidOperation:
+            raise FilterError(f"Invalid number {value!r}")
+        if not number.is_finite():
+            raise FilterError(f"Invalid number {value!r}")
+        return "N", number
+    if isinstance(value, str):
+        return "S", value
+    if value is None:
+        return "NULL", None
+    raise FilterError(f"Unsupported filter value {value!r}")
+
+
+def _operand_list(attr: str, op: str, value: Any) -> Tuple[Tuple[str, Any], ...]:
+    # 목록 또는 쉼표로 구분한 문자열 (예: "PAID,SHIPPED", "100,200")
+    if isinstance(value, str):
+        parts = [part.strip() for part in value.split(",")]
+    elif isinstance(value, (list, tuple)):
+        parts = list(value)
+    else:
+        raise FilterError(f"'{op}' filter on '{attr}' needs a list or a comma-separated string")
+    return tuple(_tag(part) for part in parts)
+
+
+def _leaf(attr: Any, op: Any, value: Any):
+    if not isinstance(attr, str) or not attr:
+        raise FilterError("Filter attribute must be a non-empty string")
+    op = str(op or "eq").strip().lower()
+    op = _OPERATOR_ALIASES.get(op, op)
+    if op.startswith(NEGATION_PREFIX) and op not in FILTER_OPERATORS:
+        return ("not", _leaf(attr, op[len(NEGATION_PREFIX):], value))
+    if op not in FILTER_OPERATORS:
+        raise FilterError(f"Unknown operator '{op}' for '{attr}'. Supported: {', '.join(FILTER_OPERATORS)} "
+                          f"(prefix with {NEGATION_PREFIX} to negate)")
+
+    if op in ("exists", "not_exists"):
+        operands = ()
+    elif op == "in":
+        operands = _operand_list(attr, op, value)
+        if not operands:
+            raise FilterError(f"'in' filter on '{attr}' needs at least one value")
+        if len(operands) > MAX_IN_VALUES:
+            raise FilterError(f"'in' filter on '{attr}' allows at most {MAX_IN_VALUES} values")
+    elif op == "between":
+        operands = _operand_list(attr, op, value)
+        if len(operands) != 2:
+            raise FilterError(f"'between' filter on '{attr}' needs exactly two values (low, high)")
+    elif isinstance(value, (list, tuple, dict)):
+        raise FilterError(f"'{op}' filter on '{attr}' needs a single value")
+    else:
+        operands = (_tag(value),)
+    return ("cmp", attr, op, operands)
+
+
+def _group(kind: str, children: List[tuple]):
+    flat = []
+    for child in children:
+        flat.extend(child[1] if child[0] == kind else (child,))
+    # 같은 조건의 순서와 중복은 결과에 영향이 없으므로 정렬해 같은 캐시 키를 사용
+    unique = sorted(set(flat), key=repr)
+    return unique[0] if len(unique) == 1 else (kind, tuple(unique))
+
+
+def _normalize_node(node: Any):
+    if not isinstance(node, dict):
+        raise FilterError(f"Invalid where node {node!r}")
+    keys = set(node)
+    if keys & {"and", "or"}:
+        if len(keys) != 1:
+            raise FilterError("An and/or node must have no other keys")
+        kind = next(iter(keys))
+        children = node[kind]
+        if not isinstance(children, list) or not children:
+            raise FilterError(f"'{kind}' needs a non-empty list of conditions")
+        return _group(kind, [_normalize_node(child) for child in children])
+    if keys == {"not"}:
+        inner = _normalize_node(node["not"])
+        return inner[1] if inner[0] == "not" else ("not", inner)
+    if "attr" in keys and keys <= {"attr", "op", "value"}:
+        return _leaf(node["attr"], node.get("op"), node.get("value"))
+    raise FilterError(f"Invalid where node keys {sorted(keys)}; use and/or/not or attr/op/value")
+
+
+def normalize_filter(filters: Optional[Dict[str, Any]] = None, operator: Optional[Dict[str, str]] = None,
+                     where: Optional[Dict[str, Any]] = None):
+    """
+    filters(키:값, AND)와 operator, where 트리를 정규 명세로 변환합니다. 조건이 없으면 None입니다.
+    """
+    conditions = [_leaf(k, (operator or {}).get(k, "eq"), v) for k, v in (filters or {}).items()]
+    if where:
+        conditions.append(_normalize_node(where))
+    if not conditions:
+        return None
+    return _group("and", conditions)
+
+
+def _spec_attributes(spec) -> FrozenSet[str]:
+    if spec[0] == "cmp":
+        return frozenset((spec[1].split(".")[0],))
+    if spec[0] == "not":
+        return _spec_attributes(spec[1])
+    return frozenset().union(*(_spec_attributes(child) for child in spec[1]))
+
+
+def filter_attributes(filters: Optional[Dict[str, Any]] = None, where: Optional[Dict[str, Any]] = None) -> FrozenSet[str]:
+    """필터가 참조하는 최상위 속성 이름입니다 (인덱스 투영 확인용)."""
+    spec = normalize_filter(filters, None, where)
+    return _spec_attributes(spec) if spec else frozenset()
+
+
+def _spec_required(spec) -> FrozenSet[str]:
+    if spec[0] == "cmp":
+        # ne(NOT =)와 not_exists는 속성이 없는 항목도 만족
+        return frozenset() if spec[2] in ("ne", "not_exists") else frozenset((spec[1].split(".")[0],))
+    if spec[0] == "not":
+        return frozenset()
+    children = [_spec_required(child) for child in spec[1]]
+    return frozenset().union(*children) if spec[0] == "and" else frozenset.intersection(*children)
+
+
+def required_attributes(filters: Optional[Dict[str, Any]] = None, operator: Optional[Dict[str, str]] = None,
+                        where: Optional[Dict[str, Any]] = None) -> FrozenSet[str]:
+    """필터를 만족하는 항목에 반드시 있는 최상위 속성 이름입니다 (희소 인덱스 선택용)."""
+    spec = normalize_filter(filters, operator, where)
+    return _spec_required(spec) if spec else frozenset()
+
+
+# ---------------------------------------------------------------------------
+# 값 변환
+# ---------------------------------------------------------------------------
+
+def _as_number(value: str) -> Optional[Decimal]:
+    return Decimal(value) if _NUMBER.fullmatch(value) else None
+
+
+def _candidates(attr: str, op: str, operand: Tuple[str, Any], attribute_type: Optional[str]) -> List[Any]:
+    """
+    필터 값을 비교할 DynamoDB 값 목록으로 변환합니다.
+    스키마에 타입이 정의된 속성(키 속성)은 그 타입을 따르고, 그 외 속성은 숫자로 보이는 문자열을
+    비교 연산(gt/gte/lt/lte/between)에서만 숫자로 바꿉니다. eq/ne/in은 문자열 그대로 비교합니다.
+    """
+    kind, value = operand
+    if kind == "S":
+        if attribute_type == "S" or op in ("begins_with", "contains"):
+            return [value]
+        if attribute_type == "N":
+            number = _as_number(value)
+            if number is None:
+                raise FilterError(f"Filter value {value!r} for number attribute '{attr}' is not a number")
+            return [number]
+        number = _as_number(value) if op in RANGE_OPERATORS else None
+        return [value] if number is None else [number]
+    if kind == "N":
+        # 숫자 값도 문자열 속성이나 문자열 함수에는 문자열로 비교
+        return [str(value)] if attribute_type == "S" or op in ("begins_with", "contains") else [value]
+    if op in RANGE_OPERATORS or op == "begins_with":
+        raise FilterError(f"'{op}' filter on '{attr}' needs a string or number value")
+    return [value]
+
+
+# ---------------------------------------------------------------------------
+# 파이썬 평가 함수 (DynamoDB 비교 규칙: 타입이 다르거나 속성이 없으면 거짓)
+# ---------------------------------------------------------------------------
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+def _getter(parts: List[str]) -> Callable[[Dict[str, Any]], Any]:
+    def get(item):
+        value = item
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                return _MISSING
+            value = value[part]
+        return value
+    return get
+
+
+def _comparable(left, right) -> bool:
+    numeric = (int, float, Decimal)
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool)
+    if isinstance(left, numeric) and isinstance(right, numeric):
+        return True
+    return left is not _MISSING and type(left) is type(right)
+
+
+def _equals_any(value, candidates) -> bool:
+    return any(_comparable(value, c) and value == c for c in candidates)
+
+
+def _contains(value, needle) -> bool:
+    if isinstance(value, str):
+        return isinstance(needle, str) and needle in value
+    if isinstance(value, (list, set, frozenset)):
+        return needle in value
+    return False
+
+
+_PYTHON_COMPARATORS = {
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+# ---------------------------------------------------------------------------
+# 컴파일
+# ---------------------------------------------------------------------------
+
+class _Builder:
+    """자리표시자(#f0, :f0)를 할당합니다. 키 조건(#n, :v)과 프로젝션(#proj) 자리표시자와 겹치지 않습니다."""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self.values: Dict[str, Any] = {}
+        self._name_refs: Dict[str, str] = {}
+        self._value_refs: Dict[Tuple[str, Any], str] = {}
+
+    def path(self, attr: str) -> str:
+        refs = []
+        for part in attr.split("."):
+            ref = self._name_refs.get(part)
+            if ref is None:
+                ref = self._name_refs[part] = f"#f{len(self._name_refs)}"
+                self.names[ref] = part
+            refs.append(ref)
+        return ".".join(refs)
+
+    def value(self, value: Any) -> str:
+        key = (type(value).__name__, value)
+        ref = self._value_refs.get(key)
+        if ref is None:
+            ref = self._value_refs[key] = f":f{len(self._value_refs)}"
+            self.values[ref] = value
+        return ref
+
+
+def _compile_leaf(spec, builder: _Builder, attribute_types: Dict[str, str]):
+    _, attr, op, operands = spec
+    path = builder.path(attr)
+    get = _getter(attr.split("."))
+    attribute_type = attribute_types.get(attr)
+
+    if op == "exists":
+        return f"attribute_exists({path})", lambda item: get(item) is not _MISSING
+    if op == "not_exists":
+        return f"attribute_not_exists({path})", lambda item: get(item) is _MISSING
+
+    candidates = []
+    for operand in operands:
+        for value in _candidates(attr, op, operand, attribute_type):
+            if not any(_comparable(value, c) and value == c for c in candidates):
+                candidates.append(value)
+
+    if op in ("eq", "ne", "in"):
+        refs = [builder.value(c) for c in candidates]
+        expression = f"{path} = {refs[0]}" if len(refs) == 1 else f"{path} IN ({', '.join(refs)})"
+        if op == "ne":
+            # 속성이 없는 항목도 ne를 만족 (없는 항목을 빼려면 exists와 함께 사용)
+            return f"NOT ({expression})", lambda item: not _equals_any(get(item), candidates)
+        return expression, lambda item: _equals_any(get(item), candidates)
+    if op == "between":
+        low, high = candidates if len(candidates) == 2 else (candidates[0], candidates[0])
+        if not _comparable(low, high):
+            raise FilterError(f"'between' bounds for '{attr}' must have the same type")
+        expression = f"{path} BETWEEN {builder.value(low)} AND {builder.value(high)}"
+        return expression, lambda item: (_comparable(get(item), low) and low <= get(item) <= high)
+
+    value = candidates[0]
+    ref = builder.value(value)
+    if op == "begins_with":
+        return (f"begins_with({path}, {ref})",
+                lambda item: isinstance(get(item), str) and get(item).startswith(value))
+    if op == "contains":
+        return f"contains({path}, {ref})", lambda item: _contains(get(item), value)
+    compare = _PYTHON_COMPARATORS[op]
+    return (f"{path} {_COMPARATORS[op]} {ref}",
+            lambda item: _comparable(get(item), value) and compare(get(item), value))
+
+
+def _compile_node(spec, builder: _Builder, attribute_types: Dict[str, str]):
+    kind = spec[0]
+    if kind == "cmp":
+        return _compile_leaf(spec, builder, attribute_types)
+    if kind == "not":
+        expression, inner = _compile_node(spec[1], builder, attribute_types)
+        return f"NOT ({expression})", lambda item: not inner(item)
+    compiled = [_compile_node(child, builder, attribute_types) for child in spec[1]]
+    expression = f" {kind.upper()} ".join(f"({e})" for e, _ in compiled)
+    predicates = [p for _, p in compiled]
+    if kind == "and":
+        return expression, lambda item: all(p(item) for p in predicates)
+    return expression, lambda item: any(p(item) for p in predicates)
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _compile_spec(spec, attribute_types: Tuple[Tuple[str, str], ...]) -> CompiledFilter:
+    FILTER_COMPILATIONS.inc()
+    builder = _Builder()
+    expression, predicate = _compile_node(spec, builder, dict(attribute_types))
+    return CompiledFilter(expression, builder.names, builder.values, predicate, _spec_attributes(spec))
+
+
+def compile_filter(filters: Optional[Dict[str, Any]] = None, operator: Optional[Dict[str, str]] = None,
+                   where: Optional[Dict[str, Any]] = None,
+                   attribute_types: Optional[Dict[str, str]] = None) -> Optional[CompiledFilter]:
+    """
+    filters/operator와 where 트리를 FilterExpression으로 컴파일합니다. 조건이 없으면 None입니다.
+    attribute_types(속성:S/N/B)는 값 변환에 사용하며, 결과는 정규화된 명세 기준 LRU에 보관합니다.
+    잘못된 명세는 FilterError(ValueError)를 발생시킵니다.
+    """
+    spec = normalize_filter(filters, operator, where)
+    if spec is None:
+        return None
+    attributes = _spec_attributes(spec)
+    # 참조하는 속성의 타입만 캐시 키에 포함
+    types = tuple(sorted((a, t) for a, t in (attribute_types or {}).items() if a in attributes))
+    return _compile_spec(spec, types)
+
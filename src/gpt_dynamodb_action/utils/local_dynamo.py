@@ -0,0 +1,741 @@
+import json
+import math
+import re
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import deque
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+
+# 실제 DynamoDB와 동일한 페이지 크기 제한 (1MB)
+PAGE_SIZE_LIMIT = 1024 * 1024
+
+# 읽기 용량 단위 계산 기준 (4KB당 강한 일관성 1 RCU, 최종 일관성 0.5 RCU)
+READ_UNIT_BYTES = 4096
+
+# 변경 피드(DynamoDB Streams 스탠드인)에 보관하는 최대 레코드 수
+CHANGE_LOG_SIZE = 10000
+
+
+class LocalExpressionError(ValueError):
+    """로컬 스탠드인이 해석할 수 없는 표현식입니다."""
+
+
+# ---------------------------------------------------------------------------
+# 표현식 파서
+# ---------------------------------------------------------------------------
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(<>|<=|>=|=|<|>)|([(),])|(#[A-Za-z0-9_]+(?:\.#?[A-Za-z0-9_]+)*)|(:[A-Za-z0-9_]+)|([A-Za-z_][A-Za-z0-9_.]*))"
+)
+
+_FUNCTIONS = {"attribute_exists", "attribute_not_exists", "attribute_type", "begins_with", "contains", "size"}
+
+_TYPE_CHECKS = {
+    "S": lambda v: isinstance(v, str),
+    "N": lambda v: isinstance(v, (int, float, Decimal)) and not isinstance(v, bool),
+    "B": lambda v: isinstance(v, (bytes, bytearray)),
+    "BOOL": lambda v: isinstance(v, bool),
+    "NULL": lambda v: v is None,
+    "L": lambda v: isinstance(v, list),
+    "M": lambda v: isinstance(v, dict),
+    "SS": lambda v: isinstance(v, set) and all(isinstance(i, str) for i in v),
+    "NS": lambda v: isinstance(v, set) and all(isinstance(i, (int, Decimal)) for i in v),
+}
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens = []
+    pos = 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = _TOKEN_PATTERN.match(expression, pos)
+        if not match or match.end() == pos:
+            raise LocalExpressionError(f"Unexpected token at {pos}: {expression[pos:]!r}")
+        tokens.append(next(group for group in match.groups() if group is not None))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """DynamoDB 조건 표현식을 AST(튜플)로 변환하는 재귀 하향 파서입니다."""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token is None or (expected is not None and token.upper() != expected):
+            raise LocalExpressionError(f"Expected {expected!r}, got {token!r}")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise LocalExpressionError(f"Unexpected trailing token {self.peek()!r}")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.peek() and self.peek().upper() == "OR":
+            self.take()
+            node = ("or", node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.peek() and self.peek().upper() == "AND":
+            self.take()
+            node = ("and", node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.peek() and self.peek().upper() == "NOT":
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        token = self.peek()
+        if token == "(":
+            self.take("(")
+            node = self.parse_or()
+            self.take(")")
+            return node
+        if token and token.lower() in _FUNCTIONS and token.lower() != "size" and self.peek(1) == "(":
+            name = self.take().lower()
+            self.take("(")
+            args = [self.parse_operand()]
+            while self.peek() == ",":
+                self.take(",")
+                args.append(self.parse_operand())
+            self.take(")")
+            return ("func", name, args)
+        left = self.parse_operand()
+        token = self.peek()
+        if token in ("=", "<>", "<", "<=", ">", ">="):
+            self.take()
+            return ("cmp", token, left, self.parse_operand())
+        if token and token.upper() == "BETWEEN":
+            self.take()
+            low = self.parse_operand()
+            self.take("AND")
+            return ("between", left, low, self.parse_operand())
+        if token and token.upper() == "IN":
+            self.take()
+            self.take("(")
+            values = [self.parse_operand()]
+            while self.peek() == ",":
+                self.take(",")
+                values.append(self.parse_operand())
+            self.take(")")
+            return ("in", left, values)
+        raise LocalExpressionError(f"Unexpected token {token!r}")
+
+    def parse_operand(self):
+        token = self.take()
+        if token.lower() == "size" and self.peek() == "(":
+            self.take("(")
+            operand = self.parse_operand()
+            self.take(")")
+            return ("size", operand)
+        if token.startswith(":"):
+            return ("value", token)
+        if token.startswith("#"):
+            return ("path", token)
+        if token in ("(", ")", ","):
+            raise LocalExpressionError(f"Unexpected token {token!r}")
+        return ("path", token)
+
+
+def parse_expression(expression: str):
+    """조건 표현식 문자열을 AST로 파싱합니다."""
+    return _Parser(expression).parse()
+
+
+def _resolve_path(path: str, names: Dict[str, str]) -> List[str]:
+    return [names.get(part, part) for part in path.split(".")]
+
+
+def _get_path(item: Dict[str, Any], parts: List[str]):
+    value = item
+    for part in parts:
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+def _comparable(left, right) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return False
+    numeric = (int, float, Decimal)
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool)
+    if isinstance(left, numeric) and isinstance(right, numeric):
+        return True
+    return type(left) is type(right)
+
+
+def compile_ast(node, names: Dict[str, str], values: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """AST를 항목(dict)을 평가하는 파이썬 함수로 컴파일합니다."""
+
+    def operand(op):
+        kind = op[0]
+        if kind == "value":
+            if op[1] not in values:
+                raise LocalExpressionError(f"Missing value placeholder {op[1]}")
+            value = values[op[1]]
+            return lambda item: value
+        if kind == "path":
+            parts = _resolve_path(op[1], names)
+            return lambda item: _get_path(item, parts)
+        if kind == "size":
+            inner = operand(op[1])
+
+            def size(item):
+                value = inner(item)
+                if value is _MISSING or not hasattr(value, "__len__"):
+                    return _MISSING
+                return len(value)
+            return size
+        raise LocalExpressionError(f"Unknown operand {op!r}")
+
+    kind = node[0]
+    if kind == "and":
+        left, right = compile_ast(node[1], names, values), compile_ast(node[2], names, values)
+        return lambda item: left(item) and right(item)
+    if kind == "or":
+        left, right = compile_ast(node[1], names, values), compile_ast(node[2], names, values)
+        return lambda item: left(item) or right(item)
+    if kind == "not":
+        inner = compile_ast(node[1], names, values)
+        return lambda item: not inner(item)
+    if kind == "cmp":
+        op, left, right = node[1], operand(node[2]), operand(node[3])
+        compare = {
+            "=": lambda a, b: a == b,
+            "<>": lambda a, b: a != b,
+            "<": lambda a, b: a < b,
+            "<=": lambda a, b: a <= b,
+            ">": lambda a, b: a > b,
+            ">=": lambda a, b: a >= b,
+        }[op]
+
+        def cmp(item):
+            a, b = left(item), right(item)
+            if op == "<>":
+                return a is not _MISSING and not (_comparable(a, b) and a == b)
+            return _comparable(a, b) and compare(a, b)
+        return cmp
+    if kind == "between":
+        target, low, high = operand(node[1]), operand(node[2]), operand(node[3])
+
+        def between(item):
+            value, lo, hi = target(item), low(item), high(item)
+            return _comparable(value, lo) and _comparable(value, hi) and lo <= value <= hi
+        return between
+    if kind == "in":
+        target = operand(node[1])
+        candidates = [operand(value) for value in node[2]]
+
+        def is_in(item):
+            value = target(item)
+            return any(_comparable(value, c(item)) and value == c(item) for c in candidates)
+        return is_in
+    if kind == "func":
+        name, args = node[1], [operand(arg) for arg in node[2]]
+        if name == "attribute_exists":
+            return lambda item: args[0](item) is not _MISSING
+        if name == "attribute_not_exists":
+            return lambda item: args[0](item) is _MISSING
+        if name == "attribute_type":
+            def attribute_type(item):
+                check = _TYPE_CHECKS.get(args[1](item))
+                value = args[0](item)
+                return check is not None and value is not _MISSING and check(value)
+            return attribute_type
+        if name == "begins_with":
+            def begins_with(item):
+                value, prefix = args[0](item), args[1](item)
+                return isinstance(value, str) and isinstance(prefix, str) and value.startswith(prefix)
+            return begins_with
+        if name == "contains":
+            def contains(item):
+                value, needle = args[0](item), args[1](item)
+                if isinstance(value, str):
+                    return isinstance(needle, str) and needle in value
+                if isinstance(value, (list, set)):
+                    return needle in value
+                return False
+            return contains
+    raise LocalExpressionError(f"Unknown expression node {node!r}")
+
+
+def _normalize_condition(condition, names, values, is_key_condition=False):
+    """boto3 조건 객체 또는 문자열 표현식을 (문자열, 이름 맵, 값 맵)으로 정규화합니다."""
+    names = dict(names or {})
+    values = dict(values or {})
+    if isinstance(condition, ConditionBase):
+        built = ConditionExpressionBuilder().build_expression(condition, is_key_condition=is_key_condition)
+        # 사용자가 지정한 자리표시자와 충돌하지 않도록 접두사를 변경
+        expression = re.sub(r"([#:])([nv])(\d+)", r"\1local\2\3", built.condition_expression)
+        names.update({f"#local{k[1:]}": v for k, v in built.attribute_name_placeholders.items()})
+        values.update({f":local{k[1:]}": v for k, v in built.attribute_value_placeholders.items()})
+        return expression, names, values
+    return condition, names, values
+
+
+def compile_condition(condition, names=None, values=None, is_key_condition=False):
+    """조건(문자열 또는 boto3 조건 객체)을 평가 함수와 AST로 컴파일합니다."""
+    expression, names, values = _normalize_condition(condition, names, values, is_key_condition)
+    ast = parse_expression(expression)
+    return compile_ast(ast, names, values), ast, names, values
+
+
+# ---------------------------------------------------------------------------
+# 테이블 스탠드인
+# ---------------------------------------------------------------------------
+
+def _item_size(item: Dict[str, Any]) -> int:
+    return len(json.dumps(item, default=str))
+
+
+def _sort_value(value):
+    # 숫자와 문자열이 섞여도 정렬이 가능하도록 타입 순위를 함께 사용
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return (0, Decimal(str(value)), "")
+    return (1, Decimal(0), str(value))
+
+
+def _partition_hash(value) -> int:
+    return zlib.crc32(str(value).encode("utf-8"))
+
+
+class LocalIndex:
+    """로컬 테이블의 보조 인덱스(GSI/LSI)입니다. 인덱스 키가 없는 항목은 포함하지 않습니다 (희소 인덱스)."""
+
+    def __init__(self, name: str, hash_key: str, range_key: Optional[str] = None, projection_type: str = "ALL",
+                 non_key_attributes: Optional[Iterable[str]] = None, local: bool = False):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.projection_type = projection_type
+        self.non_key_attributes = list(non_key_attributes or [])
+        self.local = local
+
+    def contains(self, item: Dict[str, Any]) -> bool:
+        return self.hash_key in item and (not self.range_key or self.range_key in item)
+
+    def project(self, item: Dict[str, Any], table_keys: Iterable[str]) -> Dict[str, Any]:
+        """인덱스에 투영된 속성만 남긴 항목을 반환합니다."""
+        if self.projection_type == "ALL":
+            return item
+        attributes = set(table_keys) | {self.hash_key, self.range_key} | set(self.non_key_attributes)
+        return {k: v for k, v in item.items() if k in attributes}
+
+    def description(self) -> Dict[str, Any]:
+        """DescribeTable 응답 형식의 인덱스 설명입니다."""
+        key_schema = [{"AttributeName": self.hash_key, "KeyType": "HASH"}]
+        if self.range_key:
+            key_schema.append({"AttributeName": self.range_key, "KeyType": "RANGE"})
+        projection = {"ProjectionType": self.projection_type}
+        if self.projection_type == "INCLUDE":
+            projection["NonKeyAttributes"] = list(self.non_key_attributes)
+        description = {"IndexName": self.name, "KeySchema": key_schema, "Projection": projection}
+        if not self.local:
+            description["IndexStatus"] = "ACTIVE"
+        return description
+
+
+def parse_index_spec(spec: str) -> List[Dict[str, Any]]:
+    """
+    DYNAMO_LOCAL_INDEXES 형식의 인덱스 정의를 add_index 인자 목록으로 변환합니다.
+    예: "email-index=email;status-index=status/createdAt:KEYS_ONLY;company-index=companyCode:INCLUDE(name|email)"
+    """
+    indexes = []
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        name, definition = part.split("=", 1)
+        keys, _, projection = definition.partition(":")
+        hash_key, _, range_key = keys.partition("/")
+        non_key_attributes = []
+        projection = projection.strip() or "ALL"
+        if projection.upper().startswith("INCLUDE"):
+            non_key_attributes = [a.strip() for a in projection[projection.index("(") + 1:projection.rindex(")")].split("|")]
+            projection = "INCLUDE"
+        indexes.append({
+            "name": name.strip(), "hash_key": hash_key.strip(), "range_key": range_key.strip() or None,
+            "projection_type": projection.upper(), "non_key_attributes": non_key_attributes
+        })
+    return indexes
+
+
+class LocalTable:
+    """
+    boto3 Table 리소스와 같은 인터페이스를 제공하는 인메모리 DynamoDB 테이블입니다.
+    AWS 없이 개발하거나 벤치마크할 때 사용합니다.
+    """
+
+    def __init__(self, name: str, hash_key: str = "PK", range_key: Optional[str] = "SK",
+                 latency_ms: float = 0.0):
+        self.name = name
+        self.table_name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.latency_ms = latency_ms
+        self._items: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._scan_order: Optional[List[tuple]] = None
+        self._partitions: Optional[Dict[Any, List[tuple]]] = None
+        self._segments: Dict[tuple, tuple] = {}
+        self._indexes: Dict[str, LocalIndex] = {}
+        self._index_partitions: Dict[str, Dict[Any, List[tuple]]] = {}
+        self._changes: deque = deque(maxlen=CHANGE_LOG_SIZE)
+        self._sequence = 0
+
+    # --- 스키마 -----------------------------------------------------------
+
+    def add_index(self, name: str, hash_key: str, range_key: Optional[str] = None, projection_type: str = "ALL",
+                  non_key_attributes: Optional[Iterable[str]] = None):
+        """보조 인덱스를 추가합니다. 파티션 키가 테이블과 같으면 LSI로 취급합니다."""
+        with self._lock:
+            self._indexes[name] = LocalIndex(name, hash_key, range_key, projection_type, non_key_attributes,
+                                             local=hash_key == self.hash_key)
+            self._invalidate()
+
+    def load(self):
+        """boto3 Table.load()와 같은 역할입니다. 인메모리 테이블은 항상 최신 상태입니다."""
+
+    @property
+    def key_schema(self) -> List[Dict[str, str]]:
+        key_schema = [{"AttributeName": self.hash_key, "KeyType": "HASH"}]
+        if self.range_key:
+            key_schema.append({"AttributeName": self.range_key, "KeyType": "RANGE"})
+        return key_schema
+
+    @property
+    def attribute_definitions(self) -> List[Dict[str, str]]:
+        # 로컬 스탠드인은 모든 키 속성을 문자열로 취급
+        attributes = [self.hash_key, self.range_key]
+        for index in self._indexes.values():
+            attributes.extend([index.hash_key, index.range_key])
+        return [{"AttributeName": a, "AttributeType": "S"} for a in dict.fromkeys(attributes) if a]
+
+    @property
+    def global_secondary_indexes(self) -> Optional[List[Dict[str, Any]]]:
+        indexes = [index.description() for index in self._indexes.values() if not index.local]
+        return indexes or None
+
+    @property
+    def local_secondary_indexes(self) -> Optional[List[Dict[str, Any]]]:
+        indexes = [index.description() for index in self._indexes.values() if index.local]
+        return indexes or None
+
+    # --- 쓰기 -------------------------------------------------------------
+
+    def _key_of(self, item: Dict[str, Any]) -> tuple:
+        if self.range_key:
+            return (item[self.hash_key], item[self.range_key])
+        return (item[self.hash_key],)
+
+    def _invalidate(self):
+        self._scan_order = None
+        self._partitions = None
+        self._segments = {}
+        self._index_partitions = {}
+
+    def _record_change(self, key: tuple, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]):
+        # DynamoDB Streams(NEW_IMAGE) 레코드 형식으로 변경 내역을 남긴다
+        if old is None and new is None:
+            return
+        self._sequence += 1
+        record = {
+            "eventName": "REMOVE" if new is None else ("INSERT" if old is None else "MODIFY"),
+            "dynamodb": {"Keys": self._key_dict(key), "SequenceNumber": str(self._sequence)},
+        }
+        if new is not None:
+            record["dynamodb"]["NewImage"] = new
+        self._changes.append(record)
+
+    def put_item(self, Item: Dict[str, Any], **kwargs):
+        self._simulate_latency()
+        with self._lock:
+            key = self._key_of(Item)
+            old = self._items.get(key)
+            self._items[key] = dict(Item)
+            self._record_change(key, old, self._items[key])
+            self._invalidate()
+        return {}
+
+    def put_items(self, items):
+        """여러 항목을 한 번에 적재합니다 (시드 데이터용)."""
+        with self._lock:
+            for item in items:
+                key = self._key_of(item)
+                old = self._items.get(key)
+                self._items[key] = dict(item)
+                self._record_change(key, old, self._items[key])
+            self._invalidate()
+
+    def delete_item(self, Key: Dict[str, Any], **kwargs):
+        self._simulate_latency()
+        with self._lock:
+            key = self._key_of(Key)
+            self._record_change(key, self._items.pop(key, None), None)
+            self._invalidate()
+        return {}
+
+    def get_records(self, after: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        sequence 번호 after 이후의 변경 레코드를 반환합니다 (DynamoDB Streams 스탠드인).
+        보관 한도를 넘어 레코드가 잘렸으면 Trimmed가 true이므로 전체를 다시 읽어야 합니다.
+        """
+        with self._lock:
+            oldest = self._sequence - len(self._changes) + 1
+            records = [r for r in self._changes if int(r["dynamodb"]["SequenceNumber"]) > after][:limit]
+            last = int(records[-1]["dynamodb"]["SequenceNumber"]) if records else max(after, 0)
+            return {"Records": records, "LastSequenceNumber": last, "Trimmed": after + 1 < oldest,
+                    "LatestSequenceNumber": self._sequence}
+
+    def load_file(self, path: str):
+        """JSON 배열 또는 NDJSON 파일에서 항목을 읽어 적재합니다."""
+        with open(path, encoding="utf-8") as f:
+            content = f.read().strip()
+        if content.startswith("["):
+            items = json.loads(content, parse_float=Decimal, parse_int=Decimal)
+        else:
+            items = [json.loads(line, parse_float=Decimal, parse_int=Decimal)
+                     for line in content.splitlines() if line.strip()]
+        self.put_items(items)
+
+    # --- 인덱스 -----------------------------------------------------------
+
+    def _ensure_indexes(self):
+        with self._lock:
+            if self._scan_order is not None:
+                return
+            keys = list(self._items.keys())
+            self._scan_order = sorted(
+                keys, key=lambda k: (_partition_hash(k[0]), _sort_value(k[0])) + tuple(_sort_value(p) for p in k[1:])
+            )
+            partitions: Dict[Any, List[tuple]] = {}
+            for key in keys:
+                partitions.setdefault(key[0], []).append(key)
+            for partition_keys in partitions.values():
+                partition_keys.sort(key=lambda k: tuple(_sort_value(p) for p in k[1:]))
+            self._partitions = partitions
+            for index in self._indexes.values():
+                self._index_partitions[index.name] = self._build_index_partitions(index)
+
+    def _build_index_partitions(self, index: LocalIndex) -> Dict[Any, List[tuple]]:
+        # 인덱스 파티션 키별로 (인덱스 정렬 키, 테이블 키) 순서로 정렬한 테이블 키 목록
+        partitions: Dict[Any, List[tuple]] = {}
+        for key, item in self._items.items():
+            if index.contains(item):
+                partitions.setdefault(item[index.hash_key], []).append(key)
+        for partition_keys in partitions.values():
+            partition_keys.sort(key=lambda k: (
+                _sort_value(self._items[k][index.range_key]) if index.range_key else (),
+            ) + tuple(_sort_value(p) for p in k))
+        return partitions
+
+    def _simulate_latency(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    # --- 읽기 -------------------------------------------------------------
+
+    def _project(self, item, projection_expression, names):
+        if not projection_expression:
+            return dict(item)
+        projected = {}
+        for path in projection_expression.split(","):
+            # 중첩 경로는 최상위 속성 단위로 반환
+            attribute = _resolve_path(path.strip(), names or {})[0]
+            if attribute in item:
+                projected[attribute] = item[attribute]
+        return projected
+
+    def _with_capacity(self, response: Dict[str, Any], kwargs: Dict[str, Any], size: int) -> Dict[str, Any]:
+        # ReturnConsumedCapacity가 요청된 경우 읽은 바이트 수로 RCU를 추정해 붙인다
+        if kwargs.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            units = max(1, math.ceil(size / READ_UNIT_BYTES)) * (1.0 if kwargs.get("ConsistentRead") else 0.5)
+            response["ConsumedCapacity"] = {"TableName": self.name, "CapacityUnits": units}
+        return response
+
+    def _key_dict(self, key: tuple) -> Dict[str, Any]:
+        result = {self.hash_key: key[0]}
+        if self.range_key:
+            result[self.range_key] = key[1]
+        return result
+
+    def get_item(self, Key: Dict[str, Any], ProjectionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        self._simulate_latency()
+        item = self._items.get(self._key_of(Key))
+        if item is None:
+            return self._with_capacity({}, kwargs, 0)
+        response = {"Item": self._project(item, ProjectionExpression, ExpressionAttributeNames)}
+        return self._with_capacity(response, kwargs, _item_size(item))
+
+    def _paginate(self, keys: List[tuple], start_index: int, kwargs: Dict[str, Any], predicate=None,
+                  secondary: Optional[LocalIndex] = None):
+        names = kwargs.get("ExpressionAttributeNames")
+        values = kwargs.get("ExpressionAttributeValues")
+        filter_fn = None
+        if kwargs.get("FilterExpression") is not None:
+            filter_fn = compile_condition(kwargs["FilterExpression"], names, values)[0]
+        limit = kwargs.get("Limit")
+        select_count = kwargs.get("Select") == "COUNT"
+        table_keys = (self.hash_key, self.range_key)
+
+        items, scanned, size, index = [], 0, 0, start_index
+        while index < len(keys):
+            item = self._items.get(keys[index])
+            index += 1
+            if item is None or (predicate and not predicate(item)):
+                continue
+            if secondary is not None:
+                # 인덱스 쿼리는 인덱스에 투영된 속성만 필터링하고 반환
+                item = secondary.project(item, table_keys)
+            scanned += 1
+            size += _item_size(item)
+            if filter_fn is None or filter_fn(item):
+                items.append(item)
+            if (limit and scanned >= limit) or size >= PAGE_SIZE_LIMIT:
+                break
+
+        response = {"Count": len(items), "ScannedCount": scanned}
+        if not select_count:
+            response["Items"] = [self._project(item, kwargs.get("ProjectionExpression"), names) for item in items]
+        has_more = index < len(keys)
+        if has_more and predicate is not None:
+            # 쿼리는 키 조건을 만족하는 다음 항목이 있을 때만 다음 페이지가 있다
+            has_more = any(predicate(self._items[k]) for k in keys[index:] if k in self._items)
+        if has_more and index > start_index:
+            last_key = self._key_dict(keys[index - 1])
+            if secondary is not None:
+                # 인덱스 쿼리의 연속 키는 인덱스 키와 테이블 키를 함께 담는다
+                last_item = self._items[keys[index - 1]]
+                last_key[secondary.hash_key] = last_item[secondary.hash_key]
+                if secondary.range_key:
+                    last_key[secondary.range_key] = last_item[secondary.range_key]
+            response["LastEvaluatedKey"] = last_key
+        return self._with_capacity(response, kwargs, size)
+
+    def _segment_keys(self, total_segments: Optional[int], segment: int):
+        cache_key = (total_segments or 1, segment if total_segments else 0)
+        if cache_key not in self._segments:
+            keys = self._scan_order
+            if total_segments:
+                keys = [k for k in keys if _partition_hash(k[0]) % total_segments == segment]
+            self._segments[cache_key] = (keys, {k: i for i, k in enumerate(keys)})
+        return self._segments[cache_key]
+
+    def scan(self, **kwargs):
+        self._simulate_latency()
+        self._ensure_indexes()
+        with self._lock:
+            keys, positions = self._segment_keys(kwargs.get("TotalSegments"), kwargs.get("Segment", 0))
+            start_index = 0
+            if kwargs.get("ExclusiveStartKey"):
+                start = self._key_of(kwargs["ExclusiveStartKey"])
+                if start in positions:
+                    start_index = positions[start] + 1
+                else:
+                    # 시작 키 항목이 삭제된 경우 정렬 순서상 다음 위치에서 재개
+                    sort_key = lambda k: (_partition_hash(k[0]),) + tuple(_sort_value(p) for p in k)
+                    start_index = bisect_right([sort_key(k) for k in keys], sort_key(start))
+            return self._paginate(keys, start_index, kwargs)
+
+    def query(self, **kwargs):
+        self._simulate_latency()
+        self._ensure_indexes()
+        names = kwargs.get("ExpressionAttributeNames")
+        values = kwargs.get("ExpressionAttributeValues")
+        key_fn, ast, names, values = compile_condition(
+            kwargs["KeyConditionExpression"], names, values, is_key_condition=True
+        )
+        secondary = None
+        if kwargs.get("IndexName"):
+            secondary = self._indexes.get(kwargs["IndexName"])
+            if secondary is None:
+                raise LocalExpressionError(f"The table does not have the specified index: {kwargs['IndexName']}")
+        partition_value = self._find_hash_value(ast, names, values, secondary.hash_key if secondary else self.hash_key)
+        with self._lock:
+            partitions = self._index_partitions[secondary.name] if secondary else self._partitions
+            keys = list(partitions.get(partition_value, []))
+            if kwargs.get("ScanIndexForward", True) is False:
+                keys.reverse()
+            start_index = 0
+            if kwargs.get("ExclusiveStartKey"):
+                start = self._key_of(kwargs["ExclusiveStartKey"])
+                start_index = keys.index(start) + 1 if start in keys else 0
+            return self._paginate(keys, start_index, kwargs, predicate=key_fn, secondary=secondary)
+
+    def _find_hash_value(self, ast, names, values, hash_key):
+        # 키 조건의 최상위 AND 절에서 파티션 키 동등 비교를 찾는다
+        if ast[0] == "and":
+            for child in (ast[1], ast[2]):
+                try:
+                    return self._find_hash_value(child, names, values, hash_key)
+                except LocalExpressionError:
+                    continue
+        if ast[0] == "cmp" and ast[1] == "=":
+            left, right = ast[2], ast[3]
+            if left[0] == "path" and _resolve_path(left[1], names) == [hash_key] and right[0] == "value":
+                return values[right[1]]
+        raise LocalExpressionError("Query requires an equality condition on the partition key")
+
+
+class LocalResource:
+    """boto3 DynamoDB 서비스 리소스를 흉내 내는 인메모리 리소스입니다."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self._tables: Dict[str, LocalTable] = {}
+        self._lock = threading.Lock()
+
+    def Table(self, name: str) -> LocalTable:
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = LocalTable(name, latency_ms=self.latency_ms)
+            return self._tables[name]
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]], **kwargs):
+        if sum(len(request["Keys"]) for request in RequestItems.values()) > 100:
+            raise ValueError("Too many items requested for the BatchGetItem call")
+        responses = {}
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            found = []
+            for key in request["Keys"]:
+                item = table._items.get(table._key_of(key))
+                if item is not None:
+                    found.append(table._project(item, request.get("ProjectionExpression"),
+                                                request.get("ExpressionAttributeNames")))
+            responses[name] = found
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def close(self):
+        self._tables.clear()
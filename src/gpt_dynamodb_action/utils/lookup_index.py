@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import os
+import re
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from gpt_dynamodb_action.utils.async_dynamo import get_async_table
+from gpt_dynamodb_action.utils.dynamo_helpers import build_query_kwargs, build_scan_kwargs
+from gpt_dynamodb_action.utils.metrics import get_metrics_registry
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.table_registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_MODES = ("prefix", "contains")
+
+# 단어 경계로 보는 문자 (이메일, 코드 값의 구분자 포함)
+_WORD_SPLIT = re.compile(r"[\s@._\-#/]+")
+
+# 순위를 매기기 위해 모으는 후보 수의 상한 (limit의 배수)
+CANDIDATE_FACTOR = 10
+
+# 동기화가 실패했을 때 다시 시도하기까지 기다리는 최대 시간(초)
+RETRY_SECONDS = 30.0
+
+INDEX_ENTRIES = get_metrics_registry().gauge(
+    "lookup_index_entries", "Items held in the in-memory lookup index")
+INDEX_LAST_SYNC = get_metrics_registry().gauge(
+    "lookup_index_last_sync_timestamp_seconds", "Unix time the lookup index was last synchronized with the table")
+
+Ref = Tuple[str, str]
+
+
+def _split(value: str) -> Tuple[str, ...]:
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+@dataclass(frozen=True)
+class LookupSettings:
+    """조회 인덱스 설정입니다. 환경 변수에서 읽어옵니다."""
+    enabled: bool = False
+    # PK 값(정확히 일치하면 Query) 또는 '*'로 끝나는 PK 접두사(begins_with 스캔)
+    partitions: Tuple[str, ...] = ("COM#", "PROD#", "USR#*")
+    attributes: Tuple[str, ...] = ("companyName", "companyCode", "userName", "name", "email", "productName", "managerEmail")
+    # 전체 재동기화 주기(초)
+    refresh_seconds: float = 300.0
+    # 변경 피드 확인 주기(초). 변경 피드가 없는 테이블은 전체 재동기화만 사용
+    feed_seconds: float = 1.0
+    max_items: int = 200000
+
+    @classmethod
+    def from_env(cls) -> "LookupSettings":
+        defaults = cls()
+        return cls(
+            enabled=os.environ.get("LOOKUP_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on"),
+            partitions=_split(os.environ.get("LOOKUP_PARTITIONS", ",".join(defaults.partitions))),
+            attributes=_split(os.environ.get("LOOKUP_ATTRIBUTES", ",".join(defaults.attributes))),
+            refresh_seconds=float(os.environ.get("LOOKUP_REFRESH_SECONDS", defaults.refresh_seconds)),
+            feed_seconds=float(os.environ.get("LOOKUP_FEED_SECONDS", defaults.feed_seconds)),
+            max_items=int(os.environ.get("LOOKUP_MAX_ITEMS", defaults.max_items)),
+        )
+
+    def covers(self, pk: Any) -> bool:
+        """PK가 인덱스 대상 파티션에 속하는지 확인합니다."""
+        if not isinstance(pk, str):
+            return False
+        for spec in self.partitions:
+            if spec.endswith("*") and pk.startswith(spec[:-1]) or pk == spec:
+                return True
+        return False
+
+
+def normalize(value: str) -> str:
+    """전각/반각, 대소문자 차이를 없앤 비교용 문자열을 반환합니다."""
+    return unicodedata.normalize("NFKC", value).casefold().strip()
+
+
+def _tokens(normalized: str) -> Set[str]:
+    # 값 전체와 각 단어를 접두사 검색 대상으로 사용
+    tokens = {normalized}
+    tokens.update(word for word in _WORD_SPLIT.split(normalized) if word)
+    return tokens
+
+
+def _grams(normalized: str) -> Set[str]:
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+
+
+class LookupIndex:
+    """
+    항목의 문자열 속성을 메모리에 색인합니다.
+    접두사 검색은 정렬된 (토큰, 속성, 키) 배열을 이진 탐색하고,
+    부분 문자열 검색은 2-gram 역색인으로 후보를 좁힌 뒤 실제 포함 여부를 확인합니다.
+    """
+
+    def __init__(self, attributes: Iterable[str]):
+        self.attributes = tuple(attributes)
+        self._values: Dict[Ref, Dict[str, str]] = {}
+        self._normalized: Dict[Ref, Dict[str, str]] = {}
+        self._sorted: List[Tuple[str, str, Ref]] = []
+        self._grams: Dict[str, Set[Ref]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, ref: Ref) -> bool:
+        return ref in self._values
+
+    def refs(self) -> Set[Ref]:
+        return set(self._values)
+
+    def _extract(self, item: Dict[str, Any]) -> Dict[str, str]:
+        return {name: item[name] for name in self.attributes if isinstance(item.get(name), str) and item[name]}
+
+    def upsert(self, item: Dict[str, Any]) -> bool:
+        """항목을 추가하거나 바꿉니다. 색인 대상 값이 바뀌지 않았으면 False를 반환합니다."""
+        ref = (item["PK"], item["SK"])
+        values = self._extract(item)
+        if self._values.get(ref) == values:
+            return False
+        self.remove(ref)
+        if not values:
+            return True
+        normalized = {name: normalize(value) for name, value in values.items()}
+        self._values[ref] = values
+        self._normalized[ref] = normalized
+        for name, value in normalized.items():
+            for token in _tokens(value):
+                insort(self._sorted, (token, name, ref))
+            for gram in _grams(value):
+                self._grams.setdefault(gram, set()).add(ref)
+        return True
+
+    def remove(self, ref: Ref) -> bool:
+        normalized = self._normalized.pop(ref, None)
+        if normalized is None:
+            return False
+        del self._values[ref]
+        for name, value in normalized.items():
+            for token in _tokens(value):
+                i = bisect_left(self._sorted, (token, name, ref))
+                if i < len(self._sorted) and self._sorted[i] == (token, name, ref):
+                    del self._sorted[i]
+            for gram in _grams(value):
+                refs = self._grams.get(gram)
+                if refs is not None:
+                    refs.discard(ref)
+                    if not refs:
+                        del self._grams[gram]
+        return True
+
+    def replace_all(self, items: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        전체 읽기 결과로 색인을 맞춥니다. 바뀐 항목만 갱신하고 사라진 항목은 제거합니다.
+        (변경 수, 제거 수)를 반환합니다.
+        """
+        seen: Set[Ref] = set()
+        changed = 0
+        if not self._values:
+            # 첫 적재는 항목마다 삽입 정렬하지 않고 한 번에 정렬
+            rows = []
+            for item in items:
+                ref = (item["PK"], item["SK"])
+                seen.add(ref)
+                values = self._extract(item)
+                if not values:
+                    continue
+                normalized = {name: normalize(value) for name, value in values.items()}
+                self._values[ref] = values
+                self._normalized[ref] = normalized
+                for name, value in normalized.items():
+                    rows.extend((token, name, ref) for token in _tokens(value))
+                    for gram in _grams(value):
+                        self._grams.setdefault(gram, set()).add(ref)
+            rows.sort()
+            self._sorted = rows
+            return len(self._values), 0
+        for item in items:
+            seen.add((item["PK"], item["SK"]))
+            changed += self.upsert(item)
+        removed = sum(self.remove(ref) for ref in self.refs() - seen)
+        return changed, removed
+
+    def _prefix_candidates(self, query: str, attribute: Optional[str]) -> Iterable[Tuple[Ref, str]]:
+        i = bisect_left(self._sorted, (query,))
+        while i < len(self._sorted):
+            token, name, ref = self._sorted[i]
+            if not token.startswith(query):
+                break
+            if attribute is None or name == attribute:
+                yield ref, name
+            i += 1
+
+    def _contains_candidates(self, query: str, attribute: Optional[str]) -> Iterable[Tuple[Ref, str]]:
+        if len(query) < 2:
+            # 2-gram을 만들 수 없는 짧은 질의는 전체 확인
+            refs: Iterable[Ref] = self._normalized
+        else:
+            sets = sorted((self._grams.get(gram, set()) for gram in _grams(query)), key=len)
+            refs = set.intersection(*sets) if sets[0] else set()
+        for ref in refs:
+            for name, value in self._normalized[ref].items():
+                if (attribute is None or name == attribute) and query in value:
+                    yield ref, name
+
+    def search(self, query: str, mode: str = "prefix", attribute: Optional[str] = None,
+               pk_prefix: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        질의와 일치하는 항목을 찾습니다. 값 전체 일치, 값 접두사 일치, 단어 접두사/부분 일치 순으로,
+        같은 순위 안에서는 짧은 값이 먼저 옵니다.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        candidates = self._prefix_candidates if mode == "prefix" else self._contains_candidates
+        found: Dict[Tuple[Ref, str], Tuple] = {}
+        cap = limit * CANDIDATE_FACTOR
+        for ref, name in candidates(query, attribute):
+            if pk_prefix and not ref[0].startswith(pk_prefix):
+                continue
+            if (ref, name) in found:
+                continue
+            value = self._normalized[ref][name]
+            rank = 0 if value == query else 1 if value.startswith(query) else 2
+            found[(ref, name)] = (rank, len(value), ref)
+            if len(found) >= cap:
+                break
+        ordered = sorted(found.items(), key=lambda entry: entry[1])[:limit]
+        return [
+            {"pk": ref[0], "sk": ref[1], "attribute": name, "value": self._values[ref][name],
+             "attributes": dict(self._values[ref])}
+            for (ref, name), _ in ordered
+        ]
+
+
+class LookupService:
+    """테이블을 읽어 LookupIndex를 만들고, 변경 피드 또는 주기적 재동기화로 최신 상태를 유지합니다."""
+
+    def __init__(self, settings: Optional[LookupSettings] = None):
+        self.settings = settings or LookupSettings.from_env()
+        self.index = LookupIndex(self.settings.attributes)
+        self.ready = False
+        self.truncated = False
+        self.last_sync: Optional[float] = None
+        self._sequence: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    def age_seconds(self) -> Optional[float]:
+        """마지막으로 테이블과 동기화한 뒤 지난 시간(초)입니다. 아직 만들지 않았으면 None입니다."""
+        return None if self.last_sync is None else max(0.0, time.time() - self.last_sync)
+
+    def _mark_synced(self):
+        self.last_sync = time.time()
+        INDEX_ENTRIES.set(len(self.index))
+        INDEX_LAST_SYNC.set(self.last_sync)
+
+    @staticmethod
+    def _feed():
+        # 변경 피드는 로컬 스탠드인에만 있음 (AWS Table은 전체 재동기화 사용)
+        return getattr(get_registry().get_table(), "get_records", None)
+
+    async def _read_partition(self, table, spec: str, projection: List[str]) -> List[Dict[str, Any]]:
+        if spec.endswith("*"):
+            operation, kwargs = table.scan, build_scan_kwargs({"PK": spec[:-1]}, {"PK": "begins_with"}, projection)
+        else:
+            operation, kwargs = table.query, build_query_kwargs(spec, projection=projection)
+        items: List[Dict[str, Any]] = []
+        start_key = None
+        while True:
+            if start_key:
+                kwargs["ExclusiveStartKey"] = start_key
+            page = await operation(**kwargs)
+            items.extend(page.get("Items", []))
+            start_key = page.get("LastEvaluatedKey")
+            if not start_key or len(items) >= self.settings.max_items:
+                return items
+
+    async def refresh(self):
+        """대상 파티션을 모두 읽어 색인을 맞춥니다."""
+        async with self._lock:
+            started = time.perf_counter()
+            feed = self._feed()
+            # 읽는 동안 생긴 변경은 이후 피드에서 다시 반영되도록 읽기 전의 위치를 기록
+            sequence = feed(after=0, limit=0)["LatestSequenceNumber"] if feed else None
+            table = get_async_table()
+            projection = ["PK", "SK", *self.settings.attributes]
+            items: List[Dict[str, Any]] = []
+            for spec in self.settings.partitions:
+                items.extend(await self._read_partition(table, spec, projection))
+            self.truncated = len(items) > self.settings.max_items
+            if self.truncated:
+                logger.warning("조회 인덱스 항목 수가 상한(%s)을 넘어 일부만 색인합니다", self.settings.max_items)
+                items = items[:self.settings.max_items]
+            changed, removed = self.index.replace_all(items)
+            self._sequence = sequence
+            self.ready = True
+            self._mark_synced()
+            logger.info("조회 인덱스 동기화: 항목 %s개, 변경 %s개, 제거 %s개, %.3f초",
+                        len(self.index), changed, removed, time.perf_counter() - started)
+
+    async def apply_changes(self) -> int:
+        """변경 피드의 새 레코드를 색인에 반영하고 반영한 레코드 수를 반환합니다."""
+        feed = self._feed()
+        if feed is None or self._sequence is None:
+            return 0
+        async with self._lock:
+            applied = 0
+            while True:
+                batch = feed(after=self._sequence)
+                if batch["Trimmed"]:
+                    break
+                for record in batch["Records"]:
+                    keys = record["dynamodb"]["Keys"]
+                    if not self.settings.covers(keys.get("PK")):
+                        continue
+                    if record["eventName"] == "REMOVE":
+                        self.index.remove((keys["PK"], keys["SK"]))
+                    else:
+                        self.index.upsert(record["dynamodb"]["NewImage"])
+                    applied += 1
+                self._sequence = batch["LastSequenceNumber"]
+                if not batch["Records"]:
+                    self._mark_synced()
+                    return applied
+        # 보관 한도를 넘어 놓친 변경이 있으면 전체를 다시 읽음
+        logger.warning("변경 피드 레코드가 잘려 조회 인덱스를 다시 읽습니다")
+        await self.refresh()
+        return applied
+
+    async def run(self):
+        """백그라운드 동기화 루프입니다 (애플리케이션 종료 시 취소)."""
+        settings = self.settings
+        next_refresh = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_refresh:
+                    await self.refresh()
+                    next_refresh = time.monotonic() + settings.refresh_seconds
+                else:
+                    await self.apply_changes()
+            except ThrottledError:
+                logger.warning("조회 인덱스 동기화가 스로틀링되어 다음 주기에 다시 시도합니다")
+                next_refresh = max(next_refresh, time.monotonic() + min(settings.refresh_seconds, RETRY_SECONDS))
+            except Exception as e:
+                logger.error("조회 인덱스 동기화 오류: %s", e)
+                next_refresh = max(next_refresh, time.monotonic() + min(settings.refresh_seconds, RETRY_SECONDS))
+            interval = settings.feed_seconds if self._feed() else settings.refresh_seconds
+            await asyncio.sleep(max(0.0, min(interval, next_refresh - time.monotonic())))
+
+
+_service: Optional[LookupService] = None
+
+
+def get_lookup_service() -> LookupService:
+    global _service
+    if _service is None:
+        _service = LookupService()
+    return _service
+
+
+def set_lookup_service(service: Optional[LookupService]):
+    global _service
+    _service = service
@@ -0,0 +1,261 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+# 지연 시간(초) 기본 버킷
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 페이지 수/항목 수 버킷
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+# 응답 크기(바이트) 버킷
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """워커 간 합산을 위해 파일로 기록하는 현재 값입니다 (JSON 직렬화 가능)."""
+        with self._lock:
+            values = [[list(key), value] for key, value in self._values.items()]
+        return {"kind": self.kind, "documentation": self.documentation, "labelnames": list(self.labelnames),
+                "values": values}
+
+
+class Counter(_Metric):
+    """단조 증가 카운터입니다."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    """임의로 설정할 수 있는 현재 값입니다."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """누적 버킷, 합계, 개수를 기록하는 히스토그램입니다."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블별 [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self._values.items()]
+        return {"kind": self.kind, "documentation": self.documentation, "labelnames": list(self.labelnames),
+                "buckets": list(self.buckets), "values": values}
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total:g}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표를 등록하고 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """등록된 모든 지표의 현재 값입니다 (이름 -> Metric.snapshot())."""
+        return {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+
+
+def merge_snapshots(snapshots: Dict[str, Dict[str, Dict[str, Any]]]) -> MetricsRegistry:
+    """
+    워커별 스냅샷(워커 이름 -> MetricsRegistry.snapshot())을 하나의 레지스트리로 합칩니다.
+    카운터와 히스토그램은 레이블별로 더하고, 게이지는 더할 수 없으므로 worker 레이블을 붙여 워커별로 남깁니다.
+    """
+    merged = MetricsRegistry()
+    for worker, snapshot in snapshots.items():
+        for name, data in snapshot.items():
+            labelnames = tuple(data["labelnames"])
+            kind = data["kind"]
+            if kind == "gauge":
+                metric = merged.gauge(name, data["documentation"], labelnames + ("worker",))
+                for key, value in data["values"]:
+                    metric._values[tuple(key) + (worker,)] = value
+            elif kind == "counter":
+                metric = merged.counter(name, data["documentation"], labelnames)
+                for key, value in data["values"]:
+                    metric._values[tuple(key)] = metric._values.get(tuple(key), 0.0) + value
+            elif kind == "histogram":
+                metric = merged.histogram(name, data["documentation"], labelnames, tuple(data["buckets"]))
+                if list(metric.buckets) != data["buckets"]:
+                    # 버킷이 다른 버전의 워커 값은 합칠 수 없음
+                    continue
+                for key, (counts, total, count) in data["values"]:
+                    state = metric._values.setdefault(tuple(key), [[0] * (len(metric.buckets) + 1), 0.0, 0])
+                    state[0] = [a + b for a, b in zip(state[0], counts)]
+                    state[1] += total
+                    state[2] += count
+    return merged
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """프로세스 전역 지표 레지스트리를 반환합니다."""
+    return _registry
+
+
+HTTP_REQUESTS = _registry.counter(
+    "http_requests_total", "HTTP requests by route, method and status", ("method", "route", "status"))
+HTTP_REQUEST_SECONDS = _registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response starts", ("method", "route"))
+DYNAMODB_CALL_SECONDS = _registry.histogram(
+    "dynamodb_call_duration_seconds", "DynamoDB call latency per operation", ("operation",))
+REQUEST_PAGES = _registry.histogram(
+    "dynamodb_request_pages", "DynamoDB pages read per request", ("operation",), COUNT_BUCKETS)
+ITEMS_SCANNED = _registry.histogram(
+    "dynamodb_items_scanned", "Items read by DynamoDB per request (before filters)", ("operation",), COUNT_BUCKETS)
+ITEMS_RETURNED = _registry.histogram(
+    "dynamodb_items_returned", "Items returned to the client per request", ("operation",), COUNT_BUCKETS)
+CONSUMED_RCU = _registry.counter(
+    "dynamodb_consumed_rcu_total", "Read capacity units consumed", ("operation",))
+RESPONSE_BYTES = _registry.histogram(
+    "http_response_bytes", "Response body size before and after compression", ("stage", "encoding"), SIZE_BUCKETS)
+COMPRESSION_SECONDS = _registry.histogram(
+    "http_compression_duration_seconds", "Time spent compressing one response", ("encoding",))
+SERIALIZATION_SECONDS = _registry.histogram(
+    "serialization_duration_seconds", "Time spent encoding one JSON document")
+CACHE_REQUESTS = _registry.counter(
+    "response_cache_requests_total", "Response cache lookups by result", ("result",))
+APP_STARTUP_SECONDS = _registry.gauge(
+    "app_startup_seconds", "Worker cold start time by phase (import, warmup)", ("phase",))
+
+
+class MetricsMiddleware:
+    """요청 수와 응답 시작까지의 지연 시간을 라우트 경로(템플릿) 단위로 기록합니다."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=scope["method"], route=_route(scope))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            HTTP_REQUESTS.inc(method=scope["method"], route=_route(scope), status=str(status["code"]))
+
+
+def _route(scope) -> str:
+    # 경로 매개변수나 임의 경로로 레이블 수가 늘지 않도록 라우트 템플릿만 사용
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
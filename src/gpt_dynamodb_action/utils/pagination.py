@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from gpt_dynamodb_action.utils.batch_get import fetch_base_items
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.dynamo_helpers import KEY_ATTRIBUTES, item_key, strip_attributes, with_key_projection
+
+
+@dataclass
+class PageReader:
+    """
+    스캔/쿼리 페이지를 하나씩 읽습니다. 페이지의 일부만 반환하면 마지막으로 반환한 항목의 키를
+    연속 키로 사용하므로 다음 호출에서 항목을 건너뛰지 않습니다.
+    """
+    table: Any
+    operation: str
+    request_kwargs: Dict[str, Any]
+    budget: ScanBudget
+    key_attributes: Tuple[str, ...] = KEY_ATTRIBUTES
+    added_keys: Tuple[str, ...] = ()
+    base_projection: Optional[List[str]] = None
+    fetch_base: bool = False
+
+    @classmethod
+    def create(cls, table, operation: str, build_kwargs, projection: Optional[List[str]], budget: ScanBudget,
+               key_attributes: Tuple[str, ...] = KEY_ATTRIBUTES, fetch_base: bool = False) -> "PageReader":
+        """
+        연속 키 계산에 필요한 키 속성을 프로젝션에 추가하고 build_kwargs(프로젝션)로 요청 파라미터를 만듭니다.
+        fetch_base이면 projection은 기본 테이블에서 다시 읽을 때 사용합니다.
+        """
+        read_projection = list(key_attributes) if fetch_base else projection
+        read_projection, added_keys = with_key_projection(read_projection, key_attributes)
+        request_kwargs = build_kwargs(read_projection)
+        request_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+        return cls(table, operation, request_kwargs, budget, tuple(key_attributes), tuple(added_keys),
+                   projection, fetch_base)
+
+    async def read(self, start_key: Optional[Dict[str, Any]], max_items: int) -> Dict[str, Any]:
+        """
+        start_key 다음부터 한 페이지를 읽어 최대 max_items개를 반환합니다.
+        반환 값은 DynamoDB 응답과 같은 형식이며 Items와 LastEvaluatedKey가 조정되어 있습니다.
+        """
+        kwargs = dict(self.request_kwargs)
+        limit = self.budget.page_limit(kwargs.get("Limit"))
+        if limit:
+            kwargs["Limit"] = limit
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        page = await self.budget.track(getattr(self.table, self.operation)(**kwargs))
+
+        items = page.get("Items", [])
+        last_evaluated_key = page.get("LastEvaluatedKey")
+        if len(items) > max_items:
+            items = items[:max_items]
+            last_evaluated_key = item_key(items[-1], self.key_attributes) if items else start_key
+
+        if self.fetch_base:
+            # 인덱스 프로젝션에 없는 속성은 기본 테이블에서 다시 읽음
+            items = await fetch_base_items(self.table, items, self.base_projection)
+        else:
+            items = strip_attributes(items, list(self.added_keys))
+        return dict(page, Items=items, LastEvaluatedKey=last_evaluated_key)
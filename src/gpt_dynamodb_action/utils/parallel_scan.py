@@ -0,0 +1,132 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.dynamo_helpers import item_key
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+
+# 병렬 스캔 세그먼트 수 상한
+MAX_SEGMENTS = 32
+
+
+@dataclass
+class SegmentState:
+    """병렬 스캔의 세그먼트별 진행 상태입니다."""
+    segment: int
+    start_key: Optional[Dict[str, Any]] = None
+    done: bool = False
+    pages: int = 0
+    scanned: int = 0
+
+
+@dataclass
+class ParallelScanResult:
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    segments: List[SegmentState] = field(default_factory=list)
+
+    @property
+    def pages_scanned(self) -> int:
+        return sum(s.pages for s in self.segments)
+
+    @property
+    def scanned_count(self) -> int:
+        return sum(s.scanned for s in self.segments)
+
+    def continuation_token(self) -> Optional[Dict[str, Any]]:
+        """모든 세그먼트의 LastEvaluatedKey를 담은 복합 연속 토큰을 반환합니다."""
+        if all(s.done for s in self.segments):
+            return None
+        return {
+            "totalSegments": len(self.segments),
+            "segments": [
+                {"segment": s.segment, "lastEvaluatedKey": s.start_key, "done": s.done}
+                for s in self.segments
+            ],
+        }
+
+
+def is_segmented_token(start_key: Optional[dict]) -> bool:
+    """시작 키가 병렬 스캔의 복합 연속 토큰인지 확인합니다."""
+    return bool(start_key) and "totalSegments" in start_key and "segments" in start_key
+
+
+def segment_states_from_token(start_key: Optional[dict], total_segments: int) -> List[SegmentState]:
+    """복합 연속 토큰(없으면 처음부터)에서 세그먼트 상태를 복원합니다."""
+    if not start_key:
+        return [SegmentState(segment=i) for i in range(total_segments)]
+    if not is_segmented_token(start_key) or start_key["totalSegments"] != total_segments:
+        raise ValueError("start_key does not match the requested number of segments")
+    states = []
+    for entry in sorted(start_key["segments"], key=lambda e: e["segment"]):
+        states.append(SegmentState(
+            segment=entry["segment"],
+            start_key=entry.get("lastEvaluatedKey"),
+            done=bool(entry.get("done")),
+        ))
+    if [s.segment for s in states] != list(range(total_segments)):
+        raise ValueError("start_key is missing segment state")
+    return states
+
+
+async def parallel_scan(table, scan_kwargs: Dict[str, Any], states: List[SegmentState],
+                        max_limit: int, budget: Optional[ScanBudget] = None) -> ParallelScanResult:
+    """
+    Segment/TotalSegments로 모든 세그먼트를 동시에 스캔하고 max_limit까지 결과를 병합합니다.
+    각 라운드마다 활성 세그먼트의 다음 페이지를 병렬로 가져오며, 예산을 넘으면 라운드 사이에서 멈춥니다.
+    재시도 후에도 스로틀링된 세그먼트는 위치를 유지하고 budget.throttled를 설정해 부분 결과를 반환합니다.
+    """
+    budget = budget or ScanBudget()
+    total_segments = len(states)
+    result = ParallelScanResult(segments=states)
+
+    while len(result.items) < max_limit:
+        active = [s for s in states if not s.done]
+        if not active or budget.exhausted():
+            break
+
+        pages = await asyncio.gather(*(
+            budget.track(table.scan(**_segment_kwargs(scan_kwargs, s, total_segments))) for s in active
+        ), return_exceptions=True)
+
+        throttled = [page for page in pages if isinstance(page, ThrottledError)]
+        for page in pages:
+            if isinstance(page, BaseException) and not isinstance(page, ThrottledError):
+                raise page
+        if throttled:
+            # 아무 페이지도 읽지 못했으면 요청 전체를 실패시키고, 그렇지 않으면 이번 라운드까지만 반환
+            if len(throttled) == len(pages) and budget.pages == 0:
+                raise throttled[0]
+            budget.throttled = True
+
+        for state, page in zip(active, pages):
+            if isinstance(page, ThrottledError):
+                # 스로틀링된 세그먼트는 같은 시작 키에서 재개
+                continue
+            state.pages += 1
+            state.scanned += page.get("ScannedCount", 0)
+            items = page.get("Items", [])
+            remaining = max_limit - len(result.items)
+
+            if remaining <= 0:
+                # 이미 limit을 채웠으므로 이 페이지는 버리고 다음 호출에서 다시 읽는다
+                continue
+            if len(items) > remaining:
+                # 페이지 일부만 사용했으므로 마지막으로 반환한 항목 다음부터 재개
+                items = items[:remaining]
+                state.start_key = item_key(items[-1])
+            else:
+                state.start_key = page.get("LastEvaluatedKey")
+                state.done = state.start_key is None
+            result.items.extend(items)
+
+    return result
+
+
+def _segment_kwargs(scan_kwargs: Dict[str, Any], state: SegmentState, total_segments: int) -> Dict[str, Any]:
+    kwargs = dict(scan_kwargs, Segment=state.segment, TotalSegments=total_segments)
+    if state.start_key:
+        kwargs["ExclusiveStartKey"] = state.start_key
+    else:
+        kwargs.pop("ExclusiveStartKey", None)
+    return kwargs
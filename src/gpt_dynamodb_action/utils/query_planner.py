@@ -0,0 +1,183 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from gpt_dynamodb_action.utils.dynamo_helpers import KEY_ATTRIBUTES
+from gpt_dynamodb_action.utils.filter_compiler import filter_attributes, required_attributes
+from gpt_dynamodb_action.utils.table_schema import IndexSchema, TableSchema
+
+logger = logging.getLogger(__name__)
+
+# 키 조건으로 옮길 수 있는 SK 연산자 (contains는 필터로만 가능)
+SK_KEY_OPERATORS = ("eq", "begins_with", "gt", "gte", "lt", "lte")
+
+PLAN_SCAN = "Scan"
+PLAN_QUERY = "Query"
+PLAN_GET_ITEM = "GetItem"
+
+
+@dataclass
+class QueryPlan:
+    """
+    요청을 실행할 방식입니다. 키 조건으로 옮긴 필터는 filters에서 제외되고, where 조건 트리는 항상 필터로 남습니다.
+    index가 있으면 보조 인덱스를 쿼리하고, fetch_base이면 인덱스 결과의 키로 기본 테이블 항목을 가져옵니다.
+    """
+    kind: str = PLAN_SCAN
+    pk: Optional[str] = None
+    sk: Optional[str] = None
+    sk_operator: str = "eq"
+    filters: Dict[str, str] = field(default_factory=dict)
+    operator: Dict[str, str] = field(default_factory=dict)
+    index: Optional[IndexSchema] = None
+    fetch_base: bool = False
+    where: Optional[Dict[str, Any]] = None
+
+    @property
+    def key_names(self):
+        """키 조건에 사용할 (파티션 키, 정렬 키) 속성 이름입니다."""
+        if self.index:
+            return self.index.hash_key, self.index.range_key
+        return KEY_ATTRIBUTES
+
+    def header(self) -> str:
+        """X-Query-Plan 헤더 값입니다. 키 값은 헤더에 넣지 않고 조건의 형태만 표시합니다."""
+        parts = [self.kind]
+        if self.index:
+            parts.append(f"index={self.index.name}")
+        if self.kind == PLAN_QUERY:
+            hash_key, range_key = self.key_names
+            key = f"{hash_key} eq"
+            if self.sk is not None:
+                key += f" & {range_key} {self.sk_operator}"
+            parts.append(f"key={key}")
+        filter_count = len(self.filters) + (1 if self.where else 0)
+        if self.kind != PLAN_GET_ITEM or filter_count:
+            parts.append(f"filters={filter_count}")
+        if self.fetch_base:
+            parts.append("base_fetch")
+        return "; ".join(parts)
+
+    def as_query(self) -> "QueryPlan":
+        """GetItem 계획을 같은 조건의 Query 계획으로 바꿉니다 (스트리밍 등 페이지 단위 실행용)."""
+        if self.kind != PLAN_GET_ITEM:
+            return self
+        return QueryPlan(PLAN_QUERY, self.pk, self.sk, "eq", self.filters, self.operator, where=self.where)
+
+    @property
+    def key_attributes(self) -> Tuple[str, ...]:
+        """연속 키를 구성하는 속성입니다. 인덱스 쿼리는 테이블 키와 인덱스 키를 모두 포함합니다."""
+        attributes = list(KEY_ATTRIBUTES)
+        if self.index:
+            attributes.extend(a for a in (self.index.hash_key, self.index.range_key) if a and a not in attributes)
+        return tuple(attributes)
+
+    @property
+    def tag(self) -> str:
+        """연속 토큰에 기록하는 계획 식별자입니다 (계획이 바뀌면 토큰을 거부)."""
+        return f"{self.kind}:{self.index.name}" if self.index else self.kind
+
+    def query_projection(self, projection: Optional[List[str]]) -> Optional[List[str]]:
+        """쿼리에 사용할 프로젝션입니다. 기본 테이블에서 다시 읽는 경우 키만 읽습니다."""
+        if self.fetch_base:
+            return list(self.key_attributes)
+        return projection
+
+
+def _operator_for(operator: Optional[Dict[str, str]], key: Optional[str]) -> str:
+    return (operator or {}).get(key, "eq")
+
+
+def _key_plan(hash_key: str, range_key: Optional[str], filters: Dict[str, str], operator: Dict[str, str],
+              schema: Optional[TableSchema]) -> Optional[QueryPlan]:
+    """필터가 주어진 키 속성을 고정하면 Query 계획을, 아니면 None을 반환합니다."""
+    attribute_type = schema.attribute_type if schema else (lambda attribute: "S")
+    pk = filters.get(hash_key)
+    if not isinstance(pk, str) or not pk or _operator_for(operator, hash_key) != "eq":
+        return None
+    # 필터 값은 문자열이므로 문자열 키에 대해서만 스캔과 같은 결과를 보장할 수 있다
+    if attribute_type(hash_key) != "S":
+        return None
+
+    remaining = {k: v for k, v in filters.items() if k != hash_key}
+    plan = QueryPlan(PLAN_QUERY, pk=pk)
+
+    sk = remaining.get(range_key) if range_key else None
+    sk_operator = _operator_for(operator, range_key)
+    # 필터 컴파일러는 문자열 키 속성의 값을 문자열로 비교하므로 숫자처럼 보이는 값도 키 조건으로 옮길 수 있다
+    if isinstance(sk, str) and sk and sk_operator in SK_KEY_OPERATORS and attribute_type(range_key) == "S":
+        plan.sk, plan.sk_operator = sk, sk_operator
+        del remaining[range_key]
+
+    plan.filters = remaining
+    plan.operator = {k: v for k, v in operator.items() if k in remaining}
+    return plan
+
+
+def _plan_rank(plan: QueryPlan):
+    # 기본 테이블(또는 같은 파티션의 LSI) 우선, 정렬 키 조건을 쓰는 계획 우선, 기본 테이블 재조회가 없는 계획 우선
+    same_partition = plan.index is None or plan.index.is_local
+    return (not same_partition, plan.sk is None, plan.fetch_base, plan.index is not None,
+            plan.index.name if plan.index else "")
+
+
+def plan_scan(filters: Optional[Dict[str, str]], operator: Optional[Dict[str, str]],
+              schema: Optional[TableSchema] = None, projection: Optional[List[str]] = None,
+              where: Optional[Dict[str, Any]] = None) -> QueryPlan:
+    """
+    스캔 필터가 기본 테이블이나 보조 인덱스의 파티션 키를 고정하는지 확인해 실행 계획을 만듭니다.
+    PK가 eq로 지정되면 Query, SK까지 eq이면 GetItem을 사용합니다 (남은 필터는 가져온 항목에 적용).
+    인덱스는 필터 속성이 모두 투영된 경우에만 고르고, 요청 프로젝션이 부족하면 기본 테이블에서 다시 읽습니다.
+    정렬 키가 있는 인덱스는 정렬 키가 없는 항목을 담지 않으므로(희소 인덱스), 필터가 그 속성을 요구할 때만 고릅니다.
+    """
+    filters = dict(filters or {})
+    operator = dict(operator or {})
+    required = required_attributes(filters, operator, where)
+
+    candidates = []
+    base_plan = _key_plan(KEY_ATTRIBUTES[0], KEY_ATTRIBUTES[1], filters, operator, schema)
+    if base_plan:
+        candidates.append(base_plan)
+    for index in (schema.indexes.values() if schema else ()):
+        # 인덱스 정렬 키가 없는 항목까지 결과에 포함될 수 있으면 인덱스를 쓰면 항목이 누락된다
+        if index.range_key and index.range_key not in required:
+            continue
+        plan = _key_plan(index.hash_key, index.range_key, filters, operator, schema)
+        # 인덱스에 투영되지 않은 속성으로는 필터링할 수 없다
+        if plan is None or not index.covers(filter_attributes(plan.filters, where), schema.key_attributes):
+            continue
+        plan.index = index
+        plan.fetch_base = not index.covers(projection, schema.key_attributes)
+        candidates.append(plan)
+
+    if not candidates:
+        return QueryPlan(PLAN_SCAN, filters=filters, operator=operator, where=where)
+
+    plan = min(candidates, key=_plan_rank)
+    plan.where = where
+    if plan.index is None and plan.sk is not None and plan.sk_operator == "eq":
+        plan.kind = PLAN_GET_ITEM
+    return plan
+
+
+def plan_index_query(schema: TableSchema, index_name: str, pk: str, sk: Optional[str], sk_operator: Optional[str],
+                     filters: Optional[Dict[str, str]], operator: Optional[Dict[str, str]],
+                     projection: Optional[List[str]], where: Optional[Dict[str, Any]] = None) -> QueryPlan:
+    """
+    query_table에서 index_name을 지정한 경우의 계획입니다. pk/sk는 인덱스 키 값으로 해석합니다.
+    알 수 없는 인덱스이거나 투영되지 않은 속성으로 필터링하면 ValueError를 발생시킵니다.
+    """
+    index = schema.indexes.get(index_name)
+    if index is None:
+        raise ValueError(f"Unknown index '{index_name}'. Available indexes: {sorted(schema.indexes)}")
+    if sk and not index.range_key:
+        raise ValueError(f"Index '{index_name}' has no sort key")
+    filters = dict(filters or {})
+    attributes = filter_attributes(filters, where)
+    if not index.covers(attributes, schema.key_attributes):
+        missing = sorted(attributes - index.projected_attributes(schema.key_attributes))
+        raise ValueError(f"Filter attributes {missing} are not projected into index '{index_name}'")
+    return QueryPlan(
+        PLAN_QUERY, pk=pk, sk=sk or None, sk_operator=sk_operator or "eq",
+        filters=filters, operator=dict(operator or {}), index=index,
+        fetch_base=not index.covers(projection, schema.key_attributes), where=where
+    )
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+
+from gpt_dynamodb_action.utils.budget import consumed_units
+from gpt_dynamodb_action.utils.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 스로틀링 오류 코드
+THROTTLE_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+
+# botocore 재시도를 끈 경우 대신 재시도할 일시적 서버 오류 코드 (5xx 응답도 포함)
+TRANSIENT_ERROR_CODES = frozenset({
+    "InternalServerError",
+    "InternalFailure",
+    "ServiceUnavailable",
+})
+
+THROTTLE_RETRIES = get_metrics_registry().counter(
+    "dynamodb_throttle_retries_total", "DynamoDB calls retried after throttling", ("operation",))
+THROTTLE_FAILURES = get_metrics_registry().counter(
+    "dynamodb_throttle_failures_total", "DynamoDB calls that stayed throttled after all retries", ("operation",))
+TRANSIENT_RETRIES = get_metrics_registry().counter(
+    "dynamodb_transient_retries_total", "DynamoDB calls retried after a transient server or connection error",
+    ("operation",))
+RATE_LIMIT_WAIT_SECONDS = get_metrics_registry().counter(
+    "dynamodb_rate_limit_wait_seconds_total", "Time spent waiting for the client-side RCU limiter", ("operation",))
+
+
+@dataclass(frozen=True)
+class ResilienceSettings:
+    """
+    스로틀링 재시도와 클라이언트 측 RCU 제한 설정입니다. 환경 변수에서 읽어옵니다.
+    max_retries > 0이면 botocore 재시도는 꺼지고(DynamoSettings 참고) 일시적 오류도 여기서 재시도합니다.
+    """
+    max_retries: int = 5
+    base_backoff: float = 0.05
+    max_backoff: float = 2.0
+    # 워커(프로세스)당 초당 RCU 상한 (0이면 제한 없음)
+    rcu_per_second: float = 0.0
+    # 순간적으로 허용할 RCU (기본값: 초당 상한과 동일)
+    rcu_burst: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> "ResilienceSettings":
+        defaults = cls()
+        burst = os.environ.get("DYNAMO_RCU_BURST")
+        return cls(
+            max_retries=int(os.environ.get("DYNAMO_THROTTLE_RETRIES", defaults.max_retries)),
+            base_backoff=float(os.environ.get("DYNAMO_THROTTLE_BASE_MS", defaults.base_backoff * 1000)) / 1000,
+            max_backoff=float(os.environ.get("DYNAMO_THROTTLE_MAX_MS", defaults.max_backoff * 1000)) / 1000,
+            rcu_per_second=float(os.environ.get("DYNAMO_RCU_PER_SECOND", defaults.rcu_per_second)),
+            rcu_burst=float(burst) if burst else None,
+        )
+
+
+class ThrottledError(Exception):
+    """재시도 예산을 모두 쓴 뒤에도 DynamoDB가 스로틀링한 경우입니다."""
+
+    def __init__(self, operation: str, cause: Optional[Exception] = None, retry_after: float = 1.0):
+        super().__init__(f"DynamoDB {operation} is throttled; retry later")
+        self.operation = operation
+        self.cause = cause
+        self.retry_after = retry_after
+
+
+def is_throttle_error(error: Exception) -> bool:
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES
+
+
+def is_transient_error(error: Exception) -> bool:
+    """botocore 표준 재시도가 다시 시도하는 일시적 서버 오류와 연결 오류입니다 (스로틀링 제외)."""
+    if isinstance(error, (BotoConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(error, ClientError):
+        return False
+    if error.response.get("Error", {}).get("Code") in TRANSIENT_ERROR_CODES:
+        return True
+    return error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) >= 500
+
+
+class TokenBucket:
+    """
+    요청 간에 공유하는 RCU 토큰 버킷입니다. 호출 전에는 잔량이 0 이상이 될 때까지 기다리고,
+    호출 후 실제 소비한 용량만큼 차감합니다 (잔량은 음수가 될 수 있음).
+    스로틀링이 발생하면 충전 속도를 절반으로 줄이고, 성공할 때마다 조금씩 회복합니다 (AIMD).
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """다음 호출을 시작하기 전에 기다려야 하는 시간(초)입니다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def wait(self) -> float:
+        waited = 0.0
+        while True:
+            delay = self.delay()
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def consume(self, units: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= units
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.base_rate * 0.1, self.rate * 0.5)
+
+    def succeeded(self):
+        if self.rate < self.base_rate:
+            with self._lock:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+
+class DynamoGuard:
+    """
+    모든 DynamoDB 호출에 클라이언트 측 RCU 제한과 스로틀링 재시도(지터 지수 백오프)를 적용합니다.
+    botocore 재시도는 꺼져 있으므로 호출당 DynamoDB 요청은 최대 max_retries + 1회입니다.
+    """
+
+    def __init__(self, settings: Optional[ResilienceSettings] = None):
+        self.settings = settings or ResilienceSettings.from_env()
+        rate = self.settings.rcu_per_second
+        self.bucket = TokenBucket(rate, self.settings.rcu_burst) if rate > 0 else None
+
+    def backoff(self, attempt: int) -> float:
+        # 전체 지터가 적용된 지수 백오프
+        return random.uniform(0, min(self.settings.max_backoff, self.settings.base_backoff * (2 ** attempt)))
+
+    async def call(self, operation: str, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        call()을 실행하고 스로틀링 오류와 일시적 오류는 재시도합니다.
+        스로틀링이 재시도 예산을 넘으면 ThrottledError를, 일시적 오류는 원래 예외를 발생시킵니다.
+        """
+        for attempt in range(self.settings.max_retries + 1):
+            if self.bucket:
+                waited = await self.bucket.wait()
+                if waited:
+                    RATE_LIMIT_WAIT_SECONDS.inc(waited, operation=operation)
+            try:
+                response = await call()
+            except (ClientError, BotoConnectionError, HTTPClientError) as e:
+                if not is_throttle_error(e):
+                    if not is_transient_error(e) or attempt >= self.settings.max_retries:
+                        raise
+                    TRANSIENT_RETRIES.inc(operation=operation)
+                    delay = self.backoff(attempt + 1)
+                    logger.info("DynamoDB %s 일시적 오류(%s), %.3f초 후 재시도 (시도 %s)", operation, e, delay, attempt + 1)
+                    await asyncio.sleep(delay)
+                    continue
+                if self.bucket:
+                    self.bucket.throttled()
+                if attempt >= self.settings.max_retries:
+                    THROTTLE_FAILURES.inc(operation=operation)
+                    logger.warning("DynamoDB %s 스로틀링 재시도 한도 초과 (%s회)", operation, attempt + 1)
+                    raise ThrottledError(operation, e, self.settings.max_backoff) from e
+                THROTTLE_RETRIES.inc(operation=operation)
+                delay = self.backoff(attempt + 1)
+                logger.info("DynamoDB %s 스로틀링, %.3f초 후 재시도 (시도 %s)", operation, delay, attempt + 1)
+                await asyncio.sleep(delay)
+                continue
+            if self.bucket:
+                self.bucket.consume(consumed_units(response))
+                self.bucket.succeeded()
+            return response
+
+
+_guard: Optional[DynamoGuard] = None
+_guard_lock = threading.Lock()
+
+
+def get_guard() -> DynamoGuard:
+    """프로세스 전역 DynamoGuard를 반환합니다 (토큰 버킷은 워커 내 모든 요청이 공유)."""
+    global _guard
+    if _guard is None:
+        with _guard_lock:
+            if _guard is None:
+                _guard = DynamoGuard()
+                logger.info("DynamoDB 재시도/속도 제한 설정: %s", _guard.settings)
+    return _guard
+
+
+def set_guard(guard: Optional[DynamoGuard]):
+    """전역 DynamoGuard를 교체합니다 (None이면 다음 호출 시 환경 변수로 다시 생성)."""
+    global _guard
+    with _guard_lock:
+        _guard = guard
@@ -0,0 +1,47 @@
+import json
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+
+from gpt_dynamodb_action.utils.metrics import SERIALIZATION_SECONDS
+from gpt_dynamodb_action.utils.timing import record_stage
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 의존성
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """JSON 기본 타입이 아닌 DynamoDB 값을 인코딩 중에 변환합니다."""
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, (set, frozenset)):
+        # DynamoDB 문자열/숫자 집합(SS/NS)
+        return list(o)
+    if isinstance(o, (bytes, bytearray)):
+        return o.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    응답 데이터를 한 번의 인코딩 패스로 UTF-8 JSON 바이트로 변환합니다.
+    Decimal은 복사본을 만들지 않고 인코딩 중에 변환하며, orjson이 있으면 사용합니다.
+    """
+    started = time.perf_counter()
+    if orjson is not None:
+        body = orjson.dumps(data, default=_default)
+    else:
+        body = json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    elapsed = time.perf_counter() - started
+    record_stage("serialize", elapsed)
+    SERIALIZATION_SECONDS.observe(elapsed)
+    return body
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None, status_code: int = 200) -> Response:
+    """이미 인코딩된 JSON 바이트로 응답을 만듭니다 (재직렬화 없음)."""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
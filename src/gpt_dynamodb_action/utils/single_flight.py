@@ -0,0 +1,121 @@
+import asyncio
+import functools
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from gpt_dynamodb_action.utils.cache import ResponseCache, cache_bypassed
+from gpt_dynamodb_action.utils.metrics import get_metrics_registry
+from gpt_dynamodb_action.utils.streaming import wants_ndjson
+
+logger = logging.getLogger(__name__)
+
+COALESCED_REQUESTS = get_metrics_registry().counter(
+    "single_flight_requests_total",
+    "Requests that ran a DynamoDB execution (leader) or shared an in-flight one (follower)",
+    ("endpoint", "role"))
+
+
+@dataclass
+class SharedResponse:
+    """진행 중인 실행을 공유하는 요청들에게 돌려줄 인코딩된 응답입니다."""
+    body: bytes
+    status_code: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: Response) -> "SharedResponse":
+        return cls(response.body, response.status_code, dict(response.headers))
+
+    def to_response(self, coalesced: bool) -> Response:
+        # 미들웨어가 헤더를 수정하므로 요청마다 새 Response를 만든다
+        headers = dict(self.headers, **{"X-Coalesced": "true"}) if coalesced else self.headers
+        return Response(content=self.body, status_code=self.status_code, headers=headers)
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출이 진행 중인 실행 하나를 공유하도록 합니다.
+    실행은 별도 태스크로 돌기 때문에 먼저 온 요청의 연결이 끊겨도 나머지 요청은 결과를 받습니다.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get("COALESCE_REQUESTS", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.enabled = enabled
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """fn()의 결과와 다른 호출의 실행을 공유했는지 여부를 반환합니다."""
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        return await asyncio.shield(task), shared
+
+    async def drain(self, timeout: float) -> int:
+        """진행 중인 실행이 끝날 때까지 최대 timeout초 기다리고, 남은 실행 수를 반환합니다."""
+        pending = list(self._calls.values())
+        if not pending:
+            return 0
+        _, still_running = await asyncio.wait(pending, timeout=timeout)
+        return len(still_running)
+
+    def _forget(self, key: str, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 모든 호출자가 취소된 경우에도 예외가 회수되지 않았다는 경고가 나지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """프로세스 전역 SingleFlight를 반환합니다 (이벤트 루프 안에서만 사용)."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+def set_single_flight(single_flight: Optional[SingleFlight]):
+    """전역 SingleFlight를 교체합니다 (None이면 다음 호출 시 환경 변수로 다시 생성)."""
+    global _single_flight
+    _single_flight = single_flight
+
+
+def coalesce(endpoint: str):
+    """
+    엔드포인트 데코레이터입니다. 정규화한 요청 파라미터가 같은 동시 요청은
+    DynamoDB 실행과 직렬화된 응답을 하나만 만들어 공유합니다 (NDJSON 스트리밍 요청은 제외).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            request: Optional[Request] = kwargs.get("request")
+            flight = get_single_flight()
+            if not flight.enabled or (request is not None and wants_ndjson(kwargs.get("stream"), request)):
+                return await func(**kwargs)
+
+            async def execute() -> SharedResponse:
+                return SharedResponse.from_response(await func(**kwargs))
+
+            # Cache-Control: no-cache 요청은 캐시 적중 응답을 공유받지 않도록 따로 묶는다
+            params = {k: v for k, v in kwargs.items() if k != "request"}
+            params["_no_cache"] = request is not None and cache_bypassed(request.headers.get("cache-control"))
+            key = ResponseCache.make_key(endpoint, params)
+            shared, coalesced = await flight.do(key, execute)
+            COALESCED_REQUESTS.inc(endpoint=endpoint, role="follower" if coalesced else "leader")
+            if coalesced:
+                logger.debug("%s 요청을 진행 중인 실행과 공유합니다", endpoint)
+            return shared.to_response(coalesced)
+        return wrapper
+    return decorator
@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from gpt_dynamodb_action.utils import compression
+from gpt_dynamodb_action.utils.serialization import encode_json
+
+logger = logging.getLogger(__name__)
+
+# 시작 시 한 번만 압축하므로 최고 레벨 사용
+_MAX_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+
+def _precompress(body: bytes, encoding: str) -> bytes:
+    level = _MAX_LEVELS[encoding]
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return compression.brotli.compress(body, quality=level)
+    return compression.zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match는 약한 비교를 사용 (W/ 접두사 무시)
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class StaticResponse:
+    """미리 인코딩/압축해 둔 JSON 응답입니다. 요청마다 직렬화나 압축을 하지 않습니다."""
+    body: bytes
+    etag: str
+    max_age: int
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, data: Any, max_age: int, minimum_size: int = 1000) -> "StaticResponse":
+        """데이터를 JSON으로 인코딩하고 설치된 인코딩별로 미리 압축합니다 (원본보다 작을 때만)."""
+        body = encode_json(data)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        encoded = {}
+        if len(body) >= minimum_size:
+            for encoding in compression.available_encodings():
+                compressed = _precompress(body, encoding)
+                if len(compressed) < len(body):
+                    encoded[encoding] = compressed
+        return cls(body, etag, max_age, encoded)
+
+    def render(self, request: Request) -> Response:
+        """If-None-Match가 일치하면 304, 아니면 Accept-Encoding에 맞는 미리 압축된 본문을 반환합니다."""
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        encoding = compression.select_encoding(request.headers.get("accept-encoding", ""), tuple(self.encoded))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(content=self.encoded[encoding], headers=headers, media_type="application/json")
+        return Response(content=self.body, headers=headers, media_type="application/json")
+
+
+class StaticResponseStore:
+    """이름별로 미리 만든 응답을 보관합니다. 갱신은 새 객체로 교체하므로 읽기에 잠금이 필요 없습니다."""
+
+    def __init__(self):
+        self._responses: Dict[str, StaticResponse] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[StaticResponse]:
+        return self._responses.get(name)
+
+    def set(self, name: str, response: StaticResponse):
+        with self._lock:
+            previous = self._responses.get(name)
+            self._responses[name] = response
+        if previous is None or previous.etag != response.etag:
+            logger.info("정적 응답 갱신: %s, %s바이트, 사전 압축=%s, ETag=%s",
+                        name, len(response.body), {e: len(b) for e, b in response.encoded.items()}, response.etag)
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+
+
+_store = StaticResponseStore()
+
+
+def get_static_store() -> StaticResponseStore:
+    """프로세스 전역 정적 응답 저장소를 반환합니다."""
+    return _store
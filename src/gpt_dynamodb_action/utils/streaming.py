@@ -0,0 +1,90 @@
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.serialization import encode_json
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# 스트리밍 모드에서 허용하는 최대 반환 항목 수 (메모리는 한 페이지로 제한됨)
+MAX_STREAM_LIMIT = 10000
+
+# (시작 키, 최대 항목 수) -> 항목과 연속 키가 조정된 페이지
+FetchPage = Callable[[Optional[Dict[str, Any]], int], Awaitable[Dict[str, Any]]]
+EncodeKey = Callable[[Optional[Dict[str, Any]]], Any]
+
+
+def wants_ndjson(stream: Optional[bool], request: Request) -> bool:
+    """stream=true 이거나 Accept 헤더가 NDJSON을 요청하는지 확인합니다."""
+    if stream:
+        return True
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def iter_ndjson(fetch_page: FetchPage, operation: str, start_key: Optional[Dict[str, Any]], max_limit: int,
+                      budget: Optional[ScanBudget] = None, encode_key: Optional[EncodeKey] = None) -> AsyncIterator[bytes]:
+    """
+    DynamoDB 페이지가 도착할 때마다 항목을 한 줄씩 NDJSON으로 내보냅니다.
+    마지막 줄에는 lastEvaluatedKey(encode_key로 변환한 연속 토큰), 항목 수, 페이지 수, 소비 용량을 담은 메타데이터 레코드를 보냅니다.
+    budget 계측은 fetch_page가 담당하고, 끝나면 operation(scan/query) 이름으로 비용 지표를 기록합니다.
+    """
+    budget = budget or ScanBudget()
+    encode_key = encode_key or (lambda key: key)
+    count = 0
+    last_evaluated_key = None
+    current_start_key = start_key
+
+    try:
+        while count < max_limit:
+            try:
+                page = await fetch_page(current_start_key, max_limit - count)
+            except ThrottledError:
+                # 이미 보낸 페이지가 있으면 스로틀링된 페이지부터 재개하도록 메타데이터로 마무리
+                if current_start_key is start_key:
+                    raise
+                budget.throttled = True
+                last_evaluated_key = current_start_key
+                break
+            items = page.get("Items", [])
+            count += len(items)
+            last_evaluated_key = page.get("LastEvaluatedKey")
+
+            # 페이지 단위로 묶어서 전송해 쓰기 호출 횟수를 줄임
+            if items:
+                yield b"".join(encode_json(item) + b"\n" for item in items)
+
+            if not last_evaluated_key or budget.exhausted():
+                break
+            current_start_key = last_evaluated_key
+    except Exception as e:
+        # 헤더는 이미 전송되었으므로 오류를 마지막 레코드로 알린다
+        logger.error("스트리밍 오류: %s", e)
+        yield encode_json({"_error": {"detail": str(e)}}) + b"\n"
+        return
+
+    budget.returned = count
+    logger.info("스트리밍 결과: 반환 항목 %s개, 스캔 항목 %s개, 페이지 수: %s", count, budget.scanned, budget.pages)
+    budget.log(operation)
+    yield encode_json({
+        "_meta": {
+            "lastEvaluatedKey": encode_key(last_evaluated_key),
+            "count": count,
+            "scannedCount": budget.scanned,
+            "pagesScanned": budget.pages,
+            "consumedCapacity": budget.consumed_rcu,
+            "budgetExhausted": budget.exhausted_reason if last_evaluated_key else None
+        }
+    }) + b"\n"
+
+
+def ndjson_response(fetch_page: FetchPage, operation: str, start_key: Optional[Dict[str, Any]], max_limit: int,
+                    budget: Optional[ScanBudget] = None, encode_key: Optional[EncodeKey] = None) -> StreamingResponse:
+    """페이지 조회 함수로 NDJSON 스트리밍 응답을 만듭니다."""
+    return StreamingResponse(iter_ndjson(fetch_page, operation, start_key, max_limit, budget, encode_key),
+                             media_type=NDJSON_MEDIA_TYPE)
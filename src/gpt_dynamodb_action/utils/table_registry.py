@@ -0,0 +1,243 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from gpt_dynamodb_action.utils.resilience import ResilienceSettings
+from gpt_dynamodb_action.utils.table_schema import TableSchema, load_table_schema
+
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class DynamoSettings:
+    """
+    DynamoDB 연결 설정입니다. 환경 변수에서 읽어옵니다.
+    DynamoGuard가 재시도하면(guard_retries, DYNAMO_THROTTLE_RETRIES > 0) botocore는 한 번만 시도합니다.
+    두 계층이 모두 재시도하면 호출 하나가 max_attempts × (DYNAMO_THROTTLE_RETRIES + 1)번의 요청이 되기 때문입니다.
+    """
+    region: str = "ap-northeast-2"
+    table_name: Optional[str] = None
+    backend: str = "aws"
+    max_pool_connections: int = 50
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    tcp_keepalive: bool = True
+    retry_mode: str = "standard"
+    max_attempts: int = 3
+    local_data_path: Optional[str] = None
+    local_latency_ms: float = 0.0
+    execution_mode: str = "async"
+    async_max_workers: Optional[int] = None
+    local_indexes: Optional[str] = None
+    guard_retries: bool = False
+
+    @classmethod
+    def from_env(cls) -> "DynamoSettings":
+        return cls(
+            region=os.environ.get("AWS_REGION", "ap-northeast-2"),
+            table_name=os.environ.get("DYNAMO_TABLE_NAME"),
+            backend=os.environ.get("DYNAMO_BACKEND", "aws").lower(),
+            max_pool_connections=int(os.environ.get("DYNAMO_MAX_POOL_CONNECTIONS", "50")),
+            connect_timeout=float(os.environ.get("DYNAMO_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.environ.get("DYNAMO_READ_TIMEOUT", "10")),
+            tcp_keepalive=_env_bool("DYNAMO_TCP_KEEPALIVE", True),
+            retry_mode=os.environ.get("DYNAMO_RETRY_MODE", "standard"),
+            max_attempts=int(os.environ.get("DYNAMO_MAX_ATTEMPTS", "3")),
+            local_data_path=os.environ.get("DYNAMO_LOCAL_DATA"),
+            local_latency_ms=float(os.environ.get("DYNAMO_LOCAL_LATENCY_MS", "0")),
+            execution_mode=os.environ.get("DYNAMO_EXECUTION_MODE", "async").lower(),
+            async_max_workers=int(os.environ["DYNAMO_ASYNC_MAX_WORKERS"]) if os.environ.get("DYNAMO_ASYNC_MAX_WORKERS") else None,
+            local_indexes=os.environ.get("DYNAMO_LOCAL_INDEXES"),
+            guard_retries=ResilienceSettings.from_env().max_retries > 0,
+        )
+
+    def botocore_config(self) -> Config:
+        """커넥션 풀, keep-alive, 재시도 설정이 적용된 botocore Config를 생성합니다."""
+        # 재시도 계층은 하나만 사용 (DynamoGuard가 재시도하면 botocore는 재시도하지 않음)
+        max_attempts = 1 if self.guard_retries else self.max_attempts
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            tcp_keepalive=self.tcp_keepalive,
+            retries={"mode": self.retry_mode, "max_attempts": max_attempts},
+        )
+
+
+class TableRegistry:
+    """
+    프로세스 전체에서 공유하는 DynamoDB 리소스/테이블 레지스트리입니다.
+    세션은 한 번만 만들고, 리전별 리소스(클라이언트 커넥션 풀)와
+    (리전, 테이블)별 Table 객체를 캐싱합니다.
+    """
+
+    def __init__(self, settings: Optional[DynamoSettings] = None):
+        self.settings = settings or DynamoSettings.from_env()
+        self._session = None
+        self._resources: Dict[str, object] = {}
+        self._tables: Dict[Tuple[str, str], object] = {}
+        self._schemas: Dict[Tuple[str, str], TableSchema] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+        secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+        if access_key and secret_key:
+            return boto3.Session(aws_access_key_id=access_key, aws_secret_access_key=secret_key)
+        # 명시적 자격 증명이 없으면 기본 자격 증명 체인(IAM 역할 등)을 사용
+        return boto3.Session()
+
+    def _create_resource(self, region: str):
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session.resource("dynamodb", region_name=region, config=self.settings.botocore_config())
+
+    def get_resource(self, region: Optional[str] = None):
+        """리전별로 캐싱된 DynamoDB 서비스 리소스를 반환합니다."""
+        region = region or self.settings.region
+        resource = self._resources.get(region)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(region)
+                if resource is None:
+                    resource = self._create_resource(region)
+                    self._resources[region] = resource
+        return resource
+
+    def get_table(self, table_name: Optional[str] = None, region: Optional[str] = None):
+        """(리전, 테이블) 단위로 캐싱된 Table 객체를 반환합니다."""
+        region = region or self.settings.region
+        table_name = table_name or self.settings.table_name
+        if not table_name:
+            raise RuntimeError("DYNAMO_TABLE_NAME is not configured")
+        key = (region, table_name)
+        table = self._tables.get(key)
+        if table is None:
+            resource = self.get_resource(region)
+            with self._lock:
+                table = self._tables.get(key)
+                if table is None:
+                    table = resource.Table(table_name)
+                    self._tables[key] = table
+        return table
+
+    def get_schema(self, table_name: Optional[str] = None, region: Optional[str] = None) -> TableSchema:
+        """
+        (리전, 테이블) 단위로 캐싱된 테이블 스키마(키, GSI/LSI)를 반환합니다.
+        DescribeTable 권한이 없거나 실패하면 보조 인덱스 없는 기본 스키마를 사용합니다.
+        """
+        region = region or self.settings.region
+        table = self.get_table(table_name, region)
+        key = (region, table.name)
+        schema = self._schemas.get(key)
+        if schema is None:
+            try:
+                schema = load_table_schema(table)
+                logger.info("테이블 스키마 로드: 테이블=%s, 인덱스=%s", table.name, list(schema.indexes))
+            except Exception as e:
+                logger.warning("테이블 스키마 로드 실패, 보조 인덱스 없이 진행: %s", e)
+                schema = TableSchema(table_name=table.name)
+            self._schemas[key] = schema
+        return schema
+
+    def warm_up(self):
+        """기본 테이블과 스키마를 미리 로드해 서비스 모델 로딩과 DescribeTable 비용을 시작 시점에 지불합니다."""
+        if self.settings.table_name:
+            self.get_schema()
+
+    def close(self):
+        """캐싱된 클라이언트의 HTTP 커넥션 풀을 정리합니다."""
+        with self._lock:
+            for resource in self._resources.values():
+                client = getattr(getattr(resource, "meta", None), "client", None)
+                close = getattr(client, "close", None) or getattr(resource, "close", None)
+                if close:
+                    close()
+            self._resources.clear()
+            self._tables.clear()
+            self._schemas.clear()
+            self._session = None
+
+
+class LocalTableRegistry(TableRegistry):
+    """AWS 대신 인메모리 스탠드인을 사용하는 레지스트리입니다 (개발/벤치마크용)."""
+
+    def __init__(self, settings: Optional[DynamoSettings] = None, resource=None):
+        super().__init__(settings)
+        self._local_resource = resource
+
+    def _create_resource(self, region: str):
+        if self._local_resource is None:
+            from gpt_dynamodb_action.utils.local_dynamo import LocalResource, parse_index_spec
+
+            self._local_resource = LocalResource(latency_ms=self.settings.local_latency_ms)
+            if self.settings.table_name:
+                table = self._local_resource.Table(self.settings.table_name)
+                for index in parse_index_spec(self.settings.local_indexes or ""):
+                    table.add_index(**index)
+                if self.settings.local_data_path:
+                    table.load_file(self.settings.local_data_path)
+        return self._local_resource
+
+    def close(self):
+        # 인메모리 데이터는 레지스트리를 다시 초기화할 때까지 유지
+        with self._lock:
+            self._resources.clear()
+            self._tables.clear()
+            self._schemas.clear()
+
+
+_registry: Optional[TableRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def create_registry(settings: Optional[DynamoSettings] = None) -> TableRegistry:
+    """설정된 백엔드(aws 또는 local)에 맞는 레지스트리를 생성합니다."""
+    settings = settings or DynamoSettings.from_env()
+    if settings.backend == "local":
+        return LocalTableRegistry(settings)
+    if settings.backend != "aws":
+        raise ValueError(f"Unknown DYNAMO_BACKEND: {settings.backend}")
+    return TableRegistry(settings)
+
+
+def init_registry(registry: Optional[TableRegistry] = None) -> TableRegistry:
+    """프로세스 전역 레지스트리를 초기화합니다. 다른 구현으로 교체할 때도 사용합니다."""
+    global _registry
+    with _registry_lock:
+        if _registry is not None and registry is not None and _registry is not registry:
+            _registry.close()
+        if registry is not None or _registry is None:
+            _registry = registry or create_registry()
+        _registry.warm_up()
+        logger.info("DynamoDB 레지스트리 초기화: 백엔드=%s, 풀 크기=%s",
+                    _registry.settings.backend, _registry.settings.max_pool_connections)
+        return _registry
+
+
+def get_registry() -> TableRegistry:
+    """전역 레지스트리를 반환합니다. 초기화되지 않았다면 지연 생성합니다."""
+    if _registry is None:
+        return init_registry()
+    return _registry
+
+
+def close_registry():
+    """전역 레지스트리를 닫습니다 (애플리케이션 종료 시 호출)."""
+    global _registry
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
+            _registry = None
@@ -0,0 +1,151 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _key_names(key_schema: List[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    hash_key = next((k["AttributeName"] for k in key_schema if k["KeyType"] == "HASH"), None)
+    range_key = next((k["AttributeName"] for k in key_schema if k["KeyType"] == "RANGE"), None)
+    return hash_key, range_key
+
+
+@dataclass(frozen=True)
+class IndexSchema:
+    """보조 인덱스(GSI/LSI)의 키와 프로젝션 정보입니다."""
+    name: str
+    hash_key: str
+    range_key: Optional[str] = None
+    projection_type: str = "ALL"
+    non_key_attributes: Tuple[str, ...] = ()
+    is_local: bool = False
+
+    def projected_attributes(self, table_keys: Iterable[str]) -> Optional[FrozenSet[str]]:
+        """인덱스에서 읽을 수 있는 속성 집합입니다. ALL 프로젝션이면 None을 반환합니다."""
+        if self.projection_type == "ALL":
+            return None
+        attributes = set(table_keys) | {self.hash_key} | set(self.non_key_attributes)
+        if self.range_key:
+            attributes.add(self.range_key)
+        return frozenset(attributes)
+
+    def covers(self, attributes: Optional[Iterable[str]], table_keys: Iterable[str]) -> bool:
+        """요청한 속성을 모두 인덱스에서 읽을 수 있는지 확인합니다 (None은 전체 속성)."""
+        projected = self.projected_attributes(table_keys)
+        if projected is None:
+            return True
+        if attributes is None:
+            return False
+        return set(attributes) <= projected
+
+    @classmethod
+    def from_description(cls, description: Dict[str, Any], is_local: bool = False) -> "IndexSchema":
+        hash_key, range_key = _key_names(description["KeySchema"])
+        projection = description.get("Projection", {})
+        return cls(
+            name=description["IndexName"],
+            hash_key=hash_key,
+            range_key=range_key,
+            projection_type=projection.get("ProjectionType", "ALL"),
+            non_key_attributes=tuple(projection.get("NonKeyAttributes", ())),
+            is_local=is_local,
+        )
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """DescribeTable로 읽은 테이블 키와 보조 인덱스 정보입니다."""
+    table_name: str
+    hash_key: str = "PK"
+    range_key: Optional[str] = "SK"
+    attribute_types: Dict[str, str] = field(default_factory=dict)
+    indexes: Dict[str, IndexSchema] = field(default_factory=dict)
+
+    @property
+    def key_attributes(self) -> Tuple[str, ...]:
+        return tuple(k for k in (self.hash_key, self.range_key) if k)
+
+    def attribute_type(self, attribute: str) -> str:
+        # 정의되지 않은 키 속성은 문자열로 간주
+        return self.attribute_types.get(attribute, "S")
+
+    @classmethod
+    def from_description(cls, description: Dict[str, Any]) -> "TableSchema":
+        """DescribeTable 응답의 Table 항목으로 스키마를 만듭니다. 활성 상태가 아닌 GSI는 제외합니다."""
+        hash_key, range_key = _key_names(description["KeySchema"])
+        indexes = {}
+        for index in description.get("GlobalSecondaryIndexes") or []:
+            if index.get("IndexStatus", "ACTIVE") == "ACTIVE":
+                indexes[index["IndexName"]] = IndexSchema.from_description(index)
+        for index in description.get("LocalSecondaryIndexes") or []:
+            indexes[index["IndexName"]] = IndexSchema.from_description(index, is_local=True)
+        return cls(
+            table_name=description["TableName"],
+            hash_key=hash_key,
+            range_key=range_key,
+            attribute_types={a["AttributeName"]: a["AttributeType"] for a in description.get("AttributeDefinitions", [])},
+            indexes=indexes,
+        )
+
+
+def load_table_schema(table) -> TableSchema:
+    """boto3 Table 리소스의 속성(DescribeTable)으로 스키마를 읽습니다."""
+    table.load()
+    return TableSchema.from_description({
+        "TableName": table.name,
+        "KeySchema": table.key_schema,
+        "AttributeDefinitions": table.attribute_definitions,
+        "GlobalSecondaryIndexes": table.global_secondary_indexes,
+        "LocalSecondaryIndexes": table.local_secondary_indexes,
+    })
+
+
+def _value_type(value: Any) -> str:
+    # boto3가 반환하는 파이썬 값을 DynamoDB 속성 타입으로 표시
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (Decimal, int, float)):
+        return "N"
+    if isinstance(value, (bytes, bytearray)):
+        return "B"
+    if isinstance(value, dict):
+        return "M"
+    if isinstance(value, list):
+        return "L"
+    if isinstance(value, (set, frozenset)):
+        return "NS" if value and all(isinstance(v, (Decimal, int, float)) for v in value) else "SS"
+    return "NULL"
+
+
+async def sample_attributes(table, max_items: int = 500, page_size: int = 100) -> Dict[str, Dict[str, Any]]:
+    """
+    제한된 스캔으로 항목을 표본 추출해 속성별 타입과 등장 비율을 집계합니다.
+    max_items개를 읽거나 테이블 끝에 도달하면 멈춥니다.
+    """
+    types: Dict[str, Counter] = {}
+    sampled = 0
+    start_key = None
+    while sampled < max_items:
+        kwargs = {"Limit": min(page_size, max_items - sampled)}
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        page = await table.scan(**kwargs)
+        for item in page.get("Items", []):
+            for attribute, value in item.items():
+                types.setdefault(attribute, Counter())[_value_type(value)] += 1
+        sampled += len(page.get("Items", []))
+        start_key = page.get("LastEvaluatedKey")
+        if not start_key:
+            break
+    return {
+        attribute: {
+            "types": [t for t, _ in counter.most_common()],
+            "frequency": round(sum(counter.values()) / sampled, 3) if sampled else 0.0,
+        }
+        for attribute, counter in sorted(types.items())
+    }
@@ -0,0 +1,70 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+# 요청별 단계 소요 시간(초). 미들웨어가 요청 시작 시 새 딕셔너리를 설정
+_stages: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("server_timing_stages", default=None)
+
+# Server-Timing 헤더에 표시하는 단계 순서
+STAGES = ("dynamodb", "serialize", "compress")
+
+
+def record_stage(name: str, seconds: float):
+    """현재 요청의 단계 소요 시간을 누적합니다 (요청 밖에서는 무시)."""
+    stages = _stages.get()
+    if stages is not None:
+        stages[name] = stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str):
+    """with 블록의 소요 시간을 현재 요청의 단계 시간에 더합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+def format_server_timing(stages: Dict[str, float], total: float) -> str:
+    """단계 시간을 Server-Timing 헤더 값으로 만듭니다 (밀리초)."""
+    parts = [f"{name};dur={stages[name] * 1000:.2f}" for name in STAGES if name in stages]
+    parts.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages.items() if name not in STAGES)
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """
+    요청별 단계 시간(DynamoDB 호출, 직렬화, 압축)을 모아 Server-Timing 헤더로 보고합니다.
+    헤더는 응답 시작 시점까지의 시간이므로 스트리밍 응답은 첫 청크까지만 포함합니다.
+    """
+
+    def __init__(self, app, enabled: Optional[bool] = None):
+        self.app = app
+        if enabled is None:
+            enabled = os.environ.get("SERVER_TIMING", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        stages: Dict[str, float] = {}
+        token = _stages.set(stages)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", format_server_timing(stages, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _stages.reset(token)
@@ -0,0 +1,117 @@
+import heapq
+import sys
+from decimal import Decimal
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+
+SORT_ORDERS = ("asc", "desc")
+
+# top_k 상한 (힙 크기 = 응답 크기)
+MAX_TOP_K = 1000
+
+
+def sort_key(value: Any) -> Optional[Tuple[int, Any]]:
+    """
+    정렬에 쓸 비교 키를 반환합니다. 숫자는 문자열보다 앞에 오고, 정렬할 수 없는 값(없음, 맵, 리스트, 집합)은 None입니다.
+    """
+    if isinstance(value, bool):
+        return 0, int(value)
+    if isinstance(value, (Decimal, int, float)):
+        return 0, value
+    if isinstance(value, str):
+        return 1, value
+    if isinstance(value, (bytes, bytearray)):
+        return 2, bytes(value)
+    return None
+
+
+class _Reversed:
+    """오름차순 top-k를 최소 힙으로 유지하기 위해 비교를 뒤집습니다."""
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other) -> bool:
+        return self.key == other.key
+
+
+class TopK:
+    """
+    페이지를 지나가며 sort_by 기준 상위 k개 항목만 크기 k의 힙에 유지합니다 (메모리 O(k)).
+    값이 같으면 먼저 읽은 항목이 남습니다.
+    """
+
+    def __init__(self, sort_by: str, order: str = "desc", k: int = 100):
+        if order not in SORT_ORDERS:
+            raise ValueError(f"order must be one of: {', '.join(SORT_ORDERS)}")
+        if not 1 <= k <= MAX_TOP_K:
+            raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+        self.sort_by = sort_by
+        self.order = order
+        self.k = k
+        # 필터를 통과해 비교한 항목 수와 그중 정렬 속성이 없거나 정렬할 수 없는 항목 수
+        self.considered = 0
+        self.missing = 0
+        self._heap: List[tuple] = []
+        self._sequence = count()
+
+    def extend(self, items: List[Dict[str, Any]]):
+        heap = self._heap
+        descending = self.order == "desc"
+        for item in items:
+            self.considered += 1
+            key = sort_key(item.get(self.sort_by))
+            if key is None:
+                self.missing += 1
+                continue
+            # 나중에 읽은 항목일수록 작은 순번을 주어 동점이면 먼저 밀려나게 함
+            entry = (key if descending else _Reversed(key), -next(self._sequence), item)
+            if len(heap) < self.k:
+                heapq.heappush(heap, entry)
+            elif heap[0] < entry:
+                heapq.heapreplace(heap, entry)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """정렬된 상위 항목을 반환합니다."""
+        return [entry[2] for entry in sorted(self._heap, reverse=True)]
+
+    def describe(self) -> Dict[str, Any]:
+        """응답 본문에 붙이는 정렬 정보입니다."""
+        return {"sortBy": self.sort_by, "order": self.order, "topK": self.k,
+                "consideredCount": self.considered, "missingSortKeyCount": self.missing}
+
+
+def sort_projection(projection: Optional[List[str]], sort_by: Optional[str]) -> Tuple[Optional[List[str]], bool]:
+    """정렬 속성을 읽도록 프로젝션에 추가합니다. (읽을 프로젝션, 응답에서 정렬 속성을 뺄지 여부)를 반환합니다."""
+    if not sort_by or not projection or sort_by in projection:
+        return projection, False
+    return list(projection) + [sort_by], True
+
+
+async def read_top_k(reader, start_key: Optional[Dict[str, Any]], top: TopK, budget: ScanBudget) -> Optional[Dict[str, Any]]:
+    """
+    모든 페이지를 읽어 top에 넣고, 예산이나 스로틀링으로 멈추면 이어서 읽을 연속 키를 반환합니다 (끝까지 읽으면 None).
+    각 페이지를 자르지 않고 통째로 읽으므로 연속 키는 항상 페이지 경계입니다.
+    """
+    current_start_key = start_key
+    while True:
+        try:
+            page = await reader.read(current_start_key, sys.maxsize)
+        except ThrottledError:
+            # 첫 페이지부터 실패하면 503, 이미 읽은 페이지가 있으면 스로틀링된 페이지부터 재개하도록 부분 결과를 반환
+            if current_start_key is start_key:
+                raise
+            budget.throttled = True
+            return current_start_key
+        top.extend(page.get("Items", []))
+        last_evaluated_key = page.get("LastEvaluatedKey")
+        if not last_evaluated_key or budget.exhausted():
+            return last_evaluated_key
+        current_start_key = last_evaluated_key
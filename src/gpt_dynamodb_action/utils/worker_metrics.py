@@ -0,0 +1,137 @@
+"""
+워커 여러 개의 지표를 하나로 합쳐 노출합니다.
+
+uvicorn 워커는 각자 프로세스 메모리에 지표를 쌓으므로, /metrics 요청을 받은 워커의 값만 보이면
+스크레이프마다 카운터가 다른 워커 값으로 바뀌어 리셋처럼 보입니다.
+METRICS_MULTIPROC_DIR이 설정되면 각 워커가 주기적으로 <pid>.json 스냅샷을 기록하고,
+/metrics는 디렉터리의 모든 스냅샷을 합쳐서 반환합니다.
+
+- 카운터/히스토그램: 레이블별로 합산. 종료된 워커의 값도 남겨 두어 합계가 줄어들지 않음
+- 게이지: worker 레이블을 붙여 살아 있는 워커 값만 노출
+"""
+import asyncio
+import glob
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from gpt_dynamodb_action.utils.metrics import MetricsRegistry, get_metrics_registry, merge_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MetricsSettings:
+    """워커 간 지표 합산 설정입니다. 환경 변수에서 읽어옵니다."""
+    # 워커별 스냅샷을 기록하는 디렉터리 (비어 있으면 프로세스 내 지표만 노출)
+    multiproc_dir: str = ""
+    # 스냅샷을 기록하는 간격(초). /metrics를 받은 워커는 응답 직전에 바로 기록
+    flush_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "MetricsSettings":
+        defaults = cls()
+        return cls(
+            multiproc_dir=os.environ.get("METRICS_MULTIPROC_DIR", defaults.multiproc_dir),
+            flush_seconds=float(os.environ.get("METRICS_FLUSH_SECONDS", defaults.flush_seconds)),
+        )
+
+
+def prepare_multiproc_dir(directory: str):
+    """워커를 띄우기 전에 디렉터리를 만들고 이전 실행의 스냅샷을 지웁니다."""
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        os.remove(path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WorkerMetrics:
+    """이 워커의 스냅샷을 기록하고, 모든 워커의 스냅샷을 합쳐 출력합니다."""
+
+    def __init__(self, settings: MetricsSettings, registry: Optional[MetricsRegistry] = None):
+        self.settings = settings
+        self.registry = registry or get_metrics_registry()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.settings.multiproc_dir)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.settings.multiproc_dir, f"{pid}.json")
+
+    def flush(self):
+        """현재 값을 <pid>.json에 원자적으로 기록합니다."""
+        path = self._path(os.getpid())
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(path + ".tmp", path)
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        snapshots = {}
+        own_pid = os.getpid()
+        for path in sorted(glob.glob(os.path.join(self.settings.multiproc_dir, "*.json"))):
+            try:
+                pid = int(os.path.basename(path)[:-len(".json")])
+            except ValueError:
+                continue
+            if pid == own_pid:
+                continue
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("워커 지표 파일을 읽지 못했습니다: %s (%s)", path, e)
+                continue
+            if not _pid_alive(pid):
+                # 종료된 워커의 게이지는 더 이상 현재 값이 아니므로 제외
+                snapshot = {name: data for name, data in snapshot.items() if data.get("kind") != "gauge"}
+            snapshots[str(pid)] = snapshot
+        return snapshots
+
+    def render(self) -> str:
+        """모든 워커의 지표를 합친 Prometheus 텍스트를 반환합니다."""
+        if not self.enabled:
+            return self.registry.render()
+        self.flush()
+        # 응답하는 워커는 파일 대신 메모리의 최신 값을 사용하고, 지표 순서도 이 워커 기준으로 맞춤
+        snapshots = {str(os.getpid()): self.registry.snapshot()}
+        snapshots.update(self._load())
+        return merge_snapshots(snapshots).render()
+
+    async def run(self):
+        """flush_seconds마다 스냅샷을 기록합니다. 취소되면 마지막 값을 기록하고 끝냅니다."""
+        try:
+            while True:
+                await asyncio.to_thread(self._safe_flush)
+                await asyncio.sleep(self.settings.flush_seconds)
+        finally:
+            # 종료된 워커의 카운터가 합계에서 빠지지 않도록 마지막 값을 남김
+            self._safe_flush()
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except OSError as e:
+            logger.warning("워커 지표를 기록하지 못했습니다: %s", e)
+
+
+_worker_metrics: Optional[WorkerMetrics] = None
+
+
+def get_worker_metrics() -> WorkerMetrics:
+    """프로세스 전역 WorkerMetrics를 반환합니다 (처음 호출할 때 환경 변수에서 설정을 읽음)."""
+    global _worker_metrics
+    if _worker_metrics is None:
+        _worker_metrics = WorkerMetrics(MetricsSettings.from_env())
+    return _worker_metrics
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """로컬 DynamoDB 대체 구현으로 앱을 실행하는 테스트 클라이언트입니다."""
+    monkeypatch.setenv("DYNAMO_BACKEND", "local")
+    monkeypatch.setenv("DYNAMO_TABLE_NAME", "t")
+    from fastapi.testclient import TestClient
+    from gpt_dynamodb_action.main import app
+
+    with TestClient(app) as client:
+        yield client
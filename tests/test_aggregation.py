@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from gpt_dynamodb_action.utils.aggregation import MAX_GROUPS, OTHER_GROUP, Aggregator
+
+
+def _metrics(values):
+    aggregator = Aggregator("price")
+    aggregator.add_items([{"price": value} if value is not None else {} for value in values])
+    return aggregator.result()["metrics"]
+
+
+def test_numeric_min_max_ignore_leading_non_numeric_strings():
+    metrics = _metrics(["N/A", Decimal(5), "12", Decimal("3.5"), "unknown"])
+    assert (metrics["min"], metrics["max"]) == (Decimal("3.5"), Decimal(12))
+    assert (metrics["count"], metrics["valueCount"], metrics["sum"]) == (5, 3, Decimal("20.5"))
+    assert metrics["avg"] == Decimal("20.5") / 3
+
+
+def test_string_min_max_when_no_value_is_numeric():
+    metrics = _metrics(["2024-03-01", "2023-12-31", None, True])
+    assert (metrics["min"], metrics["max"], metrics["valueCount"]) == ("2023-12-31", "2024-03-01", 0)
+    assert metrics["avg"] is None
+
+
+def test_group_by_and_other_group():
+    aggregator = Aggregator("price", "plan", ["count", "sum"])
+    aggregator.add_items([{"plan": "A", "price": 1}, {"plan": "A", "price": 2}, {"plan": "B", "price": 5}, {"price": 7}])
+    groups = {g["group"]: g for g in aggregator.result()["groups"]}
+    assert (groups["A"]["sum"], groups["B"]["count"], groups[None]["sum"]) == (Decimal(3), 1, Decimal(7))
+
+    aggregator = Aggregator(None, "g")
+    aggregator.add_items({"g": i} for i in range(MAX_GROUPS + 5))
+    groups = {g["group"]: g for g in aggregator.result()["groups"]}
+    assert len(groups) == MAX_GROUPS + 1 and groups[OTHER_GROUP]["count"] == 5
+
+
+def test_aggregate_endpoint_plans_pk_filter_as_query_and_accepts_where(client):
+    from gpt_dynamodb_action.utils.table_registry import get_registry
+
+    get_registry().get_table().put_items(
+        [{"PK": "COM#MEM#X", "SK": f"MEM#{i:03}", "price": Decimal(i), "plan": "A" if i % 2 else "B"} for i in range(10)]
+        + [{"PK": "COM#MEM#Y", "SK": "MEM#000", "price": Decimal(100)}])
+
+    response = client.post("/aggregate", json={"filters": {"PK": "COM#MEM#X"}, "attribute": "price"})
+    assert response.status_code == 200
+    assert response.headers["x-query-plan"].startswith("Query")
+    assert response.json()["metrics"]["sum"] == 45 and response.json()["scannedCount"] == 10
+
+    where = {"or": [{"attr": "plan", "value": "A"}, {"attr": "price", "op": "gte", "value": 100}]}
+    response = client.post("/aggregate", json={"where": where, "metrics": ["count"]})
+    assert response.headers["x-query-plan"].startswith("Scan")
+    assert response.json()["metrics"]["count"] == 6
+
+    response = client.post("/aggregate", json={"where": {"attr": "plan", "op": "nope"}})
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+import asyncio
+
+from gpt_dynamodb_action.utils.cache import CachedResponse, CacheSettings, ResponseCache
+
+
+class _AsyncBackend:
+    """Redis 백엔드처럼 코루틴을 반환하는 테스트용 백엔드."""
+
+    def __init__(self, fail: bool = False):
+        self.values = {}
+        self.fail = fail
+
+    async def get(self, key):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise TimeoutError("timed out")
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise TimeoutError("timed out")
+        self.values[key] = value
+
+
+def test_memory_backend_round_trip():
+    cache = ResponseCache(CacheSettings(backend="memory"))
+
+    async def run():
+        assert await cache.get("k") is None
+        await cache.set("k", CachedResponse(b"{}", {"X": "1"}), pk="USR#1")
+        return await cache.get("k")
+    assert asyncio.run(run()).headers == {"X": "1"}
+
+
+def test_async_backend_is_awaited_and_errors_become_misses():
+    cache = ResponseCache(CacheSettings(backend="none"), backend=_AsyncBackend())
+
+    async def run(c):
+        await c.set("k", CachedResponse(b"{}"), pk="USR#1")
+        return await c.get("k")
+    assert asyncio.run(run(cache)).body == b"{}"
+    assert asyncio.run(run(ResponseCache(CacheSettings(backend="none"), backend=_AsyncBackend(fail=True)))) is None
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+import pytest
+
+from gpt_dynamodb_action.utils.cursor import (CursorError, decode_cursor, encode_cursor, request_fingerprint,
+                                              resume_key, set_cursor_secret)
+
+
+@pytest.fixture(autouse=True)
+def _secret():
+    set_cursor_secret("test-secret")
+    yield
+    set_cursor_secret(None)
+
+
+FINGERPRINT = request_fingerprint("scan_table", {"filters": {"status": "active"}, "projection": ["SK", "PK"]})
+KEY = {"PK": "USR#1", "SK": "ORD#0001", "n": Decimal("12.50"), "b": b"\x00\x01"}
+
+
+def test_round_trip_keeps_key_types_and_plan():
+    token = encode_cursor(FINGERPRINT, key=KEY, plan="query:status-index")
+    cursor = decode_cursor(token, FINGERPRINT, "query:status-index")
+    assert cursor.key == KEY and cursor.plan == "query:status-index"
+    assert resume_key(token, FINGERPRINT, "query:status-index") == KEY
+
+
+def test_projection_order_does_not_change_fingerprint():
+    assert FINGERPRINT == request_fingerprint("scan_table", {"filters": {"status": "active"}, "projection": ["PK", "SK"]})
+
+
+def test_tampered_token_is_rejected():
+    body, signature = encode_cursor(FINGERPRINT, key=KEY).split(".")
+    forged = encode_cursor(FINGERPRINT, key={"PK": "USR#2", "SK": "ORD#0001"}).split(".")[0]
+    for token in (f"{forged}.{signature}", f"{body}.{signature[:-2]}AA", body, "not-a-token"):
+        with pytest.raises(CursorError):
+            decode_cursor(token, FINGERPRINT)
+
+
+def test_token_from_other_secret_is_rejected():
+    token = encode_cursor(FINGERPRINT, key=KEY)
+    set_cursor_secret("other-secret")
+    with pytest.raises(CursorError, match="signature"):
+        decode_cursor(token, FINGERPRINT)
+
+
+def test_fingerprint_mismatch_is_rejected():
+    token = encode_cursor(FINGERPRINT, key=KEY)
+    other = request_fingerprint("scan_table", {"filters": {"status": "inactive"}, "projection": ["SK", "PK"]})
+    with pytest.raises(CursorError, match="different filters"):
+        resume_key(token, other)
+
+
+def test_plan_tag_mismatch_is_rejected():
+    token = encode_cursor(FINGERPRINT, key=KEY, plan="scan")
+    with pytest.raises(CursorError, match="different query plan"):
+        resume_key(token, FINGERPRINT, "query:status-index")
+
+
+def test_raw_key_dict_and_segment_token_are_rejected():
+    with pytest.raises(CursorError, match="lastEvaluatedKey token"):
+        resume_key({"PK": "USR#1", "SK": "ORD#0001"}, FINGERPRINT)
+    segments = {"segments": [{"segment": 0, "lastEvaluatedKey": KEY, "done": False},
+                             {"segment": 1, "lastEvaluatedKey": None, "done": True}]}
+    token = encode_cursor(FINGERPRINT, segments=segments)
+    assert decode_cursor(token, FINGERPRINT).segments["totalSegments"] == 2
+    with pytest.raises(CursorError, match="parallel scan"):
+        resume_key(token, FINGERPRINT)
+
+
+def test_scan_table_rejects_raw_key_dict_with_400(client):
+    response = client.post("/scan_table", json={"filters": {"PK": "USR#1"}, "start_key": {"SK": "ORD#0001"}})
+    assert response.status_code == 400
+    response = client.post("/query_table", json={"pk": "USR#1", "start_key": {"PK": "USR#1", "SK": "ORD#0001"}})
+    assert response.status_code == 400
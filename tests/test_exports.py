@@ -0,0 +1,65 @@
+import gzip
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from gpt_dynamodb_action.utils.compression import AdaptiveCompressionMiddleware, CompressionSettings
+from gpt_dynamodb_action.utils.exports import set_export_manager
+
+
+@pytest.fixture
+def export_client(monkeypatch, tmp_path, client):
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path))
+    set_export_manager(None)
+    from gpt_dynamodb_action.utils.table_registry import get_registry
+
+    get_registry().get_table().put_items(
+        [{"PK": f"USR#{i % 7}", "SK": f"S#{i:04d}", "n": i} for i in range(300)])
+    yield client
+    set_export_manager(None)
+
+
+def _wait(client, job_id):
+    for _ in range(100):
+        job = client.get(f"/exports/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("export did not finish")
+
+
+def test_export_runs_to_completion_and_downloads(export_client):
+    response = export_client.post("/exports", json={"segments": 3})
+    assert response.status_code == 202
+    job = _wait(export_client, response.json()["jobId"])
+    assert job["status"] == "completed" and job["progress"]["items"] == 300
+
+    download = export_client.get(f"/exports/{job['jobId']}/download")
+    keys = {(row["PK"], row["SK"]) for row in map(json.loads, gzip.decompress(download.content).splitlines())}
+    assert len(keys) == 300
+
+    assert export_client.post(f"/exports/{job['jobId']}/resume").status_code == 409
+    assert [j["jobId"] for j in export_client.get("/exports").json()["jobs"]] == [job["jobId"]]
+    assert export_client.delete(f"/exports/{job['jobId']}").status_code == 200
+    assert export_client.get(f"/exports/{job['jobId']}").status_code == 404
+
+
+def test_invalid_export_requests_return_400(export_client):
+    assert export_client.post("/exports", json={"format": "csv"}).status_code == 400
+    assert export_client.post("/exports", json={"filters": {"n": "1"}, "operator": {"n": "nope"}}).status_code == 400
+
+
+def test_parquet_files_are_not_compressed_again():
+    app = FastAPI()
+
+    @app.get("/file")
+    def file():
+        return Response(b"PAR1" + b"\0" * 4096, media_type="application/vnd.apache.parquet")
+
+    app.add_middleware(AdaptiveCompressionMiddleware, settings=CompressionSettings(encodings=("gzip",)))
+    response = TestClient(app).get("/file", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers and len(response.content) == 4100
@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+import pytest
+
+from gpt_dynamodb_action.utils.filter_compiler import (FILTER_COMPILATIONS, MAX_IN_VALUES, FilterError,
+                                                       compile_filter, required_attributes)
+from gpt_dynamodb_action.utils.local_dynamo import LocalTable
+
+ITEMS = [
+    {"PK": "ORD#1", "SK": "A", "status": "PAID", "amount": Decimal(100), "code": "007", "tags": ["vip"],
+     "refund": {"reason": "late"}},
+    {"PK": "ORD#2", "SK": "A", "status": "SHIPPED", "amount": Decimal(250), "code": Decimal(7), "active": True},
+    {"PK": "ORD#3", "SK": "A", "status": "CANCELLED", "amount": Decimal("99.5"), "code": "5", "note": "paid late"},
+    {"PK": "ORD#4", "SK": "A", "status": "PAID", "amount": "120", "code": Decimal(5), "active": False},
+    {"PK": "ORD#5", "SK": "A", "note": "no status"},
+]
+
+CASES = [
+    ({"status": "PAID"}, None, None),
+    ({"status": "PAID"}, {"status": "ne"}, None),
+    ({"amount": "100"}, {"amount": "gt"}, None),
+    ({"amount": "100"}, {"amount": "gte"}, None),
+    ({"amount": "100"}, {"amount": "lt"}, None),
+    ({"amount": "99.5"}, {"amount": "lte"}, None),
+    ({"status": "PA"}, {"status": "begins_with"}, None),
+    ({"note": "late"}, {"note": "contains"}, None),
+    ({"tags": "vip"}, {"tags": "contains"}, None),
+    ({"status": "PAID,SHIPPED"}, {"status": "in"}, None),
+    ({"status": "PAID,SHIPPED"}, {"status": "not_in"}, None),
+    ({"amount": "100,200"}, {"amount": "between"}, None),
+    ({"status": ""}, {"status": "exists"}, None),
+    ({"status": ""}, {"status": "not_exists"}, None),
+    ({"note": "late"}, {"note": "not_contains"}, None),
+    ({"code": "007"}, None, None),
+    ({"code": "5"}, {"code": "ne"}, None),
+    (None, None, {"attr": "code", "op": "in", "value": [5, 7]}),
+    (None, None, {"attr": "active", "value": True}),
+    (None, None, {"attr": "refund.reason", "op": "eq", "value": "late"}),
+    (None, None, {"or": [{"attr": "status", "value": "CANCELLED"},
+                         {"and": [{"attr": "amount", "op": "gte", "value": 200}, {"not": {"attr": "active", "value": False}}]}]}),
+]
+
+
+@pytest.fixture(scope="module")
+def table():
+    table = LocalTable("t")
+    table.put_items(ITEMS)
+    return table
+
+
+@pytest.mark.parametrize("filters, operator, where", CASES)
+def test_expression_matches_predicate(table, filters, operator, where):
+    compiled = compile_filter(filters, operator, where)
+    scanned = sorted(item["PK"] for item in table.scan(**compiled.kwargs())["Items"])
+    assert scanned == sorted(item["PK"] for item in ITEMS if compiled.predicate(item))
+
+
+def _matches(filters=None, operator=None, where=None):
+    compiled = compile_filter(filters, operator, where)
+    return sorted(item["PK"] for item in ITEMS if compiled.predicate(item))
+
+
+def test_range_operators_compare_numeric_strings_as_numbers():
+    assert _matches({"amount": "100"}, {"amount": "gt"}) == ["ORD#2"]
+    assert _matches({"amount": "100,200"}, {"amount": "between"}) == ["ORD#1"]
+
+
+def test_eq_ne_in_compare_strings_as_strings():
+    compiled = compile_filter({"code": "007"})
+    assert compiled.expression == "#f0 = :f0" and dict(compiled.values) == {":f0": "007"}
+    assert _matches({"code": "007"}) == ["ORD#1"]
+    # ne "5"는 숫자 5인 항목을 제외하지 않음 (속성이 없는 항목도 포함)
+    assert _matches({"code": "5"}, {"code": "ne"}) == ["ORD#1", "ORD#2", "ORD#4", "ORD#5"]
+    assert _matches(where={"attr": "code", "op": "in", "value": [5, 7]}) == ["ORD#2", "ORD#4"]
+
+
+def test_typed_key_attribute_converts_string_to_number():
+    compiled = compile_filter({"version": "3"}, attribute_types={"version": "N"})
+    assert dict(compiled.values) == {":f0": Decimal(3)}
+    with pytest.raises(FilterError):
+        compile_filter({"version": "x"}, attribute_types={"version": "N"})
+
+
+def test_in_limit_counts_user_values():
+    values = ",".join(str(i) for i in range(60))
+    assert len(compile_filter({"code": values}, {"code": "in"}).values) == 60
+    with pytest.raises(FilterError, match=f"at most {MAX_IN_VALUES}"):
+        compile_filter({"code": ",".join(str(i) for i in range(MAX_IN_VALUES + 1))}, {"code": "in"})
+
+
+@pytest.mark.parametrize("filters, operator, where", [
+    ({"a": "1"}, {"a": "nope"}, None),
+    ({"a": "1"}, {"a": "between"}, None),
+    ({"a": ["x"]}, None, None),
+    (None, None, {"or": []}),
+    (None, None, {"attr": "a", "extra": 1}),
+    ({"a": "x,1"}, {"a": "between"}, None),
+])
+def test_invalid_specs_raise_filter_error(filters, operator, where):
+    with pytest.raises(FilterError):
+        compile_filter(filters, operator, where)
+
+
+def test_equivalent_specs_share_one_compilation():
+    where = {"and": [{"attr": "zz1", "value": "b"}, {"attr": "zz2", "value": "a"}]}
+    before = FILTER_COMPILATIONS.value()
+    first = compile_filter(where=where)
+    assert compile_filter({"zz2": "a", "zz1": "b"}) is first
+    assert FILTER_COMPILATIONS.value() == before + 1
+
+
+def test_required_attributes():
+    assert required_attributes({"a": "1", "b": "2"}, {"b": "ne"}) == {"a"}
+    where = {"or": [{"attr": "a", "op": "gt", "value": 1}, {"and": [{"attr": "a", "value": 2}, {"attr": "b", "value": 3}]}]}
+    assert required_attributes(where=where) == {"a"}
+    assert required_attributes(where={"not": {"attr": "a", "value": 1}}) == frozenset()
@@ -0,0 +1,68 @@
+import os
+
+from gpt_dynamodb_action.utils.metrics import MetricsRegistry, merge_snapshots
+from gpt_dynamodb_action.utils.worker_metrics import MetricsSettings, WorkerMetrics, prepare_multiproc_dir
+
+
+def _registry(requests: int, latency: float, startup: float) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    counter = registry.counter("http_requests_total", "requests", ("route",))
+    counter.inc(requests, route="/scan")
+    registry.histogram("latency_seconds", "latency", (), (0.1, 1.0)).observe(latency)
+    registry.gauge("app_startup_seconds", "startup", ("phase",)).set(startup, phase="warmup")
+    return registry
+
+
+def test_merge_sums_counters_and_histograms_and_labels_gauges_by_worker():
+    merged = merge_snapshots({"1": _registry(2, 0.05, 0.5).snapshot(), "2": _registry(3, 0.5, 0.7).snapshot()})
+    text = merged.render()
+    assert 'http_requests_total{route="/scan"} 5' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert "latency_seconds_count 2" in text
+    assert 'app_startup_seconds{phase="warmup",worker="1"} 0.5' in text
+    assert 'app_startup_seconds{phase="warmup",worker="2"} 0.7' in text
+
+
+def test_worker_metrics_merges_snapshot_files(tmp_path):
+    directory = str(tmp_path)
+    prepare_multiproc_dir(directory)
+    # 이미 종료된 워커(존재하지 않는 pid)의 스냅샷: 카운터는 남기고 게이지는 제외
+    WorkerMetrics(MetricsSettings(multiproc_dir=directory), _registry(4, 0.05, 9.0)).flush()
+    os.rename(os.path.join(directory, f"{os.getpid()}.json"), os.path.join(directory, "999999999.json"))
+
+    text = WorkerMetrics(MetricsSettings(multiproc_dir=directory), _registry(1, 0.05, 0.5)).render()
+    assert 'http_requests_total{route="/scan"} 5' in text
+    assert f'app_startup_seconds{{phase="warmup",worker="{os.getpid()}"}} 0.5' in text
+    assert 'worker="999999999"' not in text
+    assert os.path.exists(os.path.join(directory, f"{os.getpid()}.json"))
+
+    prepare_multiproc_dir(directory)
+    assert os.listdir(directory) == []
+
+
+def test_worker_metrics_without_directory_renders_own_registry():
+    text = WorkerMetrics(MetricsSettings(), _registry(1, 0.05, 0.5)).render()
+    assert 'app_startup_seconds{phase="warmup"} 0.5' in text
+
+
+def test_streamed_requests_are_logged_under_their_operation():
+    import asyncio
+
+    from gpt_dynamodb_action.utils.metrics import ITEMS_RETURNED
+    from gpt_dynamodb_action.utils.streaming import iter_ndjson
+
+    async def fetch_page(start_key, limit):
+        return {"Items": [{"id": 1}, {"id": 2}]}
+
+    async def consume():
+        return [line async for line in iter_ndjson(fetch_page, "query", None, 10)]
+
+    def returned(operation):
+        values = dict((tuple(labels), value) for labels, value in ITEMS_RETURNED.snapshot()["values"])
+        return values.get((operation,), [None, 0, 0])[2]
+
+    before = returned("query")
+    asyncio.run(consume())
+    assert returned("query") == before + 1
+    assert returned("stream") == 0
@@ -0,0 +1,74 @@
+from gpt_dynamodb_action.utils.dynamo_helpers import build_query_kwargs
+from gpt_dynamodb_action.utils.filter_compiler import compile_filter
+from gpt_dynamodb_action.utils.local_dynamo import LocalTable
+from gpt_dynamodb_action.utils.query_planner import PLAN_GET_ITEM, PLAN_QUERY, PLAN_SCAN, plan_scan
+from gpt_dynamodb_action.utils.table_schema import IndexSchema, TableSchema, load_table_schema
+
+
+def _schema(*indexes):
+    return TableSchema(table_name="t", indexes={index.name: index for index in indexes})
+
+
+STATUS_INDEX = IndexSchema("status-index", "status", "createdAt")
+EMAIL_INDEX = IndexSchema("email-index", "email")
+
+
+def test_pk_eq_runs_as_query():
+    plan = plan_scan({"PK": "COM#1", "name": "x"}, None, _schema())
+    assert (plan.kind, plan.pk, plan.filters) == (PLAN_QUERY, "COM#1", {"name": "x"})
+
+
+def test_pk_and_sk_eq_runs_as_get_item():
+    plan = plan_scan({"PK": "COM#1", "SK": "META"}, None, _schema())
+    assert (plan.kind, plan.pk, plan.sk) == (PLAN_GET_ITEM, "COM#1", "META")
+
+
+def test_numeric_looking_sk_moves_into_key_condition():
+    plan = plan_scan({"PK": "ORD#1", "SK": "01000"}, {"SK": "gte"}, _schema())
+    assert (plan.kind, plan.sk, plan.sk_operator, plan.filters) == (PLAN_QUERY, "01000", "gte", {})
+
+
+def test_index_without_range_key_is_used_for_hash_key_eq():
+    plan = plan_scan({"email": "a@example.com"}, None, _schema(EMAIL_INDEX))
+    assert plan.kind == PLAN_QUERY and plan.index is EMAIL_INDEX
+
+
+def test_sparse_index_is_not_used_when_range_key_may_be_missing():
+    assert plan_scan({"status": "active"}, None, _schema(STATUS_INDEX)).kind == PLAN_SCAN
+    assert plan_scan({"status": "active", "createdAt": "2024"}, {"createdAt": "ne"},
+                     _schema(STATUS_INDEX)).kind == PLAN_SCAN
+    where = {"or": [{"attr": "createdAt", "op": "exists"}, {"attr": "name", "value": "x"}]}
+    assert plan_scan({"status": "active"}, None, _schema(STATUS_INDEX), where=where).kind == PLAN_SCAN
+
+
+def test_sparse_index_is_used_when_filters_require_range_key():
+    for operator in ("eq", "begins_with", "gt"):
+        plan = plan_scan({"status": "active", "createdAt": "2024"}, {"createdAt": operator}, _schema(STATUS_INDEX))
+        assert (plan.index, plan.sk, plan.sk_operator) == (STATUS_INDEX, "2024", operator)
+    plan = plan_scan({"status": "active", "createdAt": ""}, {"createdAt": "exists"}, _schema(STATUS_INDEX))
+    assert plan.index is STATUS_INDEX and plan.sk is None
+    where = {"or": [{"attr": "createdAt", "op": "lt", "value": "2024"}, {"attr": "createdAt", "op": "gt", "value": "2025"}]}
+    assert plan_scan({"status": "active"}, None, _schema(STATUS_INDEX), where=where).index is STATUS_INDEX
+
+
+def test_sparse_index_plan_returns_same_items_as_scan():
+    table = LocalTable("t")
+    table.add_index("status-index", "status", "createdAt")
+    table.put_items([
+        {"PK": "USR#1", "SK": "META", "status": "active", "createdAt": "2024-01-01"},
+        {"PK": "USR#2", "SK": "META", "status": "active"},
+        {"PK": "USR#3", "SK": "META", "status": "inactive", "createdAt": "2024-02-01"},
+    ])
+    schema = load_table_schema(table)
+    filters = {"status": "active"}
+
+    plan = plan_scan(filters, None, schema)
+    assert plan.kind == PLAN_SCAN
+    scanned = table.scan(**compile_filter(filters).kwargs())["Items"]
+    assert sorted(item["PK"] for item in scanned) == ["USR#1", "USR#2"]
+
+    # 정렬 키를 요구하는 필터는 인덱스로 실행해도 스캔과 결과가 같다
+    plan = plan_scan({"status": "active", "createdAt": "2024"}, {"createdAt": "begins_with"}, schema)
+    assert plan.index is not None and plan.index.name == "status-index"
+    queried = table.query(**build_query_kwargs(plan.pk, plan.sk, plan.sk_operator, index=plan.index))["Items"]
+    assert [item["PK"] for item in queried] == ["USR#1"]
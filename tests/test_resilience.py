@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from gpt_dynamodb_action.utils.resilience import DynamoGuard, ResilienceSettings, ThrottledError
+from gpt_dynamodb_action.utils.table_registry import DynamoSettings
+
+
+def _client_error(code: str, status: int = 400) -> ClientError:
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "Query")
+
+
+def _guard(max_retries: int = 3) -> DynamoGuard:
+    return DynamoGuard(ResilienceSettings(max_retries=max_retries, base_backoff=0.0, max_backoff=0.0))
+
+
+def _failing_call(errors):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return {"Items": []}
+    return call, calls
+
+
+def test_botocore_does_not_retry_when_guard_retries():
+    assert DynamoSettings(guard_retries=True).botocore_config().retries["max_attempts"] == 1
+    assert DynamoSettings(guard_retries=False, max_attempts=3).botocore_config().retries["max_attempts"] == 3
+
+
+def test_guard_retries_from_env(monkeypatch):
+    monkeypatch.setenv("DYNAMO_THROTTLE_RETRIES", "0")
+    assert not DynamoSettings.from_env().guard_retries
+    monkeypatch.setenv("DYNAMO_THROTTLE_RETRIES", "2")
+    assert DynamoSettings.from_env().guard_retries
+
+
+def test_throttling_stops_after_max_retries_plus_one_requests():
+    call, calls = _failing_call([_client_error("ProvisionedThroughputExceededException")] * 10)
+    with pytest.raises(ThrottledError):
+        asyncio.run(_guard(3).call("query", call))
+    assert len(calls) == 4
+
+
+def test_transient_errors_are_retried_by_the_guard():
+    call, calls = _failing_call([_client_error("InternalServerError", 500), EndpointConnectionError(endpoint_url="x")])
+    assert asyncio.run(_guard(3).call("query", call)) == {"Items": []}
+    assert len(calls) == 3
+
+
+def test_transient_error_is_raised_after_retries_and_client_errors_are_not_retried():
+    call, calls = _failing_call([_client_error("ServiceUnavailable", 503)] * 10)
+    with pytest.raises(ClientError):
+        asyncio.run(_guard(2).call("query", call))
+    assert len(calls) == 3
+
+    call, calls = _failing_call([_client_error("ValidationException")])
+    with pytest.raises(ClientError):
+        asyncio.run(_guard(2).call("query", call))
+    assert len(calls) == 1
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from gpt_dynamodb_action.utils.single_flight import SingleFlight, coalesce, set_single_flight
+
+
+@pytest.fixture(autouse=True)
+def _single_flight():
+    set_single_flight(SingleFlight(enabled=True))
+    yield
+    set_single_flight(None)
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": raw})
+
+
+def _endpoint(fail: bool = False):
+    """실행 횟수를 세고, release가 설정될 때까지 응답을 미루는 테스트용 엔드포인트."""
+    calls = []
+    release = asyncio.Event()
+
+    @coalesce("test")
+    async def endpoint(request: Request, pk: str, stream: bool = False):
+        calls.append(pk)
+        await release.wait()
+        if fail:
+            raise HTTPException(status_code=503, detail="throttled")
+        return Response(content=f"{pk}:{len(calls)}".encode())
+    return endpoint, calls, release
+
+
+async def _gather(release, *calls):
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0.01)
+    release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_concurrent_identical_requests_share_one_execution():
+    async def run():
+        endpoint, calls, release = _endpoint()
+        responses = await _gather(release, *(endpoint(request=_request(), pk="A") for _ in range(3)),
+                                  endpoint(request=_request(), pk="B"))
+        return calls, responses
+    calls, responses = asyncio.run(run())
+    assert sorted(calls) == ["A", "B"]
+    assert [r.body for r in responses[:3]] == [responses[0].body] * 3
+    assert [r.headers.get("x-coalesced") for r in responses[:3]] == [None, "true", "true"]
+
+
+def test_no_cache_requests_are_keyed_separately():
+    async def run():
+        endpoint, calls, release = _endpoint()
+        await _gather(release, endpoint(request=_request(), pk="A"),
+                      endpoint(request=_request(cache_control="no-cache"), pk="A"),
+                      endpoint(request=_request(cache_control="no-cache"), pk="A"))
+        return calls
+    assert asyncio.run(run()) == ["A", "A"]
+
+
+def test_followers_receive_the_leaders_exception():
+    async def run():
+        endpoint, calls, release = _endpoint(fail=True)
+        results = await _gather(release, *(endpoint(request=_request(), pk="A") for _ in range(3)))
+        return calls, results
+    calls, results = asyncio.run(run())
+    assert calls == ["A"]
+    assert all(isinstance(r, HTTPException) and r.status_code == 503 for r in results)
+
+
+def test_stream_requests_bypass_coalescing():
+    async def run():
+        endpoint, calls, release = _endpoint()
+        await _gather(release, endpoint(request=_request(), pk="A", stream=True),
+                      endpoint(request=_request(), pk="A", stream=True),
+                      endpoint(request=_request(accept="application/x-ndjson"), pk="A"))
+        return calls
+    assert asyncio.run(run()) == ["A", "A", "A"]
+
+
+def test_follower_still_gets_result_when_leader_is_cancelled():
+    async def run():
+        endpoint, calls, release = _endpoint()
+        leader = asyncio.ensure_future(endpoint(request=_request(), pk="A"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(endpoint(request=_request(), pk="A"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        release.set()
+        return calls, await follower
+    calls, response = asyncio.run(run())
+    assert calls == ["A"] and response.body == b"A:1"
@@ -0,0 +1,108 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from gpt_dynamodb_action.utils.budget import ScanBudget
+from gpt_dynamodb_action.utils.resilience import ThrottledError
+from gpt_dynamodb_action.utils.top_k import MAX_TOP_K, TopK, read_top_k, sort_projection
+
+
+def _items(*values):
+    return [{"PK": f"P#{i}", "score": value} if value is not None else {"PK": f"P#{i}"}
+            for i, value in enumerate(values)]
+
+
+def _top(order, k, items):
+    top = TopK("score", order, k)
+    top.extend(items)
+    return top
+
+
+class _PageReader:
+    """미리 정한 페이지를 순서대로 돌려주는 테스트용 리더 (PageReader.read와 같은 형식)."""
+
+    def __init__(self, pages, budget, throttle_at=None):
+        self.pages = pages
+        self.budget = budget
+        self.throttle_at = throttle_at
+        self.reads = []
+
+    async def read(self, start_key, max_items):
+        index = start_key["page"] if start_key else 0
+        self.reads.append(index)
+        if index == self.throttle_at:
+            raise ThrottledError("scan")
+        items = self.pages[index]
+        self.budget.record({"ScannedCount": len(items)}, 1.0)
+        last_evaluated_key = {"page": index + 1} if index + 1 < len(self.pages) else None
+        return {"Items": items, "LastEvaluatedKey": last_evaluated_key}
+
+
+def test_desc_and_asc_keep_only_top_k_in_order():
+    items = _items(*(Decimal(v) for v in (5, 1, 9, 3, 7, 2, 8)))
+    assert [i["score"] for i in _top("desc", 3, items).items()] == [9, 8, 7]
+    assert [i["score"] for i in _top("asc", 3, items).items()] == [1, 2, 3]
+    assert len(_top("desc", 100, items).items()) == len(items)
+
+
+def test_ties_keep_first_read_items():
+    items = _items(Decimal(1), Decimal(2), Decimal(2), Decimal(2))
+    assert [i["PK"] for i in _top("desc", 2, items).items()] == ["P#1", "P#2"]
+    assert [i["PK"] for i in _top("asc", 2, items).items()] == ["P#0", "P#1"]
+
+
+def test_numbers_sort_before_strings_and_missing_values_are_counted():
+    items = _items("b", Decimal(10), None, {"nested": 1}, "a", Decimal("2.5"), True)
+    top = _top("asc", 10, items)
+    assert [i["score"] for i in top.items()] == [True, Decimal("2.5"), Decimal(10), "a", "b"]
+    assert [i["score"] for i in _top("desc", 2, items).items()] == ["b", "a"]
+    assert top.describe() == {"sortBy": "score", "order": "asc", "topK": 10,
+                              "consideredCount": 7, "missingSortKeyCount": 2}
+
+
+def test_invalid_order_and_k():
+    for order, k in (("up", 5), ("desc", 0), ("desc", MAX_TOP_K + 1)):
+        with pytest.raises(ValueError):
+            TopK("score", order, k)
+
+
+def test_sort_projection_adds_sort_attribute():
+    assert sort_projection(["PK", "name"], "score") == (["PK", "name", "score"], True)
+    assert sort_projection(["PK", "score"], "score") == (["PK", "score"], False)
+    assert sort_projection(None, "score") == (None, False)
+
+
+def test_read_top_k_reads_every_page():
+    budget = ScanBudget()
+    pages = [_items(Decimal(1), Decimal(9)), _items(Decimal(5)), _items(Decimal(7), None)]
+    reader, top = _PageReader(pages, budget), TopK("score", "desc", 2)
+    assert asyncio.run(read_top_k(reader, None, top, budget)) is None
+    assert [i["score"] for i in top.items()] == [9, 7]
+    assert (top.considered, top.missing, reader.reads) == (5, 1, [0, 1, 2])
+
+
+def test_read_top_k_stops_on_budget_at_page_boundary():
+    budget = ScanBudget(max_pages=2)
+    pages = [_items(Decimal(1)), _items(Decimal(2)), _items(Decimal(3))]
+    reader, top = _PageReader(pages, budget), TopK("score", "desc", 5)
+    assert asyncio.run(read_top_k(reader, None, top, budget)) == {"page": 2}
+    assert (budget.exhausted_reason, top.considered) == ("max_pages", 2)
+
+    # 연속 키로 나머지를 읽으면 남은 페이지만 비교
+    budget = ScanBudget()
+    rest = TopK("score", "desc", 5)
+    assert asyncio.run(read_top_k(_PageReader(pages, budget), {"page": 2}, rest, budget)) is None
+    assert [i["score"] for i in rest.items()] == [3]
+
+
+def test_read_top_k_throttling():
+    pages = [_items(Decimal(1)), _items(Decimal(2))]
+    budget = ScanBudget()
+    with pytest.raises(ThrottledError):
+        asyncio.run(read_top_k(_PageReader(pages, budget, throttle_at=0), None, TopK("score"), budget))
+
+    budget = ScanBudget()
+    top = TopK("score")
+    assert asyncio.run(read_top_k(_PageReader(pages, budget, throttle_at=1), None, top, budget)) == {"page": 1}
+    assert budget.exhausted_reason == "throttled" and top.considered == 1